@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compare GreenhouseClient and AsyncGreenhouseClient on fan-out workloads
+against the local Harvest stub.
+
+    python benchmarks/async_vs_sync.py --latency 0.05 --candidates 50 --jobs 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+sys.path.insert(0, current_dir)
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('GREENHOUSE_CACHE_BACKEND', 'none')
+
+from harvest_stub import HarvestStubServer
+from src.models.schemas import Candidate
+from src.services.greenhouse_client import GreenhouseClient
+from src.services.async_greenhouse_client import AsyncGreenhouseClient
+
+
+def make_candidates(count):
+    return [
+        Candidate(name=f'Bench Candidate {i}', email=f'bench{i}@example.com', job_id=str(1000 + i % 10))
+        for i in range(count)
+    ]
+
+
+def run_sync(client, candidates, job_ids):
+    start = time.perf_counter()
+    for candidate in candidates:
+        created = client.create_candidate(candidate)
+        client.create_application(str(created['id']), candidate.job_id)
+    import_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for job_id in job_ids:
+        client.get_applications(job_id=job_id)
+    fetch_time = time.perf_counter() - start
+
+    return import_time, fetch_time
+
+
+async def run_async(client, candidates, job_ids):
+    start = time.perf_counter()
+    results = await client.create_candidates(candidates)
+    import_time = time.perf_counter() - start
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        raise failures[0]
+
+    start = time.perf_counter()
+    await client.get_applications_for_jobs(job_ids)
+    fetch_time = time.perf_counter() - start
+
+    return import_time, fetch_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.05, help='stub latency per request in seconds')
+    parser.add_argument('--candidates', type=int, default=50, help='candidates to import')
+    parser.add_argument('--jobs', type=int, default=20, help='jobs to fetch applications for')
+    parser.add_argument('--concurrency', type=int, default=10, help='async in-flight request limit')
+    args = parser.parse_args()
+
+    server = HarvestStubServer(latency=args.latency).start_in_background()
+    candidates = make_candidates(args.candidates)
+    job_ids = [str(1000 + i) for i in range(args.jobs)]
+
+    sync_client = GreenhouseClient(api_key='bench', base_url=server.base_url)
+    sync_import, sync_fetch = run_sync(sync_client, candidates, job_ids)
+
+    async_client = AsyncGreenhouseClient(client=sync_client, max_concurrency=args.concurrency)
+    async_import, async_fetch = asyncio.run(run_async(async_client, candidates, job_ids))
+    async_client.close()
+    server.shutdown()
+
+    print(f"stub latency {args.latency * 1000:.0f} ms, async concurrency {args.concurrency}")
+    print(f"{'workload':<32}{'sync (s)':>10}{'async (s)':>11}{'speedup':>9}")
+    for name, sync_time, async_time in [
+        (f'import {args.candidates} candidates', sync_import, async_import),
+        (f'applications for {args.jobs} jobs', sync_fetch, async_fetch),
+    ]:
+        print(f"{name:<32}{sync_time:>10.2f}{async_time:>11.2f}{sync_time / async_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
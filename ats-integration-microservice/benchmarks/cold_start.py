@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Measure Lambda-style cold start for every handler and fail on regressions.
+
+Each sample runs in a fresh interpreter: import the handler module (the
+Lambda init phase), then serve one CORS preflight. The median of each is
+compared with benchmarks/cold_start_baseline.json, and the preflight path
+must not have loaded any of the heavy modules listed there.
+
+    python benchmarks/cold_start.py                   # check against the baseline
+    python benchmarks/cold_start.py --update-baseline # record new numbers
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+
+DEFAULT_BASELINE = os.path.join(current_dir, 'cold_start_baseline.json')
+
+HANDLERS = {
+    'getJobs': 'src.handlers.jobs.get_jobs',
+    'createCandidate': 'src.handlers.candidates.create_candidate',
+    'createCandidatesBulk': 'src.handlers.bulk_candidates.create_candidates_bulk',
+    'getApplications': 'src.handlers.applications.get_applications',
+    'greenhouseWebhook': 'src.handlers.webhooks.greenhouse_webhook',
+}
+
+HEAVY_MODULES = ['requests', 'pydantic', 'email_validator', 'boto3', 'sqlite3', 'orjson', 'src.models.schemas']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import importlib
+module = importlib.import_module({module!r})
+handler = getattr(module, {function!r})
+init_done = time.perf_counter()
+response = handler({{'httpMethod': 'OPTIONS', 'headers': {{}}}}, None)
+preflight_done = time.perf_counter()
+print(json.dumps({{
+    'init_ms': (init_done - start) * 1000,
+    'preflight_ms': (preflight_done - init_done) * 1000,
+    'status': response['statusCode'],
+    'heavy_modules': [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def sample(handler_path):
+    module, function = handler_path.rsplit('.', 1)
+    code = PROBE.format(module=module, function=function, heavy=HEAVY_MODULES)
+    env = dict(os.environ, LOG_LEVEL='WARNING', PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=project_dir, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(runs):
+    results = {}
+    for name, handler_path in HANDLERS.items():
+        samples = [sample(handler_path) for _ in range(runs)]
+        results[name] = {
+            'init_ms': round(statistics.median(s['init_ms'] for s in samples), 2),
+            'preflight_ms': round(statistics.median(s['preflight_ms'] for s in samples), 3),
+            'status': samples[-1]['status'],
+            'heavy_modules': sorted({m for s in samples for m in s['heavy_modules']}),
+        }
+    return results
+
+
+def compare(results, baseline, tolerance, slack_ms):
+    failures = []
+    for name, current in results.items():
+        if current['status'] != 200:
+            failures.append(f"{name}: preflight returned {current['status']}")
+        if current['heavy_modules']:
+            failures.append(f"{name}: preflight loaded {', '.join(current['heavy_modules'])}")
+
+        expected = baseline.get('handlers', {}).get(name)
+        if expected is None:
+            continue
+        limit = expected['init_ms'] * (1 + tolerance) + slack_ms
+        if current['init_ms'] > limit:
+            failures.append(f"{name}: init {current['init_ms']:.1f} ms exceeds {limit:.1f} ms "
+                            f"(baseline {expected['init_ms']:.1f} ms)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per handler')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed relative slowdown')
+    parser.add_argument('--slack-ms', type=float, default=15.0, help='allowed absolute slowdown, absorbs timer noise')
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = measure(args.runs)
+
+    print(f"{'handler':<22} {'init ms':>9} {'preflight ms':>13}  heavy modules")
+    for name, current in results.items():
+        print(f"{name:<22} {current['init_ms']:>9.1f} {current['preflight_ms']:>13.3f}  "
+              f"{', '.join(current['heavy_modules']) or '-'}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'handlers': {name: {'init_ms': r['init_ms']} for name, r in results.items()}
+            }, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        print(f"\nNo baseline at {args.baseline}; checking heavy imports only")
+
+    failures = compare(results, baseline, args.tolerance, args.slack_ms)
+    if failures:
+        print("\nCold start regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    print("\nNo cold start regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
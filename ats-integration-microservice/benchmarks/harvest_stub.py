@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Greenhouse Harvest v1 endpoints used by GreenhouseClient.
+Serves deterministic fake data with a fixed per-request latency, and can
+inject 500s at a given rate and enforce a Harvest-style rolling rate limit
+(429 with Retry-After, X-RateLimit-Limit / X-RateLimit-Remaining headers).
+Application lists honour last_activity_after; update_application() moves an
+application's status and activity forward, for exercising incremental sync.
+
+    python benchmarks/harvest_stub.py --latency 0.05 --error-rate 0.02 --rate-limit 50
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+BASE_ACTIVITY = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _parse_timestamp(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class HarvestStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in dict(self._rate_limit_headers, **(headers or {})).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _admit(self):
+        """Apply latency, rate limiting and error injection. False if a response was already sent."""
+        self._rate_limit_headers = {}
+        time.sleep(self.server.latency)
+        # The body is read even when rejecting, so a keep-alive connection stays usable.
+        self._body = self._read_body()
+
+        allowed, remaining, retry_after = self.server.take_rate_limit_slot()
+        if self.server.rate_limit:
+            self._rate_limit_headers = {
+                'X-RateLimit-Limit': str(self.server.rate_limit),
+                'X-RateLimit-Remaining': str(remaining)
+            }
+        if not allowed:
+            self._send_json(429, {'message': 'Rate limit exceeded'}, {'Retry-After': str(retry_after)})
+            return False
+
+        if self.server.inject_error():
+            self._send_json(500, {'message': 'Injected failure'})
+            return False
+        return True
+
+    def _paginate(self, path, query, items):
+        page = int(query.get('page', ['1'])[0])
+        per_page = int(query.get('per_page', ['100'])[0])
+        last_page = max(1, -(-len(items) // per_page))
+        base = f"http://{self.headers.get('Host')}{path}"
+
+        links = []
+        if page < last_page:
+            links.append(f'<{base}?page={page + 1}&per_page={per_page}>; rel="next"')
+        if page > 1:
+            links.append(f'<{base}?page={page - 1}&per_page={per_page}>; rel="prev"')
+        links.append(f'<{base}?page={last_page}&per_page={per_page}>; rel="last"')
+
+        start = (page - 1) * per_page
+        return items[start:start + per_page], {'Link': ', '.join(links)}
+
+    def do_GET(self):
+        if not self._admit():
+            return
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        parts = parsed.path.strip('/').split('/')
+
+        if parts == ['v1', 'jobs']:
+            page, headers = self._paginate(parsed.path, query, self.server.jobs)
+            return self._send_json(200, page, headers)
+
+        if len(parts) == 4 and parts[:2] == ['v1', 'jobs'] and parts[3] == 'applications':
+            applications = self.server.applications_for(parts[2], query.get('last_activity_after', [None])[0])
+            page, headers = self._paginate(parsed.path, query, applications)
+            return self._send_json(200, page, headers)
+
+        if parts == ['v1', 'applications']:
+            applications = self.server.applications_for('0', query.get('last_activity_after', [None])[0])
+            page, headers = self._paginate(parsed.path, query, applications)
+            return self._send_json(200, page, headers)
+
+        self._send_json(404, {'message': 'Not found'})
+
+    def do_POST(self):
+        if not self._admit():
+            return
+        parts = urlparse(self.path).path.strip('/').split('/')
+        payload = self._body
+
+        if parts == ['v1', 'candidates']:
+            return self._send_json(201, dict(payload, id=self.server.next_id()))
+
+        if parts == ['v1', 'applications']:
+            return self._send_json(201, dict(payload, id=self.server.next_id(), status='active'))
+
+        self._send_json(404, {'message': 'Not found'})
+
+
+class HarvestStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    handler_class = HarvestStubHandler
+
+    def __init__(self, address=('127.0.0.1', 0), latency=0.05, job_count=250, applications_per_job=120,
+                 error_rate=0.0, rate_limit=0, rate_limit_window=10.0, seed=None):
+        super().__init__(address, self.handler_class)
+        self.latency = latency
+        self.applications_per_job = applications_per_job
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self._random = random.Random(seed)
+        self._admitted = deque()
+        self._stats = {'requests': 0, 'throttled': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self._id = 100000
+        self._id_lock = threading.Lock()
+        self._updates = {}
+        self.jobs = [
+            {
+                'id': 1000 + i,
+                'name': f'Job {i}',
+                'title': f'Job {i}',
+                'status': ('open', 'closed', 'draft')[i % 3],
+                'offices': [{'name': 'Remote'}],
+                'absolute_url': f'https://boards.greenhouse.io/stub/jobs/{1000 + i}'
+            }
+            for i in range(job_count)
+        ]
+
+    def next_id(self):
+        with self._id_lock:
+            self._id += 1
+            return self._id
+
+    def take_rate_limit_slot(self):
+        """Rolling-window limiter. Returns (allowed, remaining, retry_after_seconds)."""
+        with self._lock:
+            self._stats['requests'] += 1
+            if not self.rate_limit:
+                return True, 0, 0
+
+            now = time.monotonic()
+            while self._admitted and now - self._admitted[0] >= self.rate_limit_window:
+                self._admitted.popleft()
+
+            if len(self._admitted) >= self.rate_limit:
+                self._stats['throttled'] += 1
+                retry_after = max(1, math.ceil(self.rate_limit_window - (now - self._admitted[0])))
+                return False, 0, retry_after
+
+            self._admitted.append(now)
+            return True, self.rate_limit - len(self._admitted), 0
+
+    def inject_error(self):
+        with self._lock:
+            if self.error_rate and self._random.random() < self.error_rate:
+                self._stats['errors'] += 1
+                return True
+            return False
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def update_application(self, application_id, status):
+        """Give an application a new status with activity stamped now, as a stage change would."""
+        stamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        with self._lock:
+            self._updates[application_id] = {'status': status, 'last_activity_at': stamp}
+
+    def applications_for(self, job_id, last_activity_after=None):
+        with self._lock:
+            updates = dict(self._updates)
+        applications = [
+            dict({
+                'id': int(job_id) * 1000 + i,
+                'status': ('active', 'rejected', 'hired')[i % 3],
+                'last_activity_at': (BASE_ACTIVITY + timedelta(minutes=i)).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+                'candidate': {
+                    'first_name': 'Candidate',
+                    'last_name': str(i),
+                    'email_addresses': [{'value': f'candidate{i}@example.com', 'type': 'work'}]
+                }
+            }, **updates.get(int(job_id) * 1000 + i, {}))
+            for i in range(self.applications_per_job)
+        ]
+        if last_activity_after:
+            after = _parse_timestamp(last_activity_after)
+            applications = [app for app in applications if _parse_timestamp(app['last_activity_at']) > after]
+        return applications
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start_in_background(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local Greenhouse Harvest stub')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    parser.add_argument('--rate-limit', type=int, default=0, help='requests per window before 429 (0 = unlimited)')
+    parser.add_argument('--rate-limit-window', type=float, default=10.0, help='rate-limit window in seconds')
+    parser.add_argument('--seed', type=int, default=None, help='seed for error injection')
+    args = parser.parse_args()
+
+    server = HarvestStubServer(('127.0.0.1', args.port), latency=args.latency, error_rate=args.error_rate,
+                               rate_limit=args.rate_limit, rate_limit_window=args.rate_limit_window, seed=args.seed)
+    print(f'Harvest stub listening on {server.base_url}')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for a Lever-style API (postings and opportunities, enveloped
+list bodies), served by the same server as the Harvest stub so latency, error
+injection and rate limiting work the same way.
+
+    python benchmarks/lever_stub.py --port 8901 --latency 0.05
+    ATS_PROVIDER=lever LEVER_BASE_URL=http://127.0.0.1:8901 LEVER_API_KEY=test serverless offline
+"""
+
+import argparse
+import os
+import sys
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harvest_stub import HarvestStubHandler, HarvestStubServer
+
+JOB_STATES = {'open': 'published', 'closed': 'closed', 'draft': 'draft'}
+STAGES = {'active': 'applicant-new', 'rejected': 'archived', 'hired': 'hired'}
+
+
+def to_posting(job):
+    return {
+        'id': str(job['id']),
+        'text': job['title'],
+        'state': JOB_STATES[job['status']],
+        'categories': {'location': job['offices'][0]['name']},
+        'urls': {'show': job['absolute_url']}
+    }
+
+
+def to_opportunity(application):
+    candidate = application['candidate']
+    return {
+        'id': str(application['id']),
+        'name': f"{candidate['first_name']} {candidate['last_name']}",
+        'emails': [candidate['email_addresses'][0]['value']],
+        'stage': STAGES[application['status']],
+        'updatedAt': 1700000000000 + application['id'] % 1000 * 1000
+    }
+
+
+class LeverStubHandler(HarvestStubHandler):
+    def _envelope(self, query, items):
+        page = int(query.get('page', ['1'])[0])
+        limit = int(query.get('limit', ['100'])[0])
+        start = (page - 1) * limit
+        return {'data': items[start:start + limit], 'hasNext': start + limit < len(items), 'total': len(items)}
+
+    def do_GET(self):
+        if not self._admit():
+            return
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        parts = parsed.path.strip('/').split('/')
+
+        if parts == ['v1', 'postings']:
+            state = query.get('state', [None])[0]
+            postings = [to_posting(job) for job in self.server.jobs]
+            if state:
+                postings = [posting for posting in postings if posting['state'] == state]
+            return self._send_json(200, self._envelope(query, postings))
+
+        if parts == ['v1', 'opportunities']:
+            job_id = query.get('posting_id', ['0'])[0]
+            opportunities = [to_opportunity(app) for app in self.server.applications_for(job_id)]
+            return self._send_json(200, self._envelope(query, opportunities))
+
+        self._send_json(404, {'message': 'Not found'})
+
+    def do_POST(self):
+        if not self._admit():
+            return
+        parts = urlparse(self.path).path.strip('/').split('/')
+        payload = self._body
+
+        if parts == ['v1', 'opportunities']:
+            return self._send_json(201, {'data': dict(payload, id=str(self.server.next_id()))})
+
+        if len(parts) == 4 and parts[:2] == ['v1', 'opportunities'] and parts[3] == 'addPostings':
+            return self._send_json(200, {'data': {'id': parts[2], 'applications': payload.get('postings', [])}})
+
+        self._send_json(404, {'message': 'Not found'})
+
+
+class LeverStubServer(HarvestStubServer):
+    handler_class = LeverStubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local Lever-style stub')
+    parser.add_argument('--port', type=int, default=8901)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    parser.add_argument('--rate-limit', type=int, default=0, help='requests per window before 429 (0 = unlimited)')
+    parser.add_argument('--rate-limit-window', type=float, default=10.0, help='rate-limit window in seconds')
+    args = parser.parse_args()
+
+    server = LeverStubServer(('127.0.0.1', args.port), latency=args.latency, error_rate=args.error_rate,
+                             rate_limit=args.rate_limit, rate_limit_window=args.rate_limit_window)
+    print(f'Lever stub listening on {server.base_url}')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
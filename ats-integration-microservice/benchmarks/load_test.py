@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Drive the GET /jobs, GET /applications and POST /candidates handlers at a
+target request rate against the local Harvest stub, then report throughput,
+status codes and latency percentiles per handler.
+
+Requests are scheduled open-loop: each one is due at a fixed offset from the
+start, and its latency is measured from that due time. A slow handler
+therefore shows up as queueing delay instead of silently lowering the rate.
+
+    python benchmarks/load_test.py --rps 50 --duration 20
+    python benchmarks/load_test.py --rps 100 --error-rate 0.02 --rate-limit 50 --mix jobs=2,applications=1,candidates=1
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8900   # stub already running
+    python benchmarks/load_test.py --provider lever                    # same load through the Lever adapter
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+sys.path.insert(0, current_dir)
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('GREENHOUSE_API_KEY', 'load-test')
+os.environ.setdefault('LEVER_API_KEY', 'load-test')
+
+from harvest_stub import HarvestStubServer
+from lever_stub import LeverStubServer
+from src.utils.timing import TimingAggregator
+
+API_KEY = os.getenv('API_KEY', 'demo-key-123')
+HANDLERS = ('jobs', 'applications', 'candidates')
+
+
+def parse_mix(value):
+    weights = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in HANDLERS:
+            raise argparse.ArgumentTypeError(f"unknown handler {name!r}, expected one of {', '.join(HANDLERS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+class EventFactory:
+    """Builds API Gateway events. Only called from the scheduler thread, so the RNG needs no lock."""
+
+    def __init__(self, rng, job_count):
+        self.rng = rng
+        self.job_count = job_count
+        self.sequence = itertools.count()
+
+    def _job_id(self):
+        return str(1000 + self.rng.randrange(self.job_count))
+
+    def jobs(self):
+        return {
+            'httpMethod': 'GET',
+            'headers': {'X-API-Key': API_KEY},
+            'queryStringParameters': {'page': str(self.rng.randint(1, 3)), 'per_page': '50'}
+        }
+
+    def applications(self):
+        return {
+            'httpMethod': 'GET',
+            'headers': {'X-API-Key': API_KEY},
+            'queryStringParameters': {'job_id': self._job_id(), 'per_page': '50'}
+        }
+
+    def candidates(self):
+        n = next(self.sequence)
+        return {
+            'httpMethod': 'POST',
+            'headers': {'X-API-Key': API_KEY, 'Content-Type': 'application/json'},
+            'body': json.dumps({'name': f'Load Candidate {n}', 'email': f'load{n}@example.com', 'job_id': self._job_id()})
+        }
+
+
+def load_handlers():
+    # Imported after the base URL is set, so the shared client points at the stub.
+    from src.handlers.applications import get_applications
+    from src.handlers.candidates import create_candidate
+    from src.handlers.jobs import get_jobs
+    return {'jobs': get_jobs, 'applications': get_applications, 'candidates': create_candidate}
+
+
+def invoke(handler, event, due):
+    try:
+        status = handler(event, None).get('statusCode', 0)
+    except Exception:
+        status = 'exception'
+    return status, (time.perf_counter() - due) * 1000
+
+
+def run(handlers, factory, mix, rps, duration, concurrency, rng):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    interval = 1.0 / rps
+    submitted = []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for n in itertools.count():
+            due = start + n * interval
+            if due - start >= duration:
+                break
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name = rng.choices(names, weights)[0]
+            event = getattr(factory, name)()
+            submitted.append((name, pool.submit(invoke, handlers[name], event, due)))
+    elapsed = time.perf_counter() - start
+
+    latencies = TimingAggregator(reservoir_size=len(submitted) or 1)
+    statuses = {name: Counter() for name in names}
+    for name, future in submitted:
+        status, latency_ms = future.result()
+        statuses[name][status] += 1
+        latencies.record(name, {'latency': latency_ms})
+        latencies.record('all', {'latency': latency_ms})
+    return elapsed, statuses, latencies.report()
+
+
+def print_report(elapsed, statuses, report, target_rps):
+    total = sum(sum(counts.values()) for counts in statuses.values())
+    print(f"{total} requests in {elapsed:.2f}s: {total / elapsed:.1f} req/s (target {target_rps:g})\n")
+    print(f"{'handler':<14} {'count':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}  status codes")
+
+    rows = [(name, statuses[name]) for name in statuses] + [('all', sum(statuses.values(), Counter()))]
+    for name, counts in rows:
+        if name not in report:
+            continue
+        stats = report[name]['latency']
+        codes = ' '.join(f"{code}:{count}" for code, count in sorted(counts.items(), key=lambda item: str(item[0])))
+        print(f"{name:<14} {stats['count']:>6} {stats['count'] / elapsed:>8.1f} {stats['p50']:>9.2f} "
+              f"{stats['p95']:>9.2f} {stats['p99']:>9.2f} {stats['max']:>9.2f}  {codes}")
+
+
+def print_phases():
+    from src.utils.timing import get_timing_stats
+    print(f"\n{'handler':<22} {'phase':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for handler, phases in sorted(get_timing_stats().items()):
+        for phase, stats in sorted(phases.items(), key=lambda item: -item[1]['p50']):
+            print(f"{handler:<22} {phase:<20} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['p99']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rps', type=float, default=20.0, help='target requests per second')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to generate load for')
+    parser.add_argument('--concurrency', type=int, default=64, help='handler invocations in flight at most')
+    parser.add_argument('--mix', type=parse_mix, default='jobs=3,applications=2,candidates=1',
+                        help='handler weights, e.g. jobs=3,applications=2,candidates=1')
+    parser.add_argument('--latency', type=float, default=0.05, help='stub seconds added to every request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of stub requests answered with 500')
+    parser.add_argument('--rate-limit', type=int, default=0, help='stub requests per window before 429 (0 = unlimited)')
+    parser.add_argument('--rate-limit-window', type=float, default=10.0, help='stub rate-limit window in seconds')
+    parser.add_argument('--jobs', type=int, default=250, help='jobs served by the stub')
+    parser.add_argument('--provider', choices=('greenhouse', 'lever'), default='greenhouse',
+                        help='ATS adapter to drive, with the matching stub')
+    parser.add_argument('--base-url', help='use a stub that is already running instead of starting one')
+    parser.add_argument('--seed', type=int, default=1, help='seed for the request mix and error injection')
+    parser.add_argument('--phases', action='store_true', help='also print per-phase timings from the handlers')
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        stub = LeverStubServer if args.provider == 'lever' else HarvestStubServer
+        server = stub(latency=args.latency, job_count=args.jobs, error_rate=args.error_rate,
+                      rate_limit=args.rate_limit, rate_limit_window=args.rate_limit_window,
+                      seed=args.seed).start_in_background()
+        base_url = server.base_url
+    os.environ['ATS_PROVIDER'] = args.provider
+    os.environ['LEVER_BASE_URL' if args.provider == 'lever' else 'GREENHOUSE_BASE_URL'] = base_url
+    # Without this the client's default token bucket (50 per 10s), not the handlers, sets the ceiling.
+    # A limited stub also advertises its limit in X-RateLimit headers, which the client adopts.
+    os.environ.setdefault('GREENHOUSE_RATE_LIMIT', str(args.rate_limit or 1000000))
+    os.environ.setdefault('GREENHOUSE_RATE_LIMIT_WINDOW', str(args.rate_limit_window))
+
+    rng = random.Random(args.seed)
+    handlers = load_handlers()
+    elapsed, statuses, report = run(handlers, EventFactory(rng, args.jobs), args.mix, args.rps,
+                                    args.duration, args.concurrency, rng)
+
+    print_report(elapsed, statuses, report, args.rps)
+    if server is not None:
+        stats = server.stats()
+        print(f"\nstub: {stats['requests']} upstream requests, {stats['throttled']} throttled (429), "
+              f"{stats['errors']} injected 500s")
+        server.shutdown()
+    if args.phases:
+        print_phases()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
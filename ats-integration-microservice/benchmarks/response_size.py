@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Bytes on the wire and serialisation CPU for one page of GET /jobs in each
+response mode: the previous PaginatedJobsResponse(...).dict() path, full rows,
+a fields= projection, the columnar layout, and each of those compressed.
+
+    python benchmarks/response_size.py --per-page 100 --iterations 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ['RESPONSE_COMPRESSION_MIN_BYTES'] = '0'
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+from src.models.schemas import Job, PaginatedJobsResponse
+from src.utils import response_encoding
+from src.utils.api_response import create_success_response
+from src.utils.validation import JOB_FIELDS
+
+
+def make_jobs(count):
+    return [
+        Job(
+            id=str(4000 + i),
+            title=f'Senior Software Engineer {i}',
+            location='San Francisco, CA',
+            status='OPEN',
+            external_url=f'https://boards.greenhouse.io/example/jobs/{4000 + i}'
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_page(jobs):
+    response_data = PaginatedJobsResponse(jobs=jobs, total=1000, page=1, per_page=len(jobs))
+    return {'statusCode': 200, 'headers': {}, 'body': json.dumps(response_data.dict(), default=str)}
+
+
+def page(jobs, fields, layout):
+    body = response_encoding.build_page('jobs', jobs, fields, layout, total=1000, page=1, per_page=len(jobs))
+    return create_success_response(body)
+
+
+def cpu_per_call(fn, iterations):
+    for _ in range(min(iterations, 100)):
+        fn()
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--per-page', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.per_page)
+    modes = [
+        ('previous (.dict + json)', lambda: legacy_page(jobs)),
+        ('rows, all fields', lambda: page(jobs, JOB_FIELDS, response_encoding.ROWS)),
+        ('rows, fields=id,title', lambda: page(jobs, ('id', 'title'), response_encoding.ROWS)),
+        ('columns, all fields', lambda: page(jobs, JOB_FIELDS, response_encoding.COLUMNS)),
+        ('columns, fields=id,title', lambda: page(jobs, ('id', 'title'), response_encoding.COLUMNS)),
+    ]
+    encodings = ['identity', 'gzip'] + (['br'] if response_encoding._get_brotli() is not None else [])
+
+    print(f"{args.per_page} jobs per page; brotli: {'yes' if 'br' in encodings else 'no'}")
+    print(f"{'mode':<28} {'encoding':<9} {'bytes':>8} {'cpu us':>9}")
+    for name, build in modes:
+        for encoding in encodings:
+            event = {'headers': {'Accept-Encoding': encoding}}
+            if encoding == 'identity':
+                run = build
+            else:
+                run = lambda build=build, event=event: response_encoding.encode_response(build(), event)
+            size = len(run()['body'])
+            if encoding != 'identity':
+                size = size * 3 // 4  # base64 overhead is stripped by API Gateway before it reaches the client
+            print(f"{name:<28} {encoding:<9} {size:>8} {cpu_per_call(run, args.iterations):>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Aggregate the per-phase timing lines the handlers log (EMF format) into
+p50/p95/p99 per handler and phase.
+
+    serverless offline 2>&1 | tee offline.log
+    python benchmarks/timing_report.py offline.log
+    python benchmarks/timing_report.py < offline.log
+"""
+
+import argparse
+import fileinput
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from src.utils.timing import TimingAggregator
+
+
+def print_report(report):
+    print(f"{'handler':<22} {'phase':<20} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for handler, phases in sorted(report.items()):
+        # Slowest phases first; total always last so it reads as the sum line.
+        ordered = sorted((p for p in phases if p != 'total'), key=lambda p: -phases[p]['p50'])
+        if 'total' in phases:
+            ordered.append('total')
+        for phase in ordered:
+            stats = phases[phase]
+            print(f"{handler:<22} {phase:<20} {stats['count']:>6} {stats['p50']:>9.2f} "
+                  f"{stats['p95']:>9.2f} {stats['p99']:>9.2f} {stats['max']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*', help='log files (default: stdin)')
+    args = parser.parse_args()
+
+    aggregator = TimingAggregator(reservoir_size=100000)
+    used = aggregator.record_emf_lines(fileinput.input(args.files))
+    if not used:
+        print("No timing lines found", file=sys.stderr)
+        return 1
+
+    print(f"{used} requests\n")
+    print_report(aggregator.report())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+CPU time per call for the request-path utilities, against the previous
+implementations (reproduced below) so the difference is visible on any machine.
+
+    python benchmarks/utils_microbench.py --iterations 20000
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import warnings
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+from src.models.schemas import Candidate, ErrorResponse
+from src.utils import api_response
+from src.utils.exceptions import ValidationError
+from src.utils.validation import validate_candidate_data
+
+
+# Previous implementations, kept verbatim for comparison.
+
+def legacy_validate_candidate_data(body):
+    errors = []
+    required_fields = ['name', 'email', 'job_id']
+    for field in required_fields:
+        if field not in body or not body[field]:
+            errors.append(f"Field '{field}' is required")
+    if 'email' in body and body['email']:
+        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+        if not re.match(email_pattern, body['email']):
+            errors.append("Invalid email format")
+    if 'phone' in body and body['phone']:
+        phone_pattern = r'^[\+]?[1-9][\d]{0,15}$'
+        if not re.match(phone_pattern, body['phone'].replace(' ', '').replace('-', '').replace('(', '').replace(')', '')):
+            errors.append("Invalid phone format")
+    if 'resume_url' in body and body['resume_url']:
+        if not (body['resume_url'].startswith('http://') or body['resume_url'].startswith('https://')):
+            errors.append("Resume URL must be a valid HTTP/HTTPS URL")
+    if errors:
+        raise ValidationError(f"Validation failed: {'; '.join(errors)}")
+    return Candidate(**body)
+
+
+def legacy_create_success_response(data, status_code=200):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, X-API-Key'
+        },
+        'body': json.dumps(data, default=str)
+    }
+
+
+def legacy_create_error_response(error, status_code=500, details=None):
+    error_response = ErrorResponse(error=error, code=status_code, details=details)
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, X-API-Key'
+        },
+        'body': json.dumps(error_response.dict())
+    }
+
+
+VALID_BODY = {
+    'name': 'Jane Roe',
+    'email': 'jane.roe@example.com',
+    'phone': '+1 (555) 123-4567',
+    'resume_url': 'https://example.com/resume.pdf',
+    'job_id': '12345'
+}
+INVALID_BODY = {'name': 'Jane Roe', 'email': 'not-an-email', 'phone': 'abc', 'job_id': ''}
+JOBS_PAGE = {
+    'jobs': [
+        {
+            'id': str(4000 + i),
+            'title': f'Software Engineer {i}',
+            'location': 'San Francisco, CA',
+            'status': 'OPEN',
+            'external_url': f'https://boards.greenhouse.io/example/jobs/{4000 + i}'
+        }
+        for i in range(100)
+    ],
+    'total': 237,
+    'page': 1,
+    'per_page': 100
+}
+
+
+def validate_or_error(validate, body):
+    try:
+        return validate(body)
+    except ValidationError as e:
+        return e
+
+
+def candidate_request(validate, success, error):
+    """The CPU-bound part of POST /candidates: parse, validate, respond."""
+    def run(raw_body):
+        body = json.loads(raw_body)
+        try:
+            candidate = validate(body)
+        except ValidationError as e:
+            return error("Validation failed", 400, str(e))
+        return success({'candidate': {'name': candidate.name, 'email': candidate.email, 'job_id': candidate.job_id}}, 201)
+    return run
+
+
+CASES = [
+    ('validate valid candidate',
+     lambda: validate_or_error(legacy_validate_candidate_data, VALID_BODY),
+     lambda: validate_or_error(validate_candidate_data, VALID_BODY)),
+    ('validate invalid candidate',
+     lambda: validate_or_error(legacy_validate_candidate_data, INVALID_BODY),
+     lambda: validate_or_error(validate_candidate_data, INVALID_BODY)),
+    ('error response',
+     lambda: legacy_create_error_response("Validation failed", 400, "Invalid email format"),
+     lambda: api_response.create_error_response("Validation failed", 400, "Invalid email format")),
+    ('success response, 100 jobs',
+     lambda: legacy_create_success_response(JOBS_PAGE),
+     lambda: api_response.create_success_response(JOBS_PAGE)),
+    ('POST /candidates CPU path',
+     lambda: candidate_request(legacy_validate_candidate_data, legacy_create_success_response,
+                               legacy_create_error_response)(json.dumps(VALID_BODY)),
+     lambda: candidate_request(validate_candidate_data, api_response.create_success_response,
+                               api_response.create_error_response)(json.dumps(VALID_BODY))),
+]
+
+
+def cpu_per_call(fn, iterations):
+    for _ in range(min(iterations, 1000)):
+        fn()
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if api_response._get_orjson() is not None else 'no'}")
+    print(f"{'case':<30} {'before us':>10} {'after us':>10} {'speedup':>8}")
+    for name, before, after in CASES:
+        before_us = cpu_per_call(before, args.iterations)
+        after_us = cpu_per_call(after, args.iterations)
+        print(f"{name:<30} {before_us:>10.2f} {after_us:>10.2f} {before_us / after_us:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,30 +4,43 @@ Returns list of applications for a given job
 """
 
 import os
+from datetime import datetime, timezone
 from typing import Dict, Any
-from src.services.greenhouse_client import GreenhouseClient
-from src.utils.logger import get_logger
-from src.utils.api_response import create_success_response, create_error_response, handle_cors_response
-from src.utils.validation import validate_api_key, validate_query_parameters
-from src.utils.exceptions import ATSServiceError, AuthenticationError, ATSAPIError, ValidationError
-from src.models.schemas import PaginatedApplicationsResponse
+from src.utils.logger import flush_logs_on_return, get_logger
+from src.utils.timing import span, timed_handler
+from src.utils.api_response import create_success_response, create_error_response, create_not_modified_response, handle_cors_response
+from src.utils.exceptions import ATSServiceError, AuthenticationError, ATSAPIError, CircuitOpenError, ValidationError
 
 logger = get_logger(__name__)
 
+@flush_logs_on_return
+@timed_handler('getApplications')
 def get_applications(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
         cors_response = handle_cors_response(event)
         if cors_response:
             return cors_response
         
-        if not validate_api_key(event):
-            logger.warning("Unauthorized request - invalid API key")
-            return create_error_response("Unauthorized", 401, "Invalid or missing API key")
+        from src.services.application_sync import freshness_from_state, get_sync_engine, is_sync_enabled
+        from src.services.client_registry import get_client
+        from src.utils.response_encoding import build_page, compute_etag, encode_response, etag_matches
+        from src.utils.validation import (
+            APPLICATION_FIELDS, validate_api_key, validate_fields_parameter, validate_include_total_parameter,
+            validate_layout_parameter, validate_query_parameters
+        )
+        
+        with span('validate'):
+            if not validate_api_key(event):
+                logger.warning("Unauthorized request - invalid API key")
+                return create_error_response("Unauthorized", 401, "Invalid or missing API key")
         
-        validated_params = validate_query_parameters(event)
-        page = validated_params['page']
-        per_page = validated_params['per_page']
-        job_id = validated_params.get('job_id')
+            validated_params = validate_query_parameters(event)
+            page = validated_params['page']
+            per_page = validated_params['per_page']
+            job_id = validated_params.get('job_id')
+            fields = validate_fields_parameter(event, APPLICATION_FIELDS)
+            layout = validate_layout_parameter(event)
+            include_total = validate_include_total_parameter(event)
         
         if not job_id:
             logger.warning("job_id query parameter is required for applications endpoint")
@@ -36,13 +49,34 @@ def get_applications(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.info(f"Fetching applications for job {job_id} - page: {page}, per_page: {per_page}")
         
         try:
-            client = GreenhouseClient()
+            with span('client'):
+                client, warm = get_client()
+            logger.info(f"Using {'warm' if warm else 'cold'} {client.display_name} client")
         except AuthenticationError as e:
             logger.error(f"Authentication failed: {str(e)}")
             return create_error_response("Authentication failed", 500, str(e))
         
         try:
-            applications = client.get_applications(job_id=job_id, page=page, per_page=per_page)
+            if is_sync_enabled():
+                sync_engine = get_sync_engine(client)
+                with span('sync'):
+                    state = sync_engine.ensure_fresh(job_id)
+                with span('snapshot_query'):
+                    applications, total = sync_engine.list_applications(job_id, page=page, per_page=per_page)
+                freshness = freshness_from_state(state)
+            else:
+                with span('fetch_applications'):
+                    applications, total = client.get_applications_page(
+                        job_id=job_id, page=page, per_page=per_page, include_total=include_total
+                    )
+                freshness = {
+                    'source': 'live',
+                    'synced_at': datetime.now(timezone.utc).isoformat(),
+                    'age_seconds': 0.0
+                }
+        except CircuitOpenError as e:
+            logger.warning(f"Greenhouse circuit open: {str(e)}")
+            return create_error_response("Greenhouse temporarily unavailable", 503, str(e))
         except ATSAPIError as e:
             logger.error(f"ATS API error: {str(e)}")
             return create_error_response("Failed to fetch applications from ATS", 502, str(e))
@@ -50,17 +84,24 @@ def get_applications(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             logger.error(f"Unexpected error fetching applications: {str(e)}")
             return create_error_response("Internal server error", 500, str(e))
         
-        total = len(applications) + (page - 1) * per_page
+        with span('etag'):
+            etag = compute_etag(applications, fields, layout, total=total, page=page, per_page=per_page)
+            if etag_matches(event, etag):
+                logger.info("Applications unchanged since the client's copy, returning 304")
+                return create_not_modified_response(etag)
         
-        response_data = PaginatedApplicationsResponse(
-            applications=applications,
-            total=total,
-            page=page,
-            per_page=per_page
-        )
+        with span('serialize'):
+            # Same shape as PaginatedApplicationsResponse, built without the model.
+            response_data = build_page('applications', applications, fields, layout,
+                                       total=total, page=page, per_page=per_page, freshness=freshness)
+            response = create_success_response(response_data)
+            response['headers']['ETag'] = etag
+        
+        with span('compress'):
+            response = encode_response(response, event)
         
         logger.info(f"Successfully returned {len(applications)} applications for job {job_id}")
-        return create_success_response(response_data.dict())
+        return response
         
     except ValidationError as e:
         logger.warning(f"Validation error: {str(e)}")
@@ -0,0 +1,182 @@
+"""
+Handler for POST /candidates/bulk endpoint
+Creates many candidates and applies each of them to a job
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from src.utils.logger import flush_logs_on_return, get_logger
+from src.utils.timing import run_in_context, span, timed_handler
+from src.utils.api_response import create_success_response, create_error_response, handle_cors_response
+from src.utils.exceptions import ATSServiceError, AuthenticationError, ValidationError
+
+if TYPE_CHECKING:
+    from src.models.schemas import Candidate
+    from src.services.ats_client import ATSClient
+    from src.services.idempotency import IdempotencyStore
+
+logger = get_logger(__name__)
+
+# Each record is two Harvest calls. The default token bucket (50 calls per 10 s)
+# allows about 150 calls within the function's 30 s timeout, so 50 records
+# leave room for upstream latency and a retry or two.
+DEFAULT_BULK_MAX_RECORDS = 50
+DEFAULT_BULK_CONCURRENCY = 8
+# Records not started this many seconds before the Lambda deadline are skipped
+DEFAULT_BULK_DEADLINE_MARGIN = 5.0
+
+def _start_deadline(context: Any) -> Optional[float]:
+    """Monotonic time after which no new record is started, or None outside Lambda."""
+    try:
+        remaining = float(context.get_remaining_time_in_millis()) / 1000
+    except (AttributeError, TypeError, ValueError):
+        return None
+    margin = float(os.getenv('BULK_DEADLINE_MARGIN', DEFAULT_BULK_DEADLINE_MARGIN))
+    return time.monotonic() + remaining - margin
+
+def _record_idempotency_key(record: Dict[str, Any], index: int, request_key: Optional[str]) -> str:
+    """
+    Explicit per-record key first, then the request's Idempotency-Key plus the
+    record position, then the (email, job_id) pair so a re-sent import file
+    never applies the same person to the same job twice.
+    """
+    if record.get('idempotency_key'):
+        return f"bulk:{record['idempotency_key']}"
+    if request_key:
+        return f"bulk:{request_key}:{index}"
+    natural_key = f"{str(record.get('email', '')).strip().lower()}\0{record.get('job_id', '')}"
+    return f"bulk:{hashlib.sha256(natural_key.encode()).hexdigest()}"
+
+def _process_record(client: 'ATSClient', store: 'IdempotencyStore', key: str, candidate_data: 'Candidate',
+                    deadline: Optional[float] = None) -> Dict[str, Any]:
+    from src.services import idempotency
+    
+    # Better to hand the record back than to be cut off mid-import and lose every result
+    if deadline is not None and time.monotonic() > deadline:
+        return {'status': 'skipped', 'error': "Not started before the request deadline; send it again"}
+    
+    owned, record = idempotency.begin(store, key)
+    
+    if not owned:
+        if record and record.get('status') == idempotency.COMPLETED:
+            return dict(record, status='replayed')
+        return {
+            'status': 'failed',
+            'candidate_id': (record or {}).get('candidate_id'),
+            'error': "Another request for this record is still in progress"
+        }
+    
+    candidate_id = (record or {}).get('candidate_id')
+    try:
+        if not candidate_id:
+            candidate_response = client.create_candidate(candidate_data)
+            candidate_id = str(candidate_response.get('id'))
+            idempotency.record_progress(store, key, {'candidate_id': candidate_id})
+        
+        application_response = client.create_application(candidate_id, candidate_data.job_id)
+        result = {
+            'candidate_id': candidate_id,
+            'application_id': str(application_response.get('id'))
+        }
+        idempotency.finish(store, key, result)
+        return dict(result, status='created')
+    
+    except Exception as e:
+        logger.error(f"Bulk record {key} failed: {str(e)}")
+        idempotency.abandon(store, key, {'candidate_id': candidate_id} if candidate_id else None)
+        return {
+            'status': 'failed',
+            'candidate_id': candidate_id,
+            'error': str(e)
+        }
+
+@flush_logs_on_return
+@timed_handler('createCandidatesBulk')
+def create_candidates_bulk(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    try:
+        cors_response = handle_cors_response(event)
+        if cors_response:
+            return cors_response
+        
+        from src.services.client_registry import get_client
+        from src.services.idempotency import get_idempotency_store
+        from src.utils.validation import validate_api_key, validate_bulk_request_body, validate_candidate_data, validate_idempotency_key
+        
+        if not validate_api_key(event):
+            logger.warning("Unauthorized request - invalid API key")
+            return create_error_response("Unauthorized", 401, "Invalid or missing API key")
+        
+        with span('validate'):
+            max_records = int(os.getenv('BULK_MAX_RECORDS', DEFAULT_BULK_MAX_RECORDS))
+            records = validate_bulk_request_body(event, max_records)
+            request_key = validate_idempotency_key(event)
+        
+            results = [None] * len(records)
+            pending = []
+            seen_keys = {}
+            for index, record in enumerate(records):
+                if not isinstance(record, dict):
+                    results[index] = {'index': index, 'status': 'invalid', 'error': "Each candidate must be a JSON object"}
+                    continue
+                key = _record_idempotency_key(record, index, request_key)
+                if key in seen_keys:
+                    results[index] = {
+                        'index': index,
+                        'idempotency_key': key,
+                        'status': 'invalid',
+                        'error': f"Duplicate of record {seen_keys[key]}"
+                    }
+                    continue
+                seen_keys[key] = index
+                try:
+                    pending.append((index, key, validate_candidate_data(record)))
+                except ValidationError as e:
+                    results[index] = {'index': index, 'idempotency_key': key, 'status': 'invalid', 'error': str(e)}
+        
+        logger.info(f"Bulk import of {len(records)} candidates - {len(pending)} valid")
+        
+        if pending:
+            try:
+                with span('client'):
+                    client, warm = get_client()
+                logger.info(f"Using {'warm' if warm else 'cold'} {client.display_name} client")
+            except AuthenticationError as e:
+                logger.error(f"Authentication failed: {str(e)}")
+                return create_error_response("Authentication failed", 500, str(e))
+            
+            store = get_idempotency_store()
+            deadline = _start_deadline(context)
+            concurrency = int(os.getenv('BULK_CONCURRENCY', DEFAULT_BULK_CONCURRENCY))
+            with span('import'), ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pending)))) as executor:
+                futures = [
+                    (index, key, executor.submit(run_in_context(_process_record, client, store, key, candidate_data, deadline)))
+                    for index, key, candidate_data in pending
+                ]
+                for index, key, future in futures:
+                    results[index] = dict(future.result(), index=index, idempotency_key=key)
+        
+        summary = {'created': 0, 'replayed': 0, 'failed': 0, 'invalid': 0, 'skipped': 0}
+        for result in results:
+            summary[result['status']] += 1
+        
+        status_code = 201 if summary['created'] + summary['replayed'] == len(records) else 207
+        logger.info(f"Bulk import finished - {summary}")
+        with span('serialize'):
+            return create_success_response({
+                'total': len(records),
+                'summary': summary,
+                'results': results
+            }, status_code)
+    
+    except ValidationError as e:
+        logger.warning(f"Validation error: {str(e)}")
+        return create_error_response("Validation failed", 400, str(e))
+    except ATSServiceError as e:
+        logger.error(f"ATS service error: {str(e)}")
+        return create_error_response("Service error", 500, str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in create_candidates_bulk: {str(e)}")
+        return create_error_response("Internal server error", 500)
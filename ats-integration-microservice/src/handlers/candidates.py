@@ -3,41 +3,46 @@ Handler for POST /candidates endpoint
 Creates a candidate and applies them to a job
 """
 
+import hashlib
+import json
 import os
-from typing import Dict, Any
-from src.services.greenhouse_client import GreenhouseClient
-from src.utils.logger import get_logger
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from src.utils.logger import flush_logs_on_return, get_logger
+from src.utils.timing import span, timed_handler
 from src.utils.api_response import create_success_response, create_error_response, handle_cors_response
-from src.utils.validation import validate_api_key, validate_request_body, validate_candidate_data
-from src.utils.exceptions import ATSServiceError, AuthenticationError, ATSAPIError, ValidationError
+from src.utils.exceptions import ATSServiceError, AuthenticationError, ATSAPIError, CircuitOpenError, ValidationError
+
+if TYPE_CHECKING:
+    from src.models.schemas import Candidate
+    from src.services.idempotency import IdempotencyStore
 
 logger = get_logger(__name__)
 
-def create_candidate(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+def _create_and_apply(candidate_data: 'Candidate', store: Optional['IdempotencyStore'], key: Optional[str],
+                      progress: Dict[str, Any]) -> Dict[str, Any]:
+    from src.services import idempotency
+    from src.services.client_registry import get_client
+    
     try:
-        cors_response = handle_cors_response(event)
-        if cors_response:
-            return cors_response
-        
-        if not validate_api_key(event):
-            logger.warning("Unauthorized request - invalid API key")
-            return create_error_response("Unauthorized", 401, "Invalid or missing API key")
-        
-        body = validate_request_body(event)
-        candidate_data = validate_candidate_data(body)
-        
-        logger.info(f"Creating candidate for job {candidate_data.job_id}")
-        
+        with span('client'):
+            client, warm = get_client()
+        logger.info(f"Using {'warm' if warm else 'cold'} {client.display_name} client")
+    except AuthenticationError as e:
+        logger.error(f"Authentication failed: {str(e)}")
+        return create_error_response("Authentication failed", 500, str(e))
+    
+    candidate_id = progress.get('candidate_id')
+    if candidate_id:
+        logger.info(f"Resuming with previously created candidate {candidate_id}")
+    else:
         try:
-            client = GreenhouseClient()
-        except AuthenticationError as e:
-            logger.error(f"Authentication failed: {str(e)}")
-            return create_error_response("Authentication failed", 500, str(e))
-        
-        try:
-            candidate_response = client.create_candidate(candidate_data)
+            with span('create_candidate'):
+                candidate_response = client.create_candidate(candidate_data)
             candidate_id = str(candidate_response.get('id'))
             logger.info(f"Successfully created candidate with ID: {candidate_id}")
+        except CircuitOpenError as e:
+            logger.warning(f"Greenhouse circuit open: {str(e)}")
+            return create_error_response("Greenhouse temporarily unavailable", 503, str(e))
         except ATSAPIError as e:
             logger.error(f"ATS API error creating candidate: {str(e)}")
             return create_error_response("Failed to create candidate in ATS", 502, str(e))
@@ -45,31 +50,100 @@ def create_candidate(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             logger.error(f"Unexpected error creating candidate: {str(e)}")
             return create_error_response("Internal server error", 500, str(e))
         
-        try:
+        progress['candidate_id'] = candidate_id
+        if store is not None:
+            idempotency.record_progress(store, key, progress)
+    
+    try:
+        with span('create_application'):
             application_response = client.create_application(candidate_id, candidate_data.job_id)
-            application_id = str(application_response.get('id'))
-            logger.info(f"Successfully created application with ID: {application_id}")
-        except ATSAPIError as e:
-            logger.error(f"ATS API error creating application: {str(e)}")
-            logger.warning(f"Application creation failed but candidate {candidate_id} was created")
-            return create_error_response("Candidate created but failed to apply to job", 502, str(e))
-        except Exception as e:
-            logger.error(f"Unexpected error creating application: {str(e)}")
-            return create_error_response("Candidate created but failed to apply to job", 502, str(e))
-        
-        success_response = {
-            'message': 'Candidate created and applied successfully',
-            'candidate_id': candidate_id,
-            'application_id': application_id,
-            'candidate': {
-                'name': candidate_data.name,
-                'email': candidate_data.email,
-                'job_id': candidate_data.job_id
-            }
+        application_id = str(application_response.get('id'))
+        logger.info(f"Successfully created application with ID: {application_id}")
+    except CircuitOpenError as e:
+        logger.warning(f"Greenhouse circuit open: {str(e)}")
+        logger.warning(f"Application creation failed but candidate {candidate_id} was created")
+        return create_error_response("Greenhouse temporarily unavailable", 503, str(e))
+    except ATSAPIError as e:
+        logger.error(f"ATS API error creating application: {str(e)}")
+        logger.warning(f"Application creation failed but candidate {candidate_id} was created")
+        return create_error_response("Candidate created but failed to apply to job", 502, str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error creating application: {str(e)}")
+        return create_error_response("Candidate created but failed to apply to job", 502, str(e))
+    
+    success_response = {
+        'message': 'Candidate created and applied successfully',
+        'candidate_id': candidate_id,
+        'application_id': application_id,
+        'candidate': {
+            'name': candidate_data.name,
+            'email': candidate_data.email,
+            'job_id': candidate_data.job_id
         }
-        
-        logger.info(f"Successfully completed candidate creation and application")
+    }
+    
+    logger.info(f"Successfully completed candidate creation and application")
+    with span('serialize'):
         return create_success_response(success_response, 201)
+
+@flush_logs_on_return
+@timed_handler('createCandidate')
+def create_candidate(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    try:
+        cors_response = handle_cors_response(event)
+        if cors_response:
+            return cors_response
+        
+        from src.services import idempotency
+        from src.services.idempotency import get_idempotency_store
+        from src.utils.validation import validate_api_key, validate_request_body, validate_candidate_data, validate_idempotency_key
+        
+        with span('validate'):
+            if not validate_api_key(event):
+                logger.warning("Unauthorized request - invalid API key")
+                return create_error_response("Unauthorized", 401, "Invalid or missing API key")
+        
+            body = validate_request_body(event)
+            candidate_data = validate_candidate_data(body)
+            idempotency_key = validate_idempotency_key(event)
+        
+        logger.info(f"Creating candidate for job {candidate_data.job_id}")
+        
+        if not idempotency_key:
+            return _create_and_apply(candidate_data, None, None, {})
+        
+        store = get_idempotency_store()
+        key = f"candidate:{idempotency_key}"
+        request_hash = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+        with span('idempotency'):
+            owned, record = idempotency.begin(store, key)
+        
+        if not owned:
+            if record is None or record.get('status') != idempotency.COMPLETED:
+                logger.warning(f"Idempotency-Key {idempotency_key} is still in progress")
+                return create_error_response("Conflict", 409, "A request with this Idempotency-Key is still in progress")
+            if record.get('request_hash') != request_hash:
+                return create_error_response("Unprocessable Entity", 422, "Idempotency-Key was already used with a different request body")
+            logger.info(f"Replaying stored response for Idempotency-Key {idempotency_key}")
+            return record['response']
+        
+        if record and record.get('request_hash') not in (None, request_hash):
+            idempotency.abandon(store, key, record)
+            return create_error_response("Unprocessable Entity", 422, "Idempotency-Key was already used with a different request body")
+        
+        progress = {'request_hash': request_hash}
+        if record and record.get('candidate_id'):
+            progress['candidate_id'] = record['candidate_id']
+        
+        response = None
+        try:
+            response = _create_and_apply(candidate_data, store, key, progress)
+            return response
+        finally:
+            if response is not None and response['statusCode'] == 201:
+                idempotency.finish(store, key, dict(progress, response=response))
+            else:
+                idempotency.abandon(store, key, progress if progress.get('candidate_id') else None)
         
     except ValidationError as e:
         logger.warning(f"Validation error: {str(e)}")
@@ -79,4 +153,4 @@ def create_candidate(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         return create_error_response("Service error", 500, str(e))
     except Exception as e:
         logger.error(f"Unexpected error in create_candidate: {str(e)}")
-        return create_error_response("Internal server error", 500)
+        return create_error_response("Internal server error", 500)
\ No newline at end of file
@@ -5,40 +5,59 @@ Returns list of open jobs from Greenhouse ATS
 
 import os
 from typing import Dict, Any
-from src.services.greenhouse_client import GreenhouseClient
-from src.utils.logger import get_logger
-from src.utils.api_response import create_success_response, create_error_response, handle_cors_response
-from src.utils.validation import validate_api_key, validate_query_parameters, validate_job_status_parameter
-from src.utils.exceptions import ATSServiceError, AuthenticationError, ATSAPIError, ValidationError
-from src.models.schemas import PaginatedJobsResponse
+from src.utils.logger import flush_logs_on_return, get_logger
+from src.utils.timing import span, timed_handler
+from src.utils.api_response import create_success_response, create_error_response, create_not_modified_response, handle_cors_response
+from src.utils.exceptions import ATSServiceError, AuthenticationError, ATSAPIError, CircuitOpenError, ValidationError
 
 logger = get_logger(__name__)
 
+@flush_logs_on_return
+@timed_handler('getJobs')
 def get_jobs(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
         cors_response = handle_cors_response(event)
         if cors_response:
             return cors_response
         
-        if not validate_api_key(event):
-            logger.warning("Unauthorized request - invalid API key")
-            return create_error_response("Unauthorized", 401, "Invalid or missing API key")
+        from src.services.client_registry import get_client
+        from src.utils.response_encoding import build_page, compute_etag, encode_response, etag_matches
+        from src.utils.validation import (
+            JOB_FIELDS, validate_api_key, validate_fields_parameter, validate_job_status_parameter,
+            validate_include_total_parameter, validate_layout_parameter, validate_query_parameters
+        )
+        
+        with span('validate'):
+            if not validate_api_key(event):
+                logger.warning("Unauthorized request - invalid API key")
+                return create_error_response("Unauthorized", 401, "Invalid or missing API key")
         
-        validated_params = validate_query_parameters(event)
-        page = validated_params['page']
-        per_page = validated_params['per_page']
-        status = validate_job_status_parameter(event)
+            validated_params = validate_query_parameters(event)
+            page = validated_params['page']
+            per_page = validated_params['per_page']
+            status = validate_job_status_parameter(event)
+            fields = validate_fields_parameter(event, JOB_FIELDS)
+            layout = validate_layout_parameter(event)
+            include_total = validate_include_total_parameter(event)
         
         logger.info(f"Fetching jobs - page: {page}, per_page: {per_page}, status: {status}")
         
         try:
-            client = GreenhouseClient()
+            with span('client'):
+                client, warm = get_client()
+            logger.info(f"Using {'warm' if warm else 'cold'} {client.display_name} client")
         except AuthenticationError as e:
             logger.error(f"Authentication failed: {str(e)}")
             return create_error_response("Authentication failed", 500, str(e))
         
         try:
-            jobs = client.get_jobs(status=status, page=page, per_page=per_page)
+            with span('fetch_jobs'):
+                jobs, total = client.get_jobs_page(
+                    status=status, page=page, per_page=per_page, include_total=include_total
+                )
+        except CircuitOpenError as e:
+            logger.warning(f"Greenhouse circuit open: {str(e)}")
+            return create_error_response("Greenhouse temporarily unavailable", 503, str(e))
         except ATSAPIError as e:
             logger.error(f"ATS API error: {str(e)}")
             return create_error_response("Failed to fetch jobs from ATS", 502, str(e))
@@ -46,17 +65,23 @@ def get_jobs(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             logger.error(f"Unexpected error fetching jobs: {str(e)}")
             return create_error_response("Internal server error", 500, str(e))
         
-        total = len(jobs) + (page - 1) * per_page
+        with span('etag'):
+            etag = compute_etag(jobs, fields, layout, total=total, page=page, per_page=per_page)
+            if etag_matches(event, etag):
+                logger.info("Jobs unchanged since the client's copy, returning 304")
+                return create_not_modified_response(etag)
         
-        response_data = PaginatedJobsResponse(
-            jobs=jobs,
-            total=total,
-            page=page,
-            per_page=per_page
-        )
+        with span('serialize'):
+            # Same shape as PaginatedJobsResponse, built without the model.
+            response_data = build_page('jobs', jobs, fields, layout, total=total, page=page, per_page=per_page)
+            response = create_success_response(response_data)
+            response['headers']['ETag'] = etag
+        
+        with span('compress'):
+            response = encode_response(response, event)
         
         logger.info(f"Successfully returned {len(jobs)} jobs")
-        return create_success_response(response_data.dict())
+        return response
         
     except ValidationError as e:
         logger.warning(f"Validation error: {str(e)}")
@@ -0,0 +1,65 @@
+"""
+Handler for POST /webhooks/greenhouse endpoint
+Applies Greenhouse webhook events to the job cache and application snapshot through shared generations
+"""
+
+import base64
+import json
+from typing import Dict, Any
+from src.utils.logger import flush_logs_on_return, get_logger
+from src.utils.timing import span, timed_handler
+from src.utils.api_response import create_success_response, create_error_response, handle_cors_response
+from src.utils.exceptions import ATSServiceError, AuthenticationError, ConfigurationError, ValidationError
+
+logger = get_logger(__name__)
+
+@flush_logs_on_return
+@timed_handler('greenhouseWebhook')
+def greenhouse_webhook(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    try:
+        cors_response = handle_cors_response(event)
+        if cors_response:
+            return cors_response
+        
+        from src.services.webhooks import apply_event, verify_signature
+        
+        # Greenhouse signs the exact bytes it sent, so verify before decoding anything.
+        body = event.get('body') or ''
+        if event.get('isBase64Encoded'):
+            raw_body = base64.b64decode(body)
+        else:
+            raw_body = body.encode('utf-8')
+        
+        headers = event.get('headers') or {}
+        try:
+            with span('verify'):
+                verify_signature(raw_body, headers.get('Signature') or headers.get('signature'))
+        except AuthenticationError as e:
+            logger.warning(f"Rejected webhook: {str(e)}")
+            return create_error_response("Unauthorized", 401, str(e))
+        except ConfigurationError as e:
+            logger.error(f"Webhook secret not configured: {str(e)}")
+            return create_error_response("Webhook not configured", 500, str(e))
+        
+        try:
+            webhook = json.loads(raw_body)
+        except json.JSONDecodeError:
+            raise ValidationError("Invalid JSON in request body")
+        if not isinstance(webhook, dict):
+            raise ValidationError("Webhook body must be a JSON object")
+        
+        logger.info(f"Received Greenhouse webhook {webhook.get('action')}")
+        with span('apply'):
+            result = apply_event(webhook)
+        
+        return create_success_response(result)
+    
+    except ValidationError as e:
+        logger.warning(f"Validation error: {str(e)}")
+        return create_error_response("Validation failed", 400, str(e))
+    except ATSServiceError as e:
+        logger.error(f"ATS service error: {str(e)}")
+        return create_error_response("Service error", 500, str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in greenhouse_webhook: {str(e)}")
+        return create_error_response("Internal server error", 500)
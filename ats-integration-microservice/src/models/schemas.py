@@ -40,12 +40,18 @@ class ErrorResponse(BaseModel):
 
 class PaginatedJobsResponse(BaseModel):
     jobs: List[Job]
-    total: int = Field(..., description="Total number of jobs")
+    total: Optional[int] = Field(..., description="Total number of jobs, null only when include_total=0 and this is not the last page")
     page: int = Field(..., description="Current page number")
     per_page: int = Field(..., description="Jobs per page")
 
+class Freshness(BaseModel):
+    source: str = Field(..., description="'live' for a Greenhouse call, 'snapshot' for the local sync store")
+    synced_at: Optional[str] = Field(None, description="When the data was last synced from Greenhouse (ISO 8601)")
+    age_seconds: Optional[float] = Field(None, description="Seconds since the last sync")
+
 class PaginatedApplicationsResponse(BaseModel):
     applications: List[Application]
-    total: int = Field(..., description="Total number of applications")
+    total: Optional[int] = Field(..., description="Total number of applications, null only when include_total=0 and this is not the last page")
     page: int = Field(..., description="Current page number")
     per_page: int = Field(..., description="Applications per page")
+    freshness: Optional[Freshness] = Field(None, description="Where the page came from and how old it is")
@@ -0,0 +1,335 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from src.models.schemas import Application, ApplicationStatus
+from src.services.ats_client import ATSClient
+from src.services.generations import current_generation
+from src.services.single_flight import get_single_flight
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SYNC_DB_PATH = '/tmp/ats-applications.sqlite3'
+DEFAULT_SYNC_MAX_AGE = 60.0
+DEFAULT_SYNC_RETENTION = 86400.0
+PRUNE_INTERVAL = 300.0
+WATERMARK_SKEW = timedelta(seconds=1)
+# Bump when the tables change; an older snapshot is dropped and synced again.
+SNAPSHOT_SCHEMA_VERSION = 3
+
+
+class ApplicationStore:
+    """
+    Local SQLite snapshot of ATS applications, indexed by
+    (account, job_id, status), plus a per-job sync watermark.
+
+    Rows are scoped to the account (ATSClient.account_key()) they were synced
+    from, so a changed API key or base URL never serves another account's
+    applications.
+    """
+
+    def __init__(self, path: str = DEFAULT_SYNC_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._pruned_at = 0.0
+        self._prune_lock = threading.Lock()
+        conn = self._connection()
+        if conn.execute('PRAGMA user_version').fetchone()[0] != SNAPSHOT_SCHEMA_VERSION:
+            conn.executescript(
+                'DROP TABLE IF EXISTS applications;'
+                'DROP TABLE IF EXISTS sync_state;'
+                f'PRAGMA user_version = {SNAPSHOT_SCHEMA_VERSION};'
+            )
+        conn.executescript(
+            'CREATE TABLE IF NOT EXISTS applications ('
+            '  account TEXT NOT NULL,'
+            '  id TEXT NOT NULL,'
+            '  job_id TEXT NOT NULL,'
+            '  status TEXT NOT NULL,'
+            '  candidate_name TEXT NOT NULL,'
+            '  email TEXT NOT NULL,'
+            '  last_activity_at TEXT,'
+            '  PRIMARY KEY (account, id)'
+            ');'
+            'CREATE INDEX IF NOT EXISTS applications_job_status ON applications (account, job_id, status);'
+            'CREATE TABLE IF NOT EXISTS sync_state ('
+            '  account TEXT NOT NULL,'
+            '  job_id TEXT NOT NULL,'
+            '  watermark TEXT,'
+            '  synced_at REAL NOT NULL,'
+            '  generation INTEGER NOT NULL,'
+            '  account_generation INTEGER NOT NULL,'
+            '  PRIMARY KEY (account, job_id)'
+            ');'
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get_sync_state(self, account: str, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            'SELECT watermark, synced_at, generation, account_generation FROM sync_state '
+            'WHERE account = ? AND job_id = ?', (account, job_id)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'watermark': row[0], 'synced_at': row[1], 'generations': (row[2], row[3])}
+
+    def apply_delta(self, account: str, job_id: str, records: Iterable[Tuple[Application, Optional[str]]],
+                    watermark: Optional[str], synced_at: float, generations: Tuple[int, int] = (0, 0),
+                    replace: bool = False) -> int:
+        """
+        Upsert changed applications and advance the job's watermark in one
+        transaction. With replace, records are the job's complete list and
+        any other application on the job is dropped.
+        """
+        rows = [
+            (account, app.id, job_id, app.status.value, app.candidate_name, app.email, last_activity_at)
+            for app, last_activity_at in records
+        ]
+        conn = self._connection()
+        with conn:
+            if replace:
+                conn.execute('DELETE FROM applications WHERE account = ? AND job_id = ?', (account, job_id))
+            conn.executemany(
+                'INSERT OR REPLACE INTO applications '
+                '(account, id, job_id, status, candidate_name, email, last_activity_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            # Concurrent syncs may finish out of order; never move a watermark backwards.
+            conn.execute(
+                'INSERT INTO sync_state (account, job_id, watermark, synced_at, generation, account_generation) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(account, job_id) DO UPDATE SET '
+                '  watermark = CASE WHEN sync_state.watermark IS NULL OR excluded.watermark > sync_state.watermark '
+                '                   THEN excluded.watermark ELSE sync_state.watermark END,'
+                '  synced_at = MAX(sync_state.synced_at, excluded.synced_at),'
+                '  generation = MAX(sync_state.generation, excluded.generation),'
+                '  account_generation = MAX(sync_state.account_generation, excluded.account_generation)',
+                (account, job_id, watermark, synced_at) + tuple(generations)
+            )
+        return len(rows)
+
+    def upsert_application(self, account: str, job_id: str, application: Application,
+                           last_activity_at: Optional[str] = None) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO applications '
+                '(account, id, job_id, status, candidate_name, email, last_activity_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (account, application.id, job_id, application.status.value, application.candidate_name,
+                 application.email, last_activity_at)
+            )
+
+    def delete_application(self, account: str, application_id: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM applications WHERE account = ? AND id = ?', (account, application_id))
+
+    def prune(self, synced_before: float) -> int:
+        """
+        Drop the jobs last synced before synced_before, and every application
+        on a job that has no sync state. A dropped job is synced in full the next time it is read. Returns the
+        number of applications deleted.
+        """
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM sync_state WHERE synced_at < ?', (synced_before,))
+            deleted = conn.execute(
+                'DELETE FROM applications WHERE NOT EXISTS ('
+                '  SELECT 1 FROM sync_state'
+                '  WHERE sync_state.account = applications.account AND sync_state.job_id = applications.job_id'
+                ')'
+            ).rowcount
+        return deleted
+
+    def prune_if_due(self, retention: float) -> Optional[int]:
+        """Prune jobs not synced within retention seconds, at most once per PRUNE_INTERVAL per process."""
+        now = time.time()
+        with self._prune_lock:
+            if now - self._pruned_at < PRUNE_INTERVAL:
+                return None
+            self._pruned_at = now
+        deleted = self.prune(now - retention)
+        if deleted:
+            logger.info(f"Pruned {deleted} applications of jobs not synced in {retention:.0f}s")
+        return deleted
+
+    def list_applications(self, account: str, job_id: str, page: int = 1, per_page: int = 50,
+                          status: Optional[str] = None) -> Tuple[List[Application], int]:
+        where = 'account = ? AND job_id = ?'
+        params: List[Any] = [account, job_id]
+        if status:
+            where += ' AND status = ?'
+            params.append(status)
+
+        conn = self._connection()
+        total = conn.execute(f'SELECT COUNT(*) FROM applications WHERE {where}', params).fetchone()[0]
+        rows = conn.execute(
+            f'SELECT id, candidate_name, email, status FROM applications WHERE {where} '
+            # Numeric ids (Greenhouse) in numeric order; the id breaks ties for non-numeric ones (Lever)
+            'ORDER BY CAST(id AS INTEGER), id LIMIT ? OFFSET ?',
+            params + [per_page, (page - 1) * per_page]
+        ).fetchall()
+
+        applications = [
+            Application(id=row[0], candidate_name=row[1], email=row[2], status=ApplicationStatus(row[3]))
+            for row in rows
+        ]
+        return applications, total
+
+
+def job_generation_key(account: str, job_id: str) -> str:
+    """Bumped by webhooks that change an application on job_id: the job syncs its delta on the next read."""
+    return f"applications:{account}:{job_id}"
+
+
+def account_generation_key(account: str) -> str:
+    """
+    Bumped by webhooks that delete applications. A delta sync never returns
+    deleted applications, so every job of the account is synced in full on
+    its next read.
+    """
+    return f"applications:{account}"
+
+
+class ApplicationSyncEngine:
+    """
+    Keeps ApplicationStore in step with Greenhouse by asking only for
+    applications with activity after the job's watermark.
+
+    Webhooks may be received by another process, so they do not reach this
+    store directly. They bump the generations above instead, and a snapshot
+    synced at older generations is treated as stale.
+    """
+
+    def __init__(self, client: ATSClient, store: ApplicationStore, max_age: float = DEFAULT_SYNC_MAX_AGE,
+                 retention: float = DEFAULT_SYNC_RETENTION):
+        self.client = client
+        self.store = store
+        self.max_age = max_age
+        self.retention = retention
+        self.account = client.account
+
+    @staticmethod
+    def _next_watermark(current: Optional[str], seen: Optional[str]) -> Optional[str]:
+        if not seen:
+            return current
+        if current and current >= seen:
+            return current
+        return seen
+
+    @staticmethod
+    def _query_watermark(watermark: Optional[str]) -> Optional[str]:
+        """Step back a little so activity stamped in the same second as the watermark is not missed."""
+        if not watermark:
+            return None
+        try:
+            parsed = datetime.fromisoformat(watermark.replace('Z', '+00:00'))
+        except ValueError:
+            return watermark
+        return (parsed - WATERMARK_SKEW).astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+    def sync_job(self, job_id: str) -> int:
+        """Pull the delta for one job. Returns the number of applications upserted."""
+        return get_single_flight().do(f"application-sync:{self.account}:{job_id}", lambda: self._sync_job(job_id))
+
+    def _generations(self, job_id: str) -> Tuple[int, int]:
+        return (current_generation(job_generation_key(self.account, job_id)),
+                current_generation(account_generation_key(self.account)))
+
+    def _sync_job(self, job_id: str) -> int:
+        state = self.store.get_sync_state(self.account, job_id) or {}
+        # Read before fetching, so a webhook arriving mid-sync leaves the snapshot stale
+        generations = self._generations(job_id)
+        full = not state or state['generations'][1] != generations[1]
+        watermark = None if full else state.get('watermark')
+        started_at = time.time()
+
+        records = []
+        newest = None
+        for application, last_activity_at in self.client.iter_applications_updated_since(
+                job_id, self._query_watermark(watermark)):
+            records.append((application, last_activity_at))
+            newest = self._next_watermark(newest, last_activity_at)
+
+        count = self.store.apply_delta(self.account, job_id, records, self._next_watermark(watermark, newest),
+                                       started_at, generations, replace=full)
+        logger.info(f"Synced {count} {'' if full else 'changed '}applications for job {job_id} "
+                    f"(watermark {watermark} -> {newest or watermark})")
+        self.store.prune_if_due(self.retention)
+        return count
+
+    def list_applications(self, job_id: str, page: int = 1, per_page: int = 50,
+                          status: Optional[str] = None) -> Tuple[List[Application], int]:
+        """One page of the client's account's snapshot for job_id."""
+        return self.store.list_applications(self.account, job_id, page=page, per_page=per_page, status=status)
+
+    def ensure_fresh(self, job_id: str) -> Dict[str, Any]:
+        """
+        Sync job_id when its snapshot is older than max_age or a webhook has
+        changed it since, and return its sync state. If the sync fails but an
+        older snapshot exists, that snapshot is served (its age shows in the
+        freshness metadata).
+        """
+        state = self.store.get_sync_state(self.account, job_id)
+        if (state is None or time.time() - state['synced_at'] > self.max_age
+                or state['generations'] != self._generations(job_id)):
+            try:
+                self.sync_job(job_id)
+            except Exception as e:
+                if state is None:
+                    raise
+                logger.warning(f"Sync for job {job_id} failed, serving snapshot from {state['synced_at']}: {str(e)}")
+                return state
+            state = self.store.get_sync_state(self.account, job_id)
+        return state
+
+
+def freshness_from_state(state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not state:
+        return {'source': 'snapshot', 'synced_at': None, 'age_seconds': None}
+    synced_at = state['synced_at']
+    return {
+        'source': 'snapshot',
+        'synced_at': datetime.fromtimestamp(synced_at, timezone.utc).isoformat(),
+        'age_seconds': round(max(0.0, time.time() - synced_at), 3)
+    }
+
+
+def is_sync_enabled() -> bool:
+    return os.getenv('APPLICATIONS_SYNC_ENABLED', 'false').lower() == 'true'
+
+
+_store: Optional[ApplicationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_application_store() -> ApplicationStore:
+    """Process-wide snapshot store."""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ApplicationStore(os.getenv('APPLICATIONS_SYNC_DB', DEFAULT_SYNC_DB_PATH))
+
+    return _store
+
+
+def get_sync_engine(client: ATSClient) -> ApplicationSyncEngine:
+    return ApplicationSyncEngine(
+        client,
+        get_application_store(),
+        max_age=float(os.getenv('APPLICATIONS_SYNC_MAX_AGE', DEFAULT_SYNC_MAX_AGE)),
+        retention=float(os.getenv('APPLICATIONS_SYNC_RETENTION', DEFAULT_SYNC_RETENTION))
+    )
@@ -0,0 +1,92 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Any, Callable, Iterable, Tuple
+from src.models.schemas import Job, Candidate, Application
+from src.services.ats_client import ATSClient
+from src.services.greenhouse_client import GreenhouseClient
+from src.services.http_pool import DEFAULT_POOL_MAXSIZE
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncGreenhouseClient:
+    """
+    asyncio front end for GreenhouseClient, or any ATSClient passed as client.
+
+    Calls run on a bounded thread pool over the synchronous client, so they
+    share its keep-alive session, cache and error handling. A semaphore caps
+    the number of in-flight Harvest calls; by default it matches the HTTP pool
+    size so concurrent calls never open sockets the pool would throw away.
+    """
+
+    def __init__(self, api_key: str = None, base_url: str = None, max_concurrency: Optional[int] = None,
+                 client: Optional[ATSClient] = None):
+        self._client = client or GreenhouseClient(api_key=api_key, base_url=base_url)
+        self.max_concurrency = max_concurrency or int(
+            os.getenv('GREENHOUSE_ASYNC_CONCURRENCY', os.getenv('GREENHOUSE_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE))
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='greenhouse-async'
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def get_jobs(self, status: Optional[str] = None, page: int = 1, per_page: int = 100) -> List[Job]:
+        return await self._run(self._client.get_jobs, status=status, page=page, per_page=per_page)
+
+    async def create_candidate(self, candidate_data: Candidate) -> Dict[str, Any]:
+        return await self._run(self._client.create_candidate, candidate_data)
+
+    async def create_application(self, candidate_id: str, job_id: str) -> Dict[str, Any]:
+        return await self._run(self._client.create_application, candidate_id, job_id)
+
+    async def get_applications(self, job_id: Optional[str] = None, page: int = 1, per_page: int = 100) -> List[Application]:
+        return await self._run(self._client.get_applications, job_id=job_id, page=page, per_page=per_page)
+
+    async def create_candidate_with_application(self, candidate_data: Candidate) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Create a candidate and apply them to candidate_data.job_id."""
+        candidate_response = await self.create_candidate(candidate_data)
+        application_response = await self.create_application(
+            str(candidate_response.get('id')),
+            candidate_data.job_id
+        )
+        return candidate_response, application_response
+
+    async def create_candidates(self, candidates: Iterable[Candidate]) -> List[Any]:
+        """
+        Create and apply many candidates concurrently. Results keep the input
+        order; a failed record yields its exception instead of a tuple.
+        """
+        return await asyncio.gather(
+            *(self.create_candidate_with_application(candidate) for candidate in candidates),
+            return_exceptions=True
+        )
+
+    async def get_applications_for_jobs(self, job_ids: Iterable[str], per_page: int = 100) -> Dict[str, Any]:
+        """First page of applications for each job, keyed by job id."""
+        job_ids = list(job_ids)
+        results = await asyncio.gather(
+            *(self.get_applications(job_id=job_id, per_page=per_page) for job_id in job_ids),
+            return_exceptions=True
+        )
+        return dict(zip(job_ids, results))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> 'AsyncGreenhouseClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
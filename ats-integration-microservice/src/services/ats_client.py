@@ -0,0 +1,588 @@
+import abc
+import base64
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Callable, Iterator, Tuple, Union
+from urllib.parse import urlparse, parse_qs
+import requests
+from src.models.schemas import Job, Candidate, Application, JobStatus, ApplicationStatus
+from src.utils.exceptions import ATSAPIError, AuthenticationError, CircuitOpenError
+from src.utils.logger import get_logger
+from src.utils.timing import run_in_context, span
+from src.services.http_pool import get_session, get_timeouts, record_request
+from src.services.cache import ReadThroughCache, get_default_cache
+from src.services.circuit_breaker import CircuitBreaker, get_circuit_breaker, is_circuit_breaker_enabled
+from src.services.generations import current_generation
+from src.services.single_flight import get_single_flight
+from src.services.rate_limiter import (
+    RETRYABLE_STATUS_CODES, backoff_delay, get_max_retries, get_rate_limiter,
+    parse_retry_after, record_retries_exhausted, record_retry
+)
+
+logger = get_logger(__name__)
+
+DEFAULT_PAGE_CONCURRENCY = 4
+# Part of every job page cache key. Bump it whenever the cached value changes
+# shape, so pages an older release left in a shared SQLite file are not read.
+JOB_CACHE_VERSION = 2
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+
+# A path into a raw item: dict keys and list indexes, e.g. ('offices', 0, 'name').
+# A list of paths joins the non-empty values with a space.
+FieldPath = Tuple[Union[str, int], ...]
+FieldSpec = Union[FieldPath, List[FieldPath]]
+
+
+def dig(data: Any, path: FieldPath) -> Any:
+    """Follow path into nested dicts/lists. None if any step is missing."""
+    for step in path:
+        if isinstance(step, int):
+            if not isinstance(data, list) or len(data) <= step:
+                return None
+        elif not isinstance(data, dict):
+            return None
+        data = data[step] if isinstance(step, int) else data.get(step)
+        if data is None:
+            return None
+    return data
+
+
+def _credentials_key(base_url: str, api_key: str) -> str:
+    return hashlib.sha256(f"{base_url}\0{api_key}".encode()).hexdigest()
+
+
+def _extract(data: Dict[str, Any], spec: FieldSpec) -> Any:
+    if isinstance(spec, list):
+        return ' '.join(str(part) for part in (dig(data, path) for path in spec) if part)
+    return dig(data, spec)
+
+
+class ATSClient(abc.ABC):
+    """
+    Shared core for ATS adapters: the pooled session, rate limiting, retries
+    with backoff, the circuit breaker, single-flight page requests, the job
+    page cache and Link-header pagination with concurrent page fan-out.
+
+    An adapter subclasses this and declares its API as tables - endpoints,
+    where each Job/Application field lives in a raw item, and how the ATS's
+    statuses map onto ours. It only overrides a method where the wire format
+    itself differs (request payloads, a paginated envelope).
+    """
+
+    name = 'ats'
+    display_name = 'ATS'
+    api_key_env = ''
+    base_url_env = ''
+    default_base_url = ''
+    api_prefix = 'v1'
+    # Prepended to job page cache keys so adapters sharing a cache do not collide.
+    # Keys are also scoped to the account, see job_cache_prefix().
+    cache_namespace = ''
+
+    endpoints: Dict[str, str] = {
+        'jobs': 'jobs',
+        'applications': 'applications',
+        'job_applications': 'jobs/{job_id}/applications',
+        'candidates': 'candidates',
+        'create_application': 'applications'
+    }
+    per_page_param = 'per_page'
+    status_param = 'status'
+    updated_after_param = 'last_activity_after'
+    # Our OPEN/CLOSED/DRAFT filter -> the ATS's value. None passes it through.
+    job_status_filters: Optional[Dict[str, str]] = None
+
+    job_fields: Dict[str, FieldSpec] = {}
+    job_defaults: Dict[str, Any] = {}
+    job_status_path: FieldPath = ('status',)
+    job_statuses: Dict[str, JobStatus] = {}
+    default_job_status = JobStatus.OPEN
+
+    application_fields: Dict[str, FieldSpec] = {}
+    application_defaults: Dict[str, Any] = {}
+    application_status_path: FieldPath = ('status',)
+    # (substring, status) pairs; the first one found in the upper-cased ATS status wins.
+    application_statuses: Tuple[Tuple[str, ApplicationStatus], ...] = ()
+    default_application_status = ApplicationStatus.APPLIED
+    activity_path: FieldPath = ('last_activity_at',)
+
+    def __init__(self, api_key: str = None, base_url: str = None, cache: Optional[ReadThroughCache] = None):
+        self.api_key = api_key or os.getenv(self.api_key_env)
+        self.base_url = base_url or os.getenv(self.base_url_env, self.default_base_url)
+
+        if not self.api_key:
+            raise AuthenticationError(f"{self.display_name} API key is required")
+
+        self.headers = dict(self._auth_headers(), **{
+            'Content-Type': 'application/json',
+            'User-Agent': 'ATS-Integration-Service/1.0'
+        })
+        self.session = get_session()
+        self.timeout = get_timeouts()
+        self.cache = cache if cache is not None else get_default_cache()
+        self.page_concurrency = int(os.getenv('GREENHOUSE_PAGE_CONCURRENCY', DEFAULT_PAGE_CONCURRENCY))
+        self.credentials_key = _credentials_key(self.base_url, self.api_key)
+        self.account = self.account_key(self.base_url, self.api_key)
+        self._job_cache_prefix = self.job_cache_prefix(self.base_url, self.api_key)
+        self.rate_limiter = get_rate_limiter(self.credentials_key)
+        self.single_flight = get_single_flight()
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        if is_circuit_breaker_enabled():
+            self.circuit_breaker = get_circuit_breaker(self.base_url, urlparse(self.base_url).netloc)
+
+    @classmethod
+    def account_key(cls, base_url: Optional[str] = None, api_key: Optional[str] = None) -> str:
+        """
+        Short hash naming one ATS account, by default the one configured in
+        the environment. Cached pages and the application snapshot outlive
+        client rebuilds, so they are scoped by it.
+        """
+        base_url = base_url or os.getenv(cls.base_url_env, cls.default_base_url)
+        api_key = api_key or os.getenv(cls.api_key_env) or ''
+        return _credentials_key(base_url, api_key)[:16]
+
+    @classmethod
+    def job_cache_prefix(cls, base_url: Optional[str] = None, api_key: Optional[str] = None) -> str:
+        """
+        Prefix of the job page cache keys for one account, so a changed API
+        key or base URL is not served the old account's jobs.
+        """
+        return f"{cls.cache_namespace}v{JOB_CACHE_VERSION}:{cls.account_key(base_url, api_key)}:jobs:"
+
+    def _auth_headers(self) -> Dict[str, str]:
+        encoded_credentials = base64.b64encode(f"{self.api_key}:".encode()).decode()
+        return {'Authorization': f'Basic {encoded_credentials}'}
+
+    # Transport
+
+    def _record_upstream_result(self, healthy: bool) -> None:
+        if self.circuit_breaker is None:
+            return
+        if healthy:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        url = f"{self.base_url}/{self.api_prefix}/{endpoint.lstrip('/')}"
+        kwargs.setdefault('timeout', self.timeout)
+        max_retries = get_max_retries()
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+
+        while True:
+            # Checked per attempt, so retries stop as soon as the circuit opens.
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_call()
+
+            with span('rate_limit_wait'):
+                self.rate_limiter.acquire()
+
+            try:
+                logger.info(f"Making {method} request to {url}")
+                with span('upstream'):
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        headers=self.headers,
+                        **kwargs
+                    )
+                record_request()
+            except requests.exceptions.RequestException as e:
+                self._record_upstream_result(False)
+                if idempotent and attempt < max_retries:
+                    delay = backoff_delay(attempt)
+                    logger.warning(f"Request failed: {str(e)}, retrying in {delay:.2f}s")
+                    record_retry(delay)
+                    with span('retry_backoff'):
+                        time.sleep(delay)
+                    attempt += 1
+                    continue
+
+                logger.error(f"Request failed: {str(e)}")
+                raise ATSAPIError(f"Request to {self.display_name} API failed: {str(e)}")
+
+            self.rate_limiter.update_from_headers(response.headers, response.status_code)
+            self._record_upstream_result(response.status_code < 500)
+
+            if response.status_code == 401:
+                raise AuthenticationError("Invalid API key or authentication failed")
+
+            # 429 means the ATS did not process the call, so it is safe to
+            # repeat for any method. 5xx is only retried for idempotent methods.
+            retryable = response.status_code == 429 or (
+                idempotent and response.status_code in RETRYABLE_STATUS_CODES
+            )
+            if retryable and attempt < max_retries:
+                delay = backoff_delay(attempt, parse_retry_after(response.headers))
+                logger.warning(f"{self.display_name} returned {response.status_code}, retrying in {delay:.2f}s")
+                record_retry(delay)
+                with span('retry_backoff'):
+                    time.sleep(delay)
+                attempt += 1
+                continue
+
+            if retryable:
+                record_retries_exhausted()
+
+            if response.status_code >= 400:
+                error_msg = f"API request failed: {response.status_code} {response.text}"
+                logger.error(error_msg)
+                raise ATSAPIError(error_msg, response.status_code)
+
+            return response
+
+    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        response = self._send(method, endpoint, **kwargs)
+
+        if response.status_code == 204:
+            return {}
+
+        return response.json()
+
+    # Pagination
+
+    def _read_page(self, response: requests.Response, params: Dict[str, Any]) -> Dict[str, Any]:
+        """A list response as {'data': [...], 'links': {rel: url}}, read from the Link header."""
+        return {
+            'data': response.json(),
+            'links': {rel: link.get('url') for rel, link in response.links.items()}
+        }
+
+    def _request_page(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch one list page as {'data': [...], 'links': {rel: url}}, so the
+        pagination links survive caching. Identical concurrent requests share
+        one upstream call.
+        """
+        query = '&'.join(f"{name}={params[name]}" for name in sorted(params))
+        flight_key = f"{self.credentials_key}:GET /{endpoint.lstrip('/')}?{query}"
+
+        def fetch() -> Dict[str, Any]:
+            response = self._send('GET', endpoint, params=params)
+            return self._read_page(response, params)
+
+        return self.single_flight.do(flight_key, fetch)
+
+    def _page_params(self, page: int, per_page: int) -> Dict[str, Any]:
+        return {
+            'page': page,
+            self.per_page_param: per_page
+        }
+
+    @staticmethod
+    def _page_from_link(url: Optional[str]) -> Optional[int]:
+        if not url:
+            return None
+        values = parse_qs(urlparse(url).query).get('page')
+        if not values:
+            return None
+        try:
+            return int(values[0])
+        except ValueError:
+            return None
+
+    def _total_from_page(self, raw_page: Dict[str, Any], page: int, per_page: int,
+                         fetch_page: Callable[[int], Dict[str, Any]], include_total: bool = True) -> Optional[int]:
+        """
+        Work out the real collection size. It is free when the ATS reports it
+        or the requested page is the last one. Otherwise it takes a fetch of
+        the last page named by the 'last' link, cached like any other page, which
+        callers can skip with include_total=False to get None instead.
+        """
+        if raw_page.get('total') is not None:
+            return raw_page['total']
+
+        links = raw_page.get('links') or {}
+        last_page = self._page_from_link(links.get('last'))
+
+        if last_page is None or last_page <= page:
+            if not links.get('next'):
+                return (page - 1) * per_page + len(raw_page['data'])
+            if not include_total:
+                return None
+            logger.warning("Pagination links have no usable 'last' relation, total is a lower bound")
+            return (page - 1) * per_page + len(raw_page['data'])
+
+        if not include_total:
+            return None
+
+        last_raw = fetch_page(last_page)
+        return (last_page - 1) * per_page + len(last_raw['data'])
+
+    def _iter_pages(self, fetch_page: Callable[[int], Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the raw items of every page. The first page is fetched on its own
+        to read the pagination links; when they name the last page the rest are
+        fetched concurrently and yielded in completion order, otherwise 'next'
+        links are followed one by one.
+        """
+        first = fetch_page(1)
+        yield first['data']
+
+        links = first.get('links') or {}
+        last_page = self._page_from_link(links.get('last'))
+
+        if last_page is None:
+            page = 1
+            while links.get('next') and first['data']:
+                page = self._page_from_link(links['next']) or page + 1
+                first = fetch_page(page)
+                links = first.get('links') or {}
+                yield first['data']
+            return
+
+        if last_page < 2:
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.page_concurrency, last_page - 1)),
+            thread_name_prefix=f'{self.name}-page'
+        )
+        try:
+            futures = [executor.submit(run_in_context(fetch_page, page)) for page in range(2, last_page + 1)]
+            for future in as_completed(futures):
+                yield future.result()['data']
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # Table-driven parsing
+
+    @classmethod
+    def _fields(cls, data: Dict[str, Any], specs: Dict[str, FieldSpec], defaults: Dict[str, Any]) -> Dict[str, str]:
+        values = {}
+        for field, spec in specs.items():
+            value = _extract(data, spec)
+            if value is None:
+                if field not in defaults:
+                    # Fields without a default are required; the item is malformed.
+                    raise KeyError(field)
+                value = defaults[field]
+            values[field] = str(value)
+        return values
+
+    @classmethod
+    def _parse_job(cls, job_data: Dict[str, Any]) -> Job:
+        status = str(dig(job_data, cls.job_status_path) or '').upper()
+        return Job(
+            status=cls.job_statuses.get(status, cls.default_job_status),
+            **cls._fields(job_data, cls.job_fields, cls.job_defaults)
+        )
+
+    @classmethod
+    def _parse_application(cls, app_data: Dict[str, Any]) -> Application:
+        status = str(dig(app_data, cls.application_status_path) or '').upper()
+        mapped_status = next(
+            (mapped for marker, mapped in cls.application_statuses if marker in status),
+            cls.default_application_status
+        )
+        return Application(
+            status=mapped_status,
+            **cls._fields(app_data, cls.application_fields, cls.application_defaults)
+        )
+
+    def _parse_activity(self, app_data: Dict[str, Any]) -> Optional[str]:
+        """The item's last activity as an ISO 8601 string, for the sync watermark."""
+        return dig(app_data, self.activity_path)
+
+    # Jobs
+
+    def _get_jobs_raw_page(self, status: Optional[str], page: int, per_page: int) -> Dict[str, Any]:
+        params = self._page_params(page, per_page)
+
+        if status:
+            filters = self.job_status_filters
+            params[self.status_param] = filters.get(status, status) if filters is not None else status
+
+        if self.cache is None:
+            return self._request_page(self.endpoints['jobs'], params)
+
+        # Webhooks bump the generation to invalidate every job page of the account, in every process.
+        generation = current_generation(self._job_cache_prefix)
+        cache_key = f"{self._job_cache_prefix}g{generation}:{status}:{page}:{per_page}"
+        try:
+            return self.cache.get_or_load(cache_key, lambda: self._request_page(self.endpoints['jobs'], params))
+        except CircuitOpenError:
+            # The ATS is being skipped; an expired page beats a 503.
+            last_known_good = self.cache.peek(cache_key)
+            if last_known_good is None:
+                raise
+            logger.warning(f"Circuit open, serving last known good {cache_key}")
+            self.circuit_breaker.record_fallback()
+            return last_known_good
+
+    def get_jobs(self, status: Optional[str] = None, page: int = 1, per_page: int = 100) -> List[Job]:
+        try:
+            raw_page = self._get_jobs_raw_page(status, page, per_page)
+            jobs = [self._parse_job(job_data) for job_data in raw_page['data']]
+
+            logger.info(f"Retrieved {len(jobs)} jobs")
+            return jobs
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching jobs: {str(e)}")
+            raise ATSAPIError(f"Failed to fetch jobs: {str(e)}")
+
+    def get_jobs_page(self, status: Optional[str] = None, page: int = 1, per_page: int = 100,
+                      include_total: bool = True) -> Tuple[List[Job], Optional[int]]:
+        """Return one page of jobs together with the total number of jobs (None if include_total is off and it would cost another call)."""
+        try:
+            raw_page = self._get_jobs_raw_page(status, page, per_page)
+            jobs = [self._parse_job(job_data) for job_data in raw_page['data']]
+            total = self._total_from_page(
+                raw_page, page, per_page,
+                lambda p: self._get_jobs_raw_page(status, p, per_page),
+                include_total
+            )
+
+            logger.info(f"Retrieved {len(jobs)} of {total} jobs")
+            return jobs, total
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching jobs: {str(e)}")
+            raise ATSAPIError(f"Failed to fetch jobs: {str(e)}")
+
+    def iter_all_jobs(self, status: Optional[str] = None, per_page: int = 100) -> Iterator[Job]:
+        """Stream every job across all pages, fetching pages concurrently."""
+        try:
+            for items in self._iter_pages(lambda p: self._get_jobs_raw_page(status, p, per_page)):
+                for job_data in items:
+                    yield self._parse_job(job_data)
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error iterating jobs: {str(e)}")
+            raise ATSAPIError(f"Failed to fetch jobs: {str(e)}")
+
+    # Candidates and applications
+
+    @abc.abstractmethod
+    def _candidate_payload(self, candidate_data: Candidate) -> Dict[str, Any]:
+        """The ATS's create-candidate request body."""
+
+    @abc.abstractmethod
+    def _application_payload(self, candidate_id: str, job_id: str) -> Dict[str, Any]:
+        """The ATS's create-application request body."""
+
+    def create_candidate(self, candidate_data: Candidate) -> Dict[str, Any]:
+        payload = self._candidate_payload(candidate_data)
+
+        try:
+            response = self._make_request('POST', self.endpoints['candidates'], json=payload)
+            logger.info(f"Created candidate with ID: {response.get('id')}")
+            return response
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error creating candidate: {str(e)}")
+            raise ATSAPIError(f"Failed to create candidate: {str(e)}")
+
+    def create_application(self, candidate_id: str, job_id: str) -> Dict[str, Any]:
+        try:
+            endpoint = self.endpoints['create_application'].format(candidate_id=candidate_id, job_id=job_id)
+            payload = self._application_payload(candidate_id, job_id)
+            response = self._make_request('POST', endpoint, json=payload)
+            logger.info(f"Created application for candidate {candidate_id} and job {job_id}")
+            return response
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error creating application: {str(e)}")
+            raise ATSAPIError(f"Failed to create application: {str(e)}")
+
+    def _applications_target(self, job_id: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        """Endpoint and extra query parameters for listing applications, optionally for one job."""
+        if job_id:
+            return self.endpoints['job_applications'].format(job_id=job_id), {}
+        return self.endpoints['applications'], {}
+
+    def _updated_after_value(self, updated_after: str) -> Any:
+        return updated_after
+
+    def _get_applications_raw_page(self, job_id: Optional[str], page: int, per_page: int,
+                                   updated_after: Optional[str] = None) -> Dict[str, Any]:
+        endpoint, params = self._applications_target(job_id)
+        params.update(self._page_params(page, per_page))
+
+        if updated_after:
+            params[self.updated_after_param] = self._updated_after_value(updated_after)
+
+        return self._request_page(endpoint, params)
+
+    def get_applications(self, job_id: Optional[str] = None, page: int = 1, per_page: int = 100) -> List[Application]:
+        try:
+            raw_page = self._get_applications_raw_page(job_id, page, per_page)
+            applications = [self._parse_application(app_data) for app_data in raw_page['data']]
+
+            logger.info(f"Retrieved {len(applications)} applications")
+            return applications
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching applications: {str(e)}")
+            raise ATSAPIError(f"Failed to fetch applications: {str(e)}")
+
+    def get_applications_page(self, job_id: Optional[str] = None, page: int = 1, per_page: int = 100,
+                              include_total: bool = True) -> Tuple[List[Application], Optional[int]]:
+        """
+        Return one page of applications together with the total number of
+        applications (None if include_total is off and it would cost another call).
+        """
+        try:
+            raw_page = self._get_applications_raw_page(job_id, page, per_page)
+            applications = [self._parse_application(app_data) for app_data in raw_page['data']]
+            total = self._total_from_page(
+                raw_page, page, per_page,
+                lambda p: self._get_applications_raw_page(job_id, p, per_page),
+                include_total
+            )
+
+            logger.info(f"Retrieved {len(applications)} of {total} applications")
+            return applications, total
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching applications: {str(e)}")
+            raise ATSAPIError(f"Failed to fetch applications: {str(e)}")
+
+    def iter_all_applications(self, job_id: Optional[str] = None, per_page: int = 100) -> Iterator[Application]:
+        """Stream every application across all pages, fetching pages concurrently."""
+        try:
+            for items in self._iter_pages(lambda p: self._get_applications_raw_page(job_id, p, per_page)):
+                for app_data in items:
+                    yield self._parse_application(app_data)
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error iterating applications: {str(e)}")
+            raise ATSAPIError(f"Failed to fetch applications: {str(e)}")
+
+    def iter_applications_updated_since(self, job_id: str, updated_after: Optional[str] = None,
+                                        per_page: int = 100) -> Iterator[Tuple[Application, Optional[str]]]:
+        """
+        Stream (application, last_activity_at) for applications on job_id with
+        activity after updated_after (ISO 8601), or every application when None.
+        """
+        try:
+            fetch_page = lambda p: self._get_applications_raw_page(job_id, p, per_page, updated_after)
+            for items in self._iter_pages(fetch_page):
+                for app_data in items:
+                    yield self._parse_application(app_data), self._parse_activity(app_data)
+
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching updated applications: {str(e)}")
+            raise ATSAPIError(f"Failed to fetch applications: {str(e)}")
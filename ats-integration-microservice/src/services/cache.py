@@ -0,0 +1,278 @@
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable
+from src.utils.logger import get_logger
+from src.services.single_flight import get_single_flight
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 60.0
+DEFAULT_STALE_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_SQLITE_PATH = '/tmp/ats-cache.sqlite3'
+
+
+class CacheBackend(abc.ABC):
+    """Storage for cached values. Entries are returned with the time they were stored."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """The value stored under key and when it was stored, or None."""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        """Store value under key, stamped with stored_at (default now)."""
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Forget key."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Forget every key."""
+
+
+class MemoryLRUCache(CacheBackend):
+    """Per-process LRU cache. Expired entries are kept until evicted so they can be served stale."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[Any, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (value, stored_at if stored_at is not None else time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    File-backed cache shared by every worker on the same host (or the same
+    Lambda /tmp). Values must be JSON serialisable.
+    """
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at)')
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        row = self._connection().execute(
+            'SELECT value, stored_at FROM cache WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)',
+            (key, json.dumps(value, default=str), stored_at if stored_at is not None else time.time())
+        )
+        conn.execute(
+            'DELETE FROM cache WHERE key IN ('
+            'SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+        conn.commit()
+
+    def delete(self, key: str) -> None:
+        conn = self._connection()
+        conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+        conn.commit()
+
+    def clear(self) -> None:
+        conn = self._connection()
+        conn.execute('DELETE FROM cache')
+        conn.commit()
+
+
+class ReadThroughCache:
+    """
+    Read-through cache with TTL and stale-while-revalidate.
+
+    Entries younger than ttl are served directly. Entries younger than
+    ttl + stale_ttl are served immediately while a background thread reloads
+    them. Anything older is loaded synchronously.
+
+    Under Lambda a background thread would be frozen with the container as
+    soon as the response is returned, so stale entries are reloaded before
+    returning instead, one load per key, and only served if the load fails.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float = DEFAULT_TTL, stale_ttl: float = DEFAULT_STALE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_errors': 0
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        entry = self.backend.get(key)
+
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+
+            if age < self.ttl:
+                self._count('hits')
+                return value
+
+            if age < self.ttl + self.stale_ttl:
+                self._count('stale_hits')
+                if os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+                    return self._refresh_now(key, loader, value)
+                self._refresh_in_background(key, loader)
+                return value
+
+        self._count('misses')
+        value = loader()
+        self.backend.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        thread = threading.Thread(target=self._refresh, args=(key, loader), daemon=True)
+        thread.start()
+
+    def _refresh_now(self, key: str, loader: Callable[[], Any], stale_value: Any) -> Any:
+        """Reload a stale entry before returning it; concurrent requests for key share one load."""
+        def refresh() -> Any:
+            value = loader()
+            self.backend.set(key, value)
+            return value
+
+        try:
+            value = get_single_flight().do(f'cache-refresh:{key}', refresh)
+            self._count('refreshes')
+            return value
+        except Exception as e:
+            logger.warning(f"Refresh of {key} failed, serving the stale entry: {str(e)}")
+            self._count('refresh_errors')
+            return stale_value
+
+    def _refresh(self, key: str, loader: Callable[[], Any]) -> None:
+        try:
+            self.backend.set(key, loader())
+            self._count('refreshes')
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {str(e)}")
+            self._count('refresh_errors')
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def peek(self, key: str) -> Optional[Any]:
+        """The stored value regardless of age, without loading or counting a lookup."""
+        entry = self.backend.get(key)
+        return entry[0] if entry is not None else None
+
+    def invalidate(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['hits'] + stats['stale_hits']) / lookups if lookups else 0.0
+        return stats
+
+
+def create_cache_from_env() -> Optional[ReadThroughCache]:
+    """
+    Build the cache described by GREENHOUSE_CACHE_BACKEND (memory, sqlite or none).
+    """
+    backend_name = os.getenv('GREENHOUSE_CACHE_BACKEND', 'memory').lower()
+    ttl = float(os.getenv('GREENHOUSE_CACHE_TTL', DEFAULT_TTL))
+    stale_ttl = float(os.getenv('GREENHOUSE_CACHE_STALE_TTL', DEFAULT_STALE_TTL))
+    max_entries = int(os.getenv('GREENHOUSE_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+
+    if backend_name == 'none':
+        return None
+
+    if backend_name == 'sqlite':
+        backend = SQLiteCache(os.getenv('GREENHOUSE_CACHE_PATH', DEFAULT_SQLITE_PATH), max_entries)
+    elif backend_name == 'memory':
+        backend = MemoryLRUCache(max_entries)
+    else:
+        logger.warning(f"Unknown cache backend '{backend_name}', falling back to memory")
+        backend = MemoryLRUCache(max_entries)
+
+    logger.info(f"Using {type(backend).__name__} for Greenhouse responses - ttl: {ttl}s, stale_ttl: {stale_ttl}s")
+    return ReadThroughCache(backend, ttl=ttl, stale_ttl=stale_ttl)
+
+
+_default_cache: Optional[ReadThroughCache] = None
+_default_cache_loaded = False
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ReadThroughCache]:
+    """Process-wide cache shared by every client so it survives client rebuilds."""
+    global _default_cache, _default_cache_loaded
+
+    if not _default_cache_loaded:
+        with _default_lock:
+            if not _default_cache_loaded:
+                _default_cache = create_cache_from_env()
+                _default_cache_loaded = True
+
+    return _default_cache
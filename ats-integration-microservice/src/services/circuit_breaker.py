@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+from src.utils.exceptions import CircuitOpenError
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 30.0
+DEFAULT_HALF_OPEN_MAX_CALLS = 1
+DEFAULT_SUCCESS_THRESHOLD = 2
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_TRANSITION_STATS = {CLOSED: 'closed', OPEN: 'opened', HALF_OPEN: 'half_opened'}
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream that keeps failing.
+
+    Closed: calls pass; failure_threshold consecutive failures open the
+    circuit. Open: calls are rejected with CircuitOpenError until
+    recovery_timeout has passed. Half-open: up to half_open_max_calls probes
+    run at a time; success_threshold successes close the circuit, and any
+    failure opens it again for another recovery_timeout.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+                 half_open_max_calls: int = DEFAULT_HALF_OPEN_MAX_CALLS,
+                 success_threshold: int = DEFAULT_SUCCESS_THRESHOLD):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.state = CLOSED
+        self.failures = 0
+        self.successes = 0
+        self.probes = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {
+            'calls': 0,
+            'rejected': 0,
+            'failures': 0,
+            'fallbacks': 0,
+            'opened': 0,
+            'half_opened': 0,
+            'closed': 0
+        }
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        self._stats[_TRANSITION_STATS[state]] += 1
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        self.failures = 0
+        self.successes = 0
+        self.probes = 0
+        _log_transition(self.name, previous, state)
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call must not reach the upstream."""
+        with self._lock:
+            self._stats['calls'] += 1
+
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    self._stats['rejected'] += 1
+                    raise CircuitOpenError(f"Circuit for {self.name} is open")
+                self._transition(HALF_OPEN)
+
+            if self.state == HALF_OPEN:
+                if self.probes >= self.half_open_max_calls:
+                    self._stats['rejected'] += 1
+                    raise CircuitOpenError(f"Circuit for {self.name} is half-open and already probing")
+                self.probes += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.probes = max(0, self.probes - 1)
+                self.successes += 1
+                if self.successes >= self.success_threshold:
+                    self._transition(CLOSED)
+            else:
+                self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._stats['failures'] += 1
+            if self.state == HALF_OPEN:
+                self._transition(OPEN)
+            elif self.state == CLOSED:
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    self._transition(OPEN)
+
+    def record_fallback(self) -> None:
+        with self._lock:
+            self._stats['fallbacks'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, state=self.state, consecutive_failures=self.failures)
+
+
+def _log_transition(name: str, previous: str, state: str) -> None:
+    """One EMF line per transition, so state changes become CloudWatch metrics."""
+    log = logger.warning if state == OPEN else logger.info
+    log(
+        f"Circuit for {name} moved from {previous} to {state}",
+        extra={
+            'never_sample': True,
+            'extra_fields': {
+                '_aws': {
+                    'Timestamp': int(time.time() * 1000),
+                    'CloudWatchMetrics': [{
+                        'Namespace': os.getenv('METRICS_NAMESPACE', 'ATSIntegration'),
+                        'Dimensions': [['State']],
+                        'Metrics': [{'Name': 'CircuitTransition', 'Unit': 'Count'}]
+                    }]
+                },
+                'State': state,
+                'PreviousState': previous,
+                'CircuitTransition': 1
+            }
+        }
+    )
+
+
+def is_circuit_breaker_enabled() -> bool:
+    return os.getenv('GREENHOUSE_CIRCUIT_ENABLED', 'true').lower() == 'true'
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(key: str, name: Optional[str] = None) -> CircuitBreaker:
+    """One breaker per upstream, shared by every client in the process."""
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name or key,
+                    failure_threshold=int(os.getenv('GREENHOUSE_CIRCUIT_FAILURE_THRESHOLD', DEFAULT_FAILURE_THRESHOLD)),
+                    recovery_timeout=float(os.getenv('GREENHOUSE_CIRCUIT_RECOVERY_TIMEOUT', DEFAULT_RECOVERY_TIMEOUT)),
+                    half_open_max_calls=int(os.getenv('GREENHOUSE_CIRCUIT_HALF_OPEN_MAX_CALLS', DEFAULT_HALF_OPEN_MAX_CALLS)),
+                    success_threshold=int(os.getenv('GREENHOUSE_CIRCUIT_SUCCESS_THRESHOLD', DEFAULT_SUCCESS_THRESHOLD))
+                )
+                _breakers[key] = breaker
+    return breaker
+
+
+def get_circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.get_stats() for breaker in breakers}
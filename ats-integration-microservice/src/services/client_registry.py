@@ -0,0 +1,97 @@
+import hashlib
+import importlib
+import os
+import threading
+from typing import Dict, Any, Optional, Tuple, Type
+from src.services.ats_client import ATSClient
+from src.utils.exceptions import ConfigurationError
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PROVIDER = 'greenhouse'
+
+# Provider name -> "module:Class". Adapters are imported only when selected.
+_adapters: Dict[str, str] = {
+    'greenhouse': 'src.services.greenhouse_client:GreenhouseClient',
+    'lever': 'src.services.lever_client:LeverClient'
+}
+
+_client: Optional[ATSClient] = None
+_fingerprint: Optional[str] = None
+_lock = threading.Lock()
+_stats = {
+    'cold_starts': 0,
+    'warm_hits': 0,
+    'rotations': 0
+}
+
+
+def register_adapter(name: str, target: str) -> None:
+    """Make an ATSClient subclass, given as "module:Class", selectable through ATS_PROVIDER."""
+    _adapters[name] = target
+
+
+def get_provider() -> str:
+    return os.getenv('ATS_PROVIDER', DEFAULT_PROVIDER).lower()
+
+
+def get_adapter_class(provider: Optional[str] = None) -> Type[ATSClient]:
+    provider = provider or get_provider()
+    target = _adapters.get(provider)
+    if target is None:
+        raise ConfigurationError(f"Unknown ATS_PROVIDER '{provider}'. Available: {', '.join(sorted(_adapters))}")
+
+    module_name, _, class_name = target.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _credentials_fingerprint(adapter: Type[ATSClient]) -> str:
+    api_key = os.getenv(adapter.api_key_env) or ''
+    base_url = os.getenv(adapter.base_url_env, adapter.default_base_url)
+    return hashlib.sha256(f"{adapter.name}\0{api_key}\0{base_url}".encode()).hexdigest()
+
+
+def get_client() -> Tuple[ATSClient, bool]:
+    """
+    Return the process-wide client for ATS_PROVIDER and whether it was warm.
+
+    The client is built lazily on first use and kept for later invocations of
+    the same Lambda container. It is rebuilt when the provider or its API key
+    or base URL change. Raises AuthenticationError like the client
+    constructor when no API key is configured.
+    """
+    global _client, _fingerprint
+
+    adapter = get_adapter_class()
+    fingerprint = _credentials_fingerprint(adapter)
+
+    with _lock:
+        if _client is not None and _fingerprint == fingerprint:
+            _stats['warm_hits'] += 1
+            return _client, True
+
+        if _client is not None:
+            logger.info(f"{adapter.display_name} credentials changed, rebuilding client")
+            _stats['rotations'] += 1
+
+        _client = adapter()
+        _fingerprint = fingerprint
+        _stats['cold_starts'] += 1
+        return _client, False
+
+
+def reset_client() -> None:
+    global _client, _fingerprint
+    with _lock:
+        _client = None
+        _fingerprint = None
+
+
+def get_registry_stats() -> Dict[str, Any]:
+    with _lock:
+        return dict(
+            _stats,
+            client_initialised=_client is not None,
+            provider=_client.name if _client is not None else None
+        )
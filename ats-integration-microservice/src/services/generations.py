@@ -0,0 +1,193 @@
+import abc
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SQLITE_PATH = '/tmp/ats-generations.sqlite3'
+DEFAULT_DYNAMODB_TABLE = 'ats-cache-generations'
+DEFAULT_CHECK_INTERVAL = 1.0
+
+
+class GenerationStore(abc.ABC):
+    """
+    Counters that say when cached data was invalidated.
+
+    Webhooks are received by one process, while the job cache and the
+    application snapshot live in every reading process. Instead of touching
+    data only its own process can see, a webhook bumps a counter here; readers
+    fold the counter into their cache keys or compare it with the one they
+    synced at, so they notice the change no matter which process took it.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> int:
+        """The current value of key, 0 if it was never bumped."""
+
+    @abc.abstractmethod
+    def bump(self, key: str) -> int:
+        """Increment key and return its new value."""
+
+
+class InMemoryGenerationStore(GenerationStore):
+    """Counters visible to this process only, for single-process deployments and tests."""
+
+    def __init__(self):
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def bump(self, key: str) -> int:
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            return self._generations[key]
+
+
+class SQLiteGenerationStore(GenerationStore):
+    """Counters shared by every worker that can see the same SQLite file."""
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS generations (key TEXT PRIMARY KEY, generation INTEGER NOT NULL)'
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> int:
+        row = self._connection().execute('SELECT generation FROM generations WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, key: str) -> int:
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT INTO generations (key, generation) VALUES (?, 1) '
+                'ON CONFLICT(key) DO UPDATE SET generation = generation + 1',
+                (key,)
+            )
+            generation = conn.execute('SELECT generation FROM generations WHERE key = ?', (key,)).fetchone()[0]
+            conn.execute('COMMIT')
+            return generation
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+class DynamoDBGenerationStore(GenerationStore):
+    """
+    Counters in a DynamoDB table with string hash key 'generation_key'.
+    endpoint_url points it at DynamoDB Local for development.
+    """
+
+    def __init__(self, table_name: str = DEFAULT_DYNAMODB_TABLE, endpoint_url: Optional[str] = None):
+        import boto3
+
+        self.table = boto3.resource('dynamodb', endpoint_url=endpoint_url).Table(table_name)
+
+    def get(self, key: str) -> int:
+        response = self.table.get_item(Key={'generation_key': key}, ConsistentRead=True)
+        return int(response.get('Item', {}).get('generation', 0))
+
+    def bump(self, key: str) -> int:
+        response = self.table.update_item(
+            Key={'generation_key': key},
+            UpdateExpression='ADD generation :one',
+            ExpressionAttributeValues={':one': 1},
+            ReturnValues='UPDATED_NEW'
+        )
+        return int(response['Attributes']['generation'])
+
+
+def create_generation_store_from_env() -> GenerationStore:
+    """Build the store described by CACHE_GENERATION_STORE (memory, sqlite or dynamodb)."""
+    store_name = os.getenv('CACHE_GENERATION_STORE', 'memory').lower()
+
+    if store_name == 'sqlite':
+        return SQLiteGenerationStore(os.getenv('CACHE_GENERATION_SQLITE_PATH', DEFAULT_SQLITE_PATH))
+
+    if store_name == 'dynamodb':
+        return DynamoDBGenerationStore(
+            os.getenv('CACHE_GENERATION_DYNAMODB_TABLE', DEFAULT_DYNAMODB_TABLE),
+            os.getenv('CACHE_GENERATION_DYNAMODB_ENDPOINT') or None
+        )
+
+    if store_name != 'memory':
+        logger.warning(f"Unknown generation store '{store_name}', falling back to memory")
+
+    if os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+        # Each function has its own containers, so a webhook would only invalidate its own
+        logger.error("CACHE_GENERATION_STORE is memory under Lambda; webhooks will not reach the read "
+                     "functions. Set CACHE_GENERATION_STORE=dynamodb")
+
+    return InMemoryGenerationStore()
+
+
+_default_store: Optional[GenerationStore] = None
+_default_lock = threading.Lock()
+
+
+def get_generation_store() -> GenerationStore:
+    """Process-wide store shared by the webhook and the read paths."""
+    global _default_store
+
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = create_generation_store_from_env()
+                logger.info(f"Using {type(_default_store).__name__} for cache generations")
+
+    return _default_store
+
+
+# key -> (generation, monotonic time it was read)
+_seen: Dict[str, Tuple[int, float]] = {}
+_seen_lock = threading.Lock()
+
+
+def current_generation(key: str) -> int:
+    """
+    The generation of key, read from the store at most once per
+    CACHE_GENERATION_CHECK_INTERVAL seconds per process so cache hits do not
+    each pay a store round trip. If the store cannot be read, the last value
+    seen is used and the cache TTL bounds staleness.
+    """
+    interval = float(os.getenv('CACHE_GENERATION_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL))
+    now = time.monotonic()
+    with _seen_lock:
+        seen = _seen.get(key)
+    if seen is not None and now - seen[1] < interval:
+        return seen[0]
+
+    try:
+        generation = get_generation_store().get(key)
+    except Exception as e:
+        logger.warning(f"Could not read generation {key}: {str(e)}")
+        return seen[0] if seen is not None else 0
+
+    with _seen_lock:
+        _seen[key] = (generation, now)
+    return generation
+
+
+def bump_generation(key: str) -> int:
+    """Invalidate everything cached under key, in every process that checks it."""
+    generation = get_generation_store().bump(key)
+    with _seen_lock:
+        _seen[key] = (generation, time.monotonic())
+    return generation
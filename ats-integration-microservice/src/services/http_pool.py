@@ -0,0 +1,120 @@
+import os
+import threading
+from typing import Dict, Any, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+
+_session: Optional[requests.Session] = None
+_adapter: Optional[HTTPAdapter] = None
+_lock = threading.Lock()
+_request_count = 0
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def get_timeouts() -> Tuple[float, float]:
+    """(connect, read) timeouts applied to every upstream call."""
+    return (
+        _env_float('GREENHOUSE_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
+        _env_float('GREENHOUSE_READ_TIMEOUT', DEFAULT_READ_TIMEOUT)
+    )
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide keep-alive session.
+
+    The session lives at module scope so its connection pool survives warm
+    Lambda invocations. pool_connections is the number of hosts kept in the
+    pool manager, pool_maxsize the number of sockets kept per host.
+    """
+    global _session, _adapter
+
+    if _session is not None:
+        return _session
+
+    with _lock:
+        if _session is None:
+            pool_connections = _env_int('GREENHOUSE_POOL_CONNECTIONS', DEFAULT_POOL_CONNECTIONS)
+            pool_maxsize = _env_int('GREENHOUSE_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE)
+            pool_block = os.getenv('GREENHOUSE_POOL_BLOCK', 'false').lower() == 'true'
+
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+                max_retries=0
+            )
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+
+            logger.info(f"Created HTTP session - pool_connections: {pool_connections}, pool_maxsize: {pool_maxsize}")
+            _adapter = adapter
+            _session = session
+
+    return _session
+
+
+def record_request() -> None:
+    global _request_count
+    with _lock:
+        _request_count += 1
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Connection reuse statistics for the shared session."""
+    stats = {
+        'session_created': _session is not None,
+        'requests': _request_count,
+        'hosts': {}
+    }
+
+    if _adapter is None:
+        return stats
+
+    pools = _adapter.poolmanager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        host = f"{pool.scheme}://{pool.host}:{pool.port}"
+        stats['hosts'][host] = {
+            'connections_opened': pool.num_connections,
+            'requests': pool.num_requests,
+            'idle_connections': sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0,
+            'maxsize': pool.pool.maxsize if pool.pool is not None else 0
+        }
+
+    return stats
+
+
+def close_session() -> None:
+    global _session, _adapter
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _adapter = None
@@ -0,0 +1,354 @@
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_IDEMPOTENCY_TTL = 24 * 60 * 60
+DEFAULT_IDEMPOTENCY_MAX_ENTRIES = 10000
+DEFAULT_LEASE_SECONDS = 30.0
+DEFAULT_WAIT_SECONDS = 10.0
+DEFAULT_SQLITE_PATH = '/tmp/ats-idempotency.sqlite3'
+DEFAULT_DYNAMODB_TABLE = 'ats-idempotency'
+
+IN_PROGRESS = 'in_progress'
+COMPLETED = 'completed'
+
+
+def _claimable(record: Optional[Dict[str, Any]], now: float) -> bool:
+    """A key can be claimed unless it is completed or owned by a live lease."""
+    if record is None:
+        return True
+    if record.get('status') == COMPLETED:
+        return False
+    if record.get('status') == IN_PROGRESS:
+        return record.get('lease_expires', 0) < now
+    return True
+
+
+class IdempotencyStore(abc.ABC):
+    """
+    Remembers the outcome of a write keyed by an idempotency key.
+
+    Records are plain JSON-compatible dicts with a 'status'. Writers claim a
+    key before calling Greenhouse, store progress as they go and finish with
+    status 'completed', so a retry can either replay the result or resume
+    after the last step that succeeded.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The unexpired record for key, or None."""
+
+    @abc.abstractmethod
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """Replace the record for key."""
+
+    @abc.abstractmethod
+    def claim(self, key: str, lease_seconds: float) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Atomically mark key as in progress. Returns (True, previous progress)
+        when the caller now owns the key, else (False, current record).
+        """
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Free key."""
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, ttl: float = DEFAULT_IDEMPOTENCY_TTL, max_entries: int = DEFAULT_IDEMPOTENCY_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._records: 'OrderedDict[str, Tuple[Dict[str, Any], float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_locked(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+        record, stored_at = entry
+        if time.time() - stored_at > self.ttl:
+            del self._records[key]
+            return None
+        self._records.move_to_end(key)
+        return dict(record)
+
+    def _put_locked(self, key: str, record: Dict[str, Any]) -> None:
+        self._records[key] = (dict(record), time.time())
+        self._records.move_to_end(key)
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._get_locked(key)
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._put_locked(key, record)
+
+    def claim(self, key: str, lease_seconds: float) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        with self._lock:
+            now = time.time()
+            record = self._get_locked(key)
+            if not _claimable(record, now):
+                return False, record
+            self._put_locked(key, dict(record or {}, status=IN_PROGRESS, lease_expires=now + lease_seconds))
+            return True, record
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._records.pop(key, None)
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """Store shared by every worker that can see the same SQLite file."""
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH, ttl: float = DEFAULT_IDEMPOTENCY_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS idempotency ('
+            'key TEXT PRIMARY KEY, record TEXT NOT NULL, stored_at REAL NOT NULL)'
+        )
+        conn.execute('DELETE FROM idempotency WHERE stored_at < ?', (time.time() - self.ttl,))
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _get(self, conn: sqlite3.Connection, key: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            'SELECT record FROM idempotency WHERE key = ? AND stored_at >= ?',
+            (key, time.time() - self.ttl)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _put(self, conn: sqlite3.Connection, key: str, record: Dict[str, Any]) -> None:
+        conn.execute(
+            'INSERT OR REPLACE INTO idempotency (key, record, stored_at) VALUES (?, ?, ?)',
+            (key, json.dumps(record, default=str), time.time())
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._get(self._connection(), key)
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        self._put(self._connection(), key, record)
+
+    def claim(self, key: str, lease_seconds: float) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            record = self._get(conn, key)
+            if not _claimable(record, now):
+                conn.execute('COMMIT')
+                return False, record
+            self._put(conn, key, dict(record or {}, status=IN_PROGRESS, lease_expires=now + lease_seconds))
+            conn.execute('COMMIT')
+            return True, record
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def delete(self, key: str) -> None:
+        self._connection().execute('DELETE FROM idempotency WHERE key = ?', (key,))
+
+
+class DynamoDBIdempotencyStore(IdempotencyStore):
+    """
+    Store backed by a DynamoDB table with string hash key 'idempotency_key'
+    and TTL attribute 'expires_at'. endpoint_url points it at DynamoDB Local
+    (or any DynamoDB-compatible stand-in) for development.
+    """
+
+    def __init__(self, table_name: str = DEFAULT_DYNAMODB_TABLE, endpoint_url: Optional[str] = None,
+                 ttl: float = DEFAULT_IDEMPOTENCY_TTL):
+        import boto3
+
+        self.ttl = ttl
+        self.table = boto3.resource('dynamodb', endpoint_url=endpoint_url).Table(table_name)
+        self._conditional_failure = self.table.meta.client.exceptions.ConditionalCheckFailedException
+
+    def _to_record(self, item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not item or item.get('expires_at', 0) < time.time():
+            return None
+        return json.loads(item['record'])
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        response = self.table.get_item(Key={'idempotency_key': key}, ConsistentRead=True)
+        return self._to_record(response.get('Item'))
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        self.table.put_item(Item={
+            'idempotency_key': key,
+            'record': json.dumps(record, default=str),
+            'record_status': record.get('status', ''),
+            'lease_expires': int(record.get('lease_expires', 0)),
+            'expires_at': int(time.time() + self.ttl)
+        })
+
+    def claim(self, key: str, lease_seconds: float) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        now = time.time()
+        previous = self.get(key)
+        record = dict(previous or {}, status=IN_PROGRESS, lease_expires=now + lease_seconds)
+
+        try:
+            self.table.put_item(
+                Item={
+                    'idempotency_key': key,
+                    'record': json.dumps(record, default=str),
+                    'record_status': IN_PROGRESS,
+                    'lease_expires': int(record['lease_expires']),
+                    'expires_at': int(now + self.ttl)
+                },
+                ConditionExpression=(
+                    'attribute_not_exists(idempotency_key) OR expires_at < :now OR '
+                    '(record_status <> :completed AND record_status <> :in_progress) OR '
+                    '(record_status = :in_progress AND lease_expires < :now)'
+                ),
+                ExpressionAttributeValues={
+                    ':now': int(now),
+                    ':completed': COMPLETED,
+                    ':in_progress': IN_PROGRESS
+                }
+            )
+            return True, previous
+        except self._conditional_failure:
+            return False, self.get(key)
+
+    def delete(self, key: str) -> None:
+        self.table.delete_item(Key={'idempotency_key': key})
+
+
+def create_idempotency_store_from_env() -> IdempotencyStore:
+    """Build the store described by IDEMPOTENCY_STORE (memory, sqlite or dynamodb)."""
+    store_name = os.getenv('IDEMPOTENCY_STORE', 'memory').lower()
+    ttl = float(os.getenv('IDEMPOTENCY_TTL', DEFAULT_IDEMPOTENCY_TTL))
+
+    if store_name == 'sqlite':
+        return SQLiteIdempotencyStore(os.getenv('IDEMPOTENCY_SQLITE_PATH', DEFAULT_SQLITE_PATH), ttl)
+
+    if store_name == 'dynamodb':
+        return DynamoDBIdempotencyStore(
+            os.getenv('IDEMPOTENCY_DYNAMODB_TABLE', DEFAULT_DYNAMODB_TABLE),
+            os.getenv('IDEMPOTENCY_DYNAMODB_ENDPOINT') or None,
+            ttl
+        )
+
+    if store_name != 'memory':
+        logger.warning(f"Unknown idempotency store '{store_name}', falling back to memory")
+
+    return InMemoryIdempotencyStore(
+        ttl=ttl,
+        max_entries=int(os.getenv('IDEMPOTENCY_MAX_ENTRIES', DEFAULT_IDEMPOTENCY_MAX_ENTRIES))
+    )
+
+
+_default_store: Optional[IdempotencyStore] = None
+_default_lock = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Process-wide store shared by the candidate handlers."""
+    global _default_store
+
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = create_idempotency_store_from_env()
+                logger.info(f"Using {type(_default_store).__name__} for idempotency keys")
+
+    return _default_store
+
+
+_in_flight: Dict[str, threading.Event] = {}
+_in_flight_lock = threading.Lock()
+
+
+def begin(store: IdempotencyStore, key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Claim key for the caller. When another request holds it, wait (up to
+    IDEMPOTENCY_WAIT_SECONDS) for that request to finish instead of
+    repeating its upstream calls.
+
+    Returns (True, progress) when the caller owns the key and must call
+    finish() or abandon(). Returns (False, record) otherwise, where record is
+    the completed result or, if the wait timed out, the in-progress record.
+    """
+    lease_seconds = float(os.getenv('IDEMPOTENCY_LEASE_SECONDS', DEFAULT_LEASE_SECONDS))
+    deadline = time.monotonic() + float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', DEFAULT_WAIT_SECONDS))
+    poll_interval = 0.05
+
+    while True:
+        claimed, record = store.claim(key, lease_seconds)
+        if claimed:
+            with _in_flight_lock:
+                _in_flight[key] = threading.Event()
+            return True, record
+
+        if record is None or record.get('status') != IN_PROGRESS:
+            return False, record
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False, record
+
+        # Same-process duplicates wake up as soon as the owner finishes;
+        # duplicates in other workers poll the shared store.
+        with _in_flight_lock:
+            event = _in_flight.get(key)
+        if event is not None:
+            event.wait(min(remaining, 1.0))
+        else:
+            time.sleep(min(remaining, poll_interval))
+            poll_interval = min(poll_interval * 2, 0.5)
+
+
+def record_progress(store: IdempotencyStore, key: str, progress: Dict[str, Any]) -> None:
+    lease_seconds = float(os.getenv('IDEMPOTENCY_LEASE_SECONDS', DEFAULT_LEASE_SECONDS))
+    store.put(key, dict(progress, status=IN_PROGRESS, lease_expires=time.time() + lease_seconds))
+
+
+def _release(key: str) -> None:
+    with _in_flight_lock:
+        event = _in_flight.pop(key, None)
+    if event is not None:
+        event.set()
+
+
+def finish(store: IdempotencyStore, key: str, result: Dict[str, Any]) -> None:
+    """Store the final result of an owned key and wake any waiters."""
+    try:
+        store.put(key, dict(result, status=COMPLETED))
+    finally:
+        _release(key)
+
+
+def abandon(store: IdempotencyStore, key: str, progress: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Give up an owned key. Progress (for example a created candidate_id) is
+    kept so the next attempt resumes from it; otherwise the key is freed.
+    """
+    try:
+        if progress:
+            store.put(key, dict(progress, status='partial'))
+        else:
+            store.delete(key)
+    finally:
+        _release(key)
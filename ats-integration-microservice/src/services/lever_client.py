@@ -0,0 +1,124 @@
+import math
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple
+import requests
+from src.models.schemas import Candidate, JobStatus, ApplicationStatus
+from src.services.ats_client import ATSClient
+
+
+class LeverClient(ATSClient):
+    """
+    Adapter for a Lever-style API: postings and opportunities, list bodies
+    wrapped in {"data": [...], "hasNext": ..., "total": ...}, and timestamps
+    in epoch milliseconds.
+
+    It pages with `page`/`limit` rather than Lever's opaque `offset` cursor,
+    so it runs on the shared page-number pagination (and its concurrent
+    fan-out). Point LEVER_BASE_URL at a service that speaks this shape.
+    """
+
+    name = 'lever'
+    display_name = 'Lever'
+    api_key_env = 'LEVER_API_KEY'
+    base_url_env = 'LEVER_BASE_URL'
+    default_base_url = 'https://api.lever.co'
+    cache_namespace = 'lever:'
+
+    endpoints = {
+        'jobs': 'postings',
+        'applications': 'opportunities',
+        'job_applications': 'opportunities',
+        'candidates': 'opportunities',
+        'create_application': 'opportunities/{candidate_id}/addPostings'
+    }
+    per_page_param = 'limit'
+    status_param = 'state'
+    updated_after_param = 'updated_at_start'
+    job_status_filters = {'OPEN': 'published', 'CLOSED': 'closed', 'DRAFT': 'draft'}
+
+    job_fields = {
+        'id': ('id',),
+        'title': ('text',),
+        'location': ('categories', 'location'),
+        'external_url': ('urls', 'show')
+    }
+    job_defaults = {'title': '', 'location': 'Remote', 'external_url': ''}
+    job_status_path = ('state',)
+    job_statuses = {
+        'PUBLISHED': JobStatus.OPEN,
+        'INTERNAL': JobStatus.OPEN,
+        'CLOSED': JobStatus.CLOSED,
+        'REJECTED': JobStatus.CLOSED,
+        'DRAFT': JobStatus.DRAFT,
+        'PENDING': JobStatus.DRAFT
+    }
+    default_job_status = JobStatus.OPEN
+
+    application_fields = {
+        'id': ('id',),
+        'candidate_name': ('name',),
+        'email': ('emails', 0)
+    }
+    application_defaults = {'candidate_name': '', 'email': ''}
+    application_status_path = ('stage',)
+    application_statuses = (
+        ('ARCHIVED', ApplicationStatus.REJECTED),
+        ('HIRED', ApplicationStatus.HIRED),
+        ('SCREEN', ApplicationStatus.SCREENING)
+    )
+    default_application_status = ApplicationStatus.APPLIED
+    activity_path = ('updatedAt',)
+
+    def _read_page(self, response: requests.Response, params: Dict[str, Any]) -> Dict[str, Any]:
+        # Rebuild the page-number links the shared pagination reads from the envelope.
+        body = response.json()
+        page = params['page']
+        per_page = params[self.per_page_param]
+        links = {}
+        if body.get('hasNext'):
+            links['next'] = f"{response.url.split('?')[0]}?page={page + 1}"
+        if body.get('total') is not None:
+            links['last'] = f"{response.url.split('?')[0]}?page={max(1, math.ceil(body['total'] / per_page))}"
+        return {
+            'data': body.get('data') or [],
+            'links': links,
+            'total': body.get('total')
+        }
+
+    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        body = super()._make_request(method, endpoint, **kwargs)
+        return body.get('data', body)
+
+    def _applications_target(self, job_id: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        params = {'posting_id': job_id} if job_id else {}
+        return self.endpoints['job_applications' if job_id else 'applications'], params
+
+    def _updated_after_value(self, updated_after: str) -> Any:
+        parsed = datetime.fromisoformat(updated_after.replace('Z', '+00:00'))
+        return int(parsed.timestamp() * 1000)
+
+    def _parse_activity(self, app_data: Dict[str, Any]) -> Optional[str]:
+        updated_at = super()._parse_activity(app_data)
+        if updated_at is None:
+            return None
+        # Same ISO format as the sync watermark, so the two compare as strings.
+        return datetime.fromtimestamp(updated_at / 1000, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+    def _candidate_payload(self, candidate_data: Candidate) -> Dict[str, Any]:
+        payload = {
+            'name': candidate_data.name,
+            'emails': [candidate_data.email],
+            'phones': [],
+            'links': []
+        }
+
+        if candidate_data.phone:
+            payload['phones'].append({'value': candidate_data.phone, 'type': 'mobile'})
+
+        if candidate_data.resume_url:
+            payload['links'].append(candidate_data.resume_url)
+
+        return payload
+
+    def _application_payload(self, candidate_id: str, job_id: str) -> Dict[str, Any]:
+        return {'postings': [job_id]}
@@ -0,0 +1,185 @@
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, Mapping, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_RATE_LIMIT = 50
+DEFAULT_RATE_WINDOW = 10.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.25
+DEFAULT_BACKOFF_CAP = 8.0
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Client-side pacing for one Harvest API key.
+
+    Harvest allows X-RateLimit-Limit requests per rolling window (10 seconds).
+    The bucket refills at limit/window tokens per second, and every response
+    corrects it: the limit resets the refill rate, X-RateLimit-Remaining
+    caps the tokens we think we have, and Retry-After blocks every caller
+    until it elapses.
+    """
+
+    def __init__(self, limit: int = DEFAULT_RATE_LIMIT, window: float = DEFAULT_RATE_WINDOW):
+        self.window = window
+        self.capacity = float(limit)
+        self.rate = limit / window
+        self.tokens = float(limit)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {
+            'acquired': 0,
+            'throttled': 0,
+            'throttle_seconds': 0.0,
+            'rate_limited_responses': 0
+        }
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self._stats['acquired'] += 1
+                    if waited:
+                        self._stats['throttled'] += 1
+                        self._stats['throttle_seconds'] += waited
+                    return waited
+                else:
+                    delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def update_from_headers(self, headers: Mapping[str, str], status_code: Optional[int] = None) -> None:
+        limit = _header_number(headers, 'X-RateLimit-Limit')
+        remaining = _header_number(headers, 'X-RateLimit-Remaining')
+        retry_after = parse_retry_after(headers)
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if limit and limit > 0 and limit != self.capacity:
+                self.capacity = float(limit)
+                self.rate = limit / self.window
+
+            if remaining is not None:
+                self.tokens = min(self.tokens, max(0.0, remaining))
+
+            if status_code == 429:
+                self._stats['rate_limited_responses'] += 1
+                self.tokens = 0.0
+                pause = retry_after if retry_after is not None else self.window
+                self.blocked_until = max(self.blocked_until, now + pause)
+                logger.warning(f"Harvest rate limit hit, pausing requests for {pause:.1f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                self._stats,
+                tokens=round(self.tokens, 2),
+                limit=self.capacity,
+                window=self.window
+            )
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    return _header_number(headers, 'Retry-After')
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than Retry-After."""
+    base = float(os.getenv('GREENHOUSE_BACKOFF_BASE', DEFAULT_BACKOFF_BASE))
+    cap = float(os.getenv('GREENHOUSE_BACKOFF_CAP', DEFAULT_BACKOFF_CAP))
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def get_max_retries() -> int:
+    return int(os.getenv('GREENHOUSE_MAX_RETRIES', DEFAULT_MAX_RETRIES))
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+_retry_stats = {
+    'retries': 0,
+    'retry_seconds': 0.0,
+    'exhausted': 0
+}
+
+
+def get_rate_limiter(key: str) -> TokenBucket:
+    """One bucket per API key, shared by every client in the process."""
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(
+                    limit=int(os.getenv('GREENHOUSE_RATE_LIMIT', DEFAULT_RATE_LIMIT)),
+                    window=float(os.getenv('GREENHOUSE_RATE_LIMIT_WINDOW', DEFAULT_RATE_WINDOW))
+                )
+                _buckets[key] = bucket
+    return bucket
+
+
+def record_retry(delay: float) -> None:
+    with _buckets_lock:
+        _retry_stats['retries'] += 1
+        _retry_stats['retry_seconds'] += delay
+
+
+def record_retries_exhausted() -> None:
+    with _buckets_lock:
+        _retry_stats['exhausted'] += 1
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """Throttling and retry counters for every bucket in the process."""
+    with _buckets_lock:
+        buckets = list(_buckets.values())
+        stats = dict(_retry_stats)
+
+    totals = {'acquired': 0, 'throttled': 0, 'throttle_seconds': 0.0, 'rate_limited_responses': 0}
+    for bucket in buckets:
+        bucket_stats = bucket.get_stats()
+        for name in totals:
+            totals[name] += bucket_stats[name]
+
+    stats.update(totals)
+    stats['buckets'] = len(buckets)
+    return stats
@@ -0,0 +1,79 @@
+import threading
+from typing import Dict, Any, Callable, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into one execution.
+
+    The first caller for a key runs fn; callers arriving while it is running
+    block and receive the same result (or the same exception). Nothing is
+    remembered once the call returns - caching is the cache layer's job.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'calls': 0,
+            'executions': 0,
+            'collapsed': 0
+        }
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._stats['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._stats['collapsed'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.info(f"Shared one upstream call for {key} with {call.waiters} waiting requests")
+            call.done.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats, in_flight=len(self._calls))
+        stats['collapse_ratio'] = stats['collapsed'] / stats['calls'] if stats['calls'] else 0.0
+        return stats
+
+
+_default = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide group shared by every GreenhouseClient."""
+    return _default
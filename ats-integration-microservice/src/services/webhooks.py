@@ -0,0 +1,128 @@
+import hashlib
+import hmac
+import os
+from typing import Dict, Any, Optional
+from src.services.application_sync import account_generation_key, is_sync_enabled, job_generation_key
+from src.services.generations import bump_generation
+from src.services.greenhouse_client import GreenhouseClient
+from src.utils.exceptions import AuthenticationError, ConfigurationError, ValidationError
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SIGNATURE_SCHEME = 'sha256'
+
+JOB_ACTIONS = {'job_created', 'job_updated', 'job_deleted', 'job_approved'}
+APPLICATION_ACTIONS = {'new_candidate_application', 'candidate_stage_change', 'application_updated',
+                       'prospect_created', 'hire_candidate', 'reject_candidate', 'unreject_candidate'}
+APPLICATION_DELETE_ACTIONS = {'delete_application'}
+CANDIDATE_DELETE_ACTIONS = {'delete_candidate'}
+
+
+def verify_signature(body: bytes, signature_header: Optional[str]) -> None:
+    """
+    Check the `Signature: sha256 <hex digest>` header Greenhouse sends with
+    every webhook against an HMAC-SHA256 of the raw body.
+    """
+    secret = os.getenv('GREENHOUSE_WEBHOOK_SECRET')
+    if not secret:
+        raise ConfigurationError("GREENHOUSE_WEBHOOK_SECRET environment variable is required")
+
+    if not signature_header:
+        raise AuthenticationError("Missing Signature header")
+
+    scheme, _, digest = signature_header.strip().partition(' ')
+    if scheme.lower() != SIGNATURE_SCHEME or not digest:
+        raise AuthenticationError("Unsupported signature format")
+
+    expected = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected, digest.strip().lower()):
+        raise AuthenticationError("Signature does not match payload")
+
+
+def apply_job_event(action: str, job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Invalidate the account's cached /jobs pages for one job event.
+
+    The pages live in whichever processes served them, so the webhook bumps
+    the generation that every reader folds into its cache keys (see
+    ATSClient._get_jobs_raw_page). A webhook does not say which listing a job
+    left, so every listing of the account is refreshed on its next read.
+    """
+    if job.get('id') is None:
+        return {'generation': None}
+
+    generation = bump_generation(GreenhouseClient.job_cache_prefix())
+    logger.info(f"Applied {action} for job {job['id']} - job pages now at generation {generation}")
+    return {'generation': generation}
+
+
+def _application_job_id(application: Dict[str, Any]) -> Optional[str]:
+    jobs = application.get('jobs') or []
+    if jobs and jobs[0].get('id') is not None:
+        return str(jobs[0]['id'])
+    if application.get('job_id') is not None:
+        return str(application['job_id'])
+    return None
+
+
+def apply_application_event(action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bump the generation that makes readers resync the applications an event
+    touches on their next read.
+
+    The event itself is not written to a snapshot: the webhook function's
+    /tmp is not the one the read functions sync into, and the resync fetches
+    the same change from Greenhouse anyway.
+    """
+    if not is_sync_enabled():
+        return {'generation': None}
+
+    account = GreenhouseClient.account_key()
+
+    if action in CANDIDATE_DELETE_ACTIONS:
+        # A delta never reports deletions, so every job of the account is synced in full
+        generation = bump_generation(account_generation_key(account))
+        logger.info(f"Applied {action} - account applications now at generation {generation}")
+        return {'generation': generation}
+
+    application = payload.get('application') or {}
+    if application.get('id') is None:
+        raise ValidationError(f"{action} payload has no application id")
+
+    if action in APPLICATION_DELETE_ACTIONS:
+        generation = bump_generation(account_generation_key(account))
+        logger.info(f"Applied {action} for application {application['id']} - "
+                    f"account applications now at generation {generation}")
+        return {'generation': generation}
+
+    job_id = _application_job_id(application)
+    if job_id is None:
+        raise ValidationError(f"{action} payload for application {application['id']} has no job")
+
+    generation = bump_generation(job_generation_key(account, job_id))
+    logger.info(f"Applied {action} for application {application['id']} - "
+                f"job {job_id} applications now at generation {generation}")
+    return {'generation': generation}
+
+
+def apply_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one decoded webhook to the job cache or the application snapshot."""
+    action = event.get('action')
+    payload = event.get('payload')
+    if not action or not isinstance(payload, dict):
+        raise ValidationError("Webhook must have an action and a payload object")
+
+    if action == 'ping':
+        return {'action': action, 'applied': False}
+
+    if action in JOB_ACTIONS:
+        result = apply_job_event(action, payload.get('job') or {})
+    elif action in APPLICATION_ACTIONS | APPLICATION_DELETE_ACTIONS | CANDIDATE_DELETE_ACTIONS:
+        result = apply_application_event(action, payload)
+    else:
+        logger.info(f"Ignoring unsupported webhook action {action}")
+        return {'action': action, 'applied': False}
+
+    return dict(result, action=action, applied=True)
+
@@ -1,35 +1,74 @@
 import json
 from typing import Dict, Any, Optional, List
-from src.models.schemas import ErrorResponse
+
+_orjson = None
+_orjson_checked = False
+
+JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, X-API-Key, If-None-Match, Idempotency-Key',
+    'Access-Control-Expose-Headers': 'ETag'
+}
+
+PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, X-API-Key, If-None-Match, Idempotency-Key',
+    'Access-Control-Max-Age': '86400'
+}
+
+def _get_orjson():
+    # Imported on first use so a CORS preflight does not pay for it at cold start.
+    global _orjson, _orjson_checked
+    
+    if not _orjson_checked:
+        try:
+            import orjson
+            _orjson = orjson
+        except ImportError:
+            _orjson = None
+        _orjson_checked = True
+    
+    return _orjson
+
+def dumps(data: Any) -> str:
+    """Serialise a response body, with orjson when it is installed."""
+    orjson = _get_orjson()
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(data, default=str)
 
 def create_success_response(data: Any, status_code: int = 200) -> Dict[str, Any]:
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type, X-API-Key'
-        },
-        'body': json.dumps(data, default=str)
+        'headers': dict(JSON_HEADERS),
+        'body': dumps(data)
     }
 
-def create_error_response(error: str, status_code: int = 500, details: str = None) -> Dict[str, Any]:
-    error_response = ErrorResponse(
-        error=error,
-        code=status_code,
-        details=details
-    )
-    
+def create_error_response(error: str, status_code: int = 500, details: Optional[str] = None) -> Dict[str, Any]:
+    # Same shape as models.schemas.ErrorResponse, built without the model.
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type, X-API-Key'
-        },
-        'body': json.dumps(error_response.dict())
+        'headers': dict(JSON_HEADERS),
+        'body': dumps({
+            'error': error,
+            'code': status_code,
+            'details': details
+        })
+    }
+
+def create_not_modified_response(etag: str) -> Dict[str, Any]:
+    headers = dict(JSON_HEADERS, ETag=etag)
+    del headers['Content-Type']
+    return {
+        'statusCode': 304,
+        'headers': headers,
+        'body': ''
     }
 
 def create_validation_error_response(errors: List[str]) -> Dict[str, Any]:
@@ -40,12 +79,7 @@ def handle_cors_response(event: Dict[str, Any]) -> Dict[str, Any]:
     if event.get('httpMethod') == 'OPTIONS':
         return {
             'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-API-Key',
-                'Access-Control-Max-Age': '86400'
-            },
+            'headers': dict(PREFLIGHT_HEADERS),
             'body': ''
         }
     return None
@@ -14,3 +14,7 @@ class ValidationError(ATSServiceError):
 
 class ConfigurationError(ATSServiceError):
     pass
+
+class CircuitOpenError(ATSAPIError):
+    def __init__(self, message: str, status_code: int = 503):
+        super().__init__(message, status_code)
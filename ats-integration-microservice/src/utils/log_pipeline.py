@@ -0,0 +1,104 @@
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+from typing import Dict, Any, Optional
+
+DEFAULT_FLUSH_TIMEOUT = 2.0
+
+
+class InfoSampler(logging.Filter):
+    """
+    Keeps a fraction of INFO and DEBUG records. WARNING and above, and
+    records logged with extra={'never_sample': True}, always pass.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self.dropped = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1.0 or getattr(record, 'never_sample', False):
+            return True
+        if random.random() < self.rate:
+            return True
+        self.dropped += 1
+        return False
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues the record untouched. The stock QueueHandler formats in the
+    caller so records survive pickling, but ours never leave the process,
+    so message merging and JSON encoding are left to the listener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class LogPipeline:
+    """
+    Sampler -> queue -> listener thread -> stream handler. Callers only pay
+    for the level check, the sampling decision and a queue put.
+    """
+
+    def __init__(self, formatter: logging.Formatter, asynchronous: bool = True, sample_rate: float = 1.0):
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        self.queue: Optional[queue.Queue] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        if asynchronous:
+            self.queue = queue.Queue()
+            self.handler: logging.Handler = DeferredQueueHandler(self.queue)
+            self.listener = logging.handlers.QueueListener(self.queue, stream_handler, respect_handler_level=True)
+            self.listener.start()
+        else:
+            self.handler = stream_handler
+
+        self.sampler = InfoSampler(sample_rate)
+        self.handler.addFilter(self.sampler)
+
+    def flush(self, timeout: float) -> bool:
+        """Wait until the listener has written every queued record. False on timeout."""
+        if self.listener is None:
+            return True
+
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout: float) -> None:
+        if self.listener is not None:
+            self.flush(timeout)
+            self.listener.stop()
+            self.listener = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'async': self.queue is not None,
+            'queued': self.queue.qsize() if self.queue is not None else 0,
+            'sample_rate': self.sampler.rate,
+            'sampled_out': self.sampler.dropped
+        }
+
+
+def create_pipeline_from_env(formatter: logging.Formatter) -> LogPipeline:
+    return LogPipeline(
+        formatter,
+        asynchronous=os.getenv('LOG_ASYNC', 'true').lower() == 'true',
+        sample_rate=float(os.getenv('LOG_INFO_SAMPLE_RATE', '1.0'))
+    )
+
+
+def get_flush_timeout() -> float:
+    return float(os.getenv('LOG_FLUSH_TIMEOUT', DEFAULT_FLUSH_TIMEOUT))
@@ -1,13 +1,18 @@
+import atexit
+import functools
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Dict, Any
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, Optional
 
 class JSONFormatter(logging.Formatter):
     def format(self, record):
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat(),
+            # Formatting may happen on the listener thread well after the call, so
+            # stamp the record with when it was created rather than when it is written.
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat(),
             'level': record.levelname,
             'message': record.getMessage(),
             'module': record.module,
@@ -21,22 +26,81 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, 'extra_fields'):
             log_entry.update(record.extra_fields)
         
-        return json.dumps(log_entry)
+        return json.dumps(log_entry, default=str)
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def _get_pipeline():
+    global _pipeline
+    
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                from src.utils.log_pipeline import create_pipeline_from_env
+                _pipeline = create_pipeline_from_env(JSONFormatter())
+                atexit.register(shutdown_logging)
+    
+    return _pipeline
+
+class PipelineHandler(logging.Handler):
+    """
+    Forwards to the shared queue pipeline, which is built on the first record
+    so importing a handler module neither loads logging.handlers nor starts
+    the listener thread.
+    """
+    
+    def handle(self, record):
+        return _get_pipeline().handler.handle(record)
+
+_handler = PipelineHandler()
 
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     
     if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = JSONFormatter()
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        logger.addHandler(_handler)
         
         log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
         logger.setLevel(getattr(logging, log_level, logging.INFO))
     
     return logger
 
+def flush_logs(timeout: Optional[float] = None) -> bool:
+    """
+    Block until everything logged so far has been written, or until timeout
+    (LOG_FLUSH_TIMEOUT) passes. Returns False if records were left queued.
+    """
+    if _pipeline is None:
+        return True
+    
+    from src.utils.log_pipeline import get_flush_timeout
+    return _pipeline.flush(get_flush_timeout() if timeout is None else timeout)
+
+def flush_logs_on_return(handler: Callable) -> Callable:
+    """
+    Decorator for Lambda entry points: drain the log queue before returning,
+    because the runtime may freeze the container as soon as the handler
+    returns and anything still queued would be lost.
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        try:
+            return handler(event, context)
+        finally:
+            flush_logs()
+    return wrapper
+
+def shutdown_logging() -> None:
+    if _pipeline is not None:
+        from src.utils.log_pipeline import get_flush_timeout
+        _pipeline.stop(get_flush_timeout())
+
+def get_logging_stats() -> Dict[str, Any]:
+    if _pipeline is None:
+        return {'async': None, 'queued': 0, 'sample_rate': None, 'sampled_out': 0}
+    return _pipeline.get_stats()
+
 def log_request_response(logger: logging.Logger, request_data: Dict[str, Any], response_data: Dict[str, Any], status_code: int):
     logger.info(
         "API Request completed",
@@ -0,0 +1,155 @@
+import base64
+import gzip
+import hashlib
+import os
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+
+ROWS = 'rows'
+COLUMNS = 'columns'
+
+DEFAULT_COMPRESSION_MIN_BYTES = 1024
+# Fast levels: on a Lambda the CPU spent compressing is billed, the bytes saved are not.
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+_brotli = None
+_brotli_checked = False
+
+
+def _get_brotli():
+    # Optional dependency, imported on first use like orjson in api_response.
+    global _brotli, _brotli_checked
+
+    if not _brotli_checked:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = None
+        _brotli_checked = True
+
+    return _brotli
+
+
+def project(records: Iterable[Any], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """One dict per model holding only `fields`, read off the attributes instead of via .dict()."""
+    return [{field: getattr(record, field) for field in fields} for record in records]
+
+
+def to_columns(records: Iterable[Any], fields: Sequence[str]) -> Dict[str, List[Any]]:
+    """One array per field, so each key is written once per page rather than once per record."""
+    records = list(records)
+    return {field: [getattr(record, field) for record in records] for field in fields}
+
+
+def build_page(key: str, records: Iterable[Any], fields: Sequence[str], layout: str = ROWS,
+               **meta: Any) -> Dict[str, Any]:
+    """The Paginated*Response body for `records`, projected to `fields` in the requested layout."""
+    if layout == COLUMNS:
+        body = {key: to_columns(records, fields), 'layout': COLUMNS}
+    else:
+        body = {key: project(records, fields)}
+    body.update(meta)
+    return body
+
+
+def compute_etag(records: Iterable[Any], fields: Sequence[str], layout: str = ROWS, **meta: Any) -> str:
+    """
+    Weak ETag over the values a page would contain, computed without
+    serialising it. Weak because gzip, br and identity bodies of the same
+    page are equivalent but not byte-identical.
+    """
+    parts = [layout, ','.join(fields), repr(sorted(meta.items()))]
+    for record in records:
+        for field in fields:
+            value = getattr(record, field)
+            # Plain strings skip str(); enums hash by value, avoiding the slow Enum.__repr__.
+            parts.append(value if type(value) is str else str(getattr(value, 'value', value)))
+    digest = hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=16)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(event: Dict[str, Any], etag: str) -> bool:
+    """If-None-Match check with the weak comparison RFC 9110 requires for GET."""
+    header = _request_header(event, 'If-None-Match').strip()
+    if not header:
+        return False
+    if header == '*':
+        return True
+
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _request_header(event: Dict[str, Any], name: str) -> str:
+    name = name.lower()
+    for header, value in (event.get('headers') or {}).items():
+        if header.lower() == name:
+            return value or ''
+    return ''
+
+
+def negotiate_encoding(event: Dict[str, Any]) -> Optional[str]:
+    """Pick br or gzip from Accept-Encoding, honouring q-values. None means identity."""
+    preferences = {}
+    for token in _request_header(event, 'Accept-Encoding').split(','):
+        name, _, params = token.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            preferences[name.strip().lower()] = q
+
+    supported = ('br', 'gzip') if _get_brotli() is not None else ('gzip',)
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = preferences.get(encoding, preferences.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compression_enabled() -> bool:
+    return os.getenv('RESPONSE_COMPRESSION_ENABLED', 'true').lower() == 'true'
+
+
+def encode_response(response: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compress the body when the client accepts it and it is large enough to be
+    worth it. The body is returned base64 encoded, as API Gateway expects for
+    binary payloads. Returns a new response dict.
+    """
+    if not is_compression_enabled():
+        return response
+
+    headers = dict(response.get('headers') or {}, Vary='Accept-Encoding')
+    encoding = negotiate_encoding(event)
+    raw = (response.get('body') or '').encode('utf-8')
+    min_bytes = int(os.getenv('RESPONSE_COMPRESSION_MIN_BYTES', DEFAULT_COMPRESSION_MIN_BYTES))
+
+    if encoding is None or len(raw) < min_bytes:
+        return dict(response, headers=headers)
+
+    if encoding == 'br':
+        compressed = _get_brotli().compress(raw, quality=BROTLI_QUALITY)
+    else:
+        # mtime=0 keeps the output stable for identical bodies.
+        compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+
+    headers['Content-Encoding'] = encoding
+    return dict(
+        response,
+        headers=headers,
+        body=base64.b64encode(compressed).decode('ascii'),
+        isBase64Encoded=True
+    )
@@ -0,0 +1,191 @@
+import contextvars
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_METRICS_NAMESPACE = 'ATSIntegration'
+DEFAULT_RESERVOIR_SIZE = 1000
+
+
+class RequestTimer:
+    """
+    Per-request phase durations. Phases with the same name accumulate, so
+    three upstream calls show up as one `upstream` phase with count 3.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, duration_ms: float) -> None:
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + duration_ms
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms: float) -> str:
+        with self._lock:
+            entries = [
+                f'{phase};dur={duration:.2f}' + (f';desc="{self.counts[phase]} calls"' if self.counts[phase] > 1 else '')
+                for phase, duration in self.phases.items()
+            ]
+        entries.append(f"total;dur={total_ms:.2f}")
+        return ', '.join(entries)
+
+
+_current: contextvars.ContextVar[Optional[RequestTimer]] = contextvars.ContextVar('request_timer', default=None)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return _current.get()
+
+
+@contextmanager
+def span(phase: str) -> Iterator[None]:
+    """Time a block into the current request's timer. A no-op outside a timed request."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(phase, (time.perf_counter() - started) * 1000)
+
+
+def run_in_context(fn: Callable, *args, **kwargs) -> Callable[[], Any]:
+    """Bind fn to the caller's context, so spans recorded on a worker thread reach its timer."""
+    ctx = contextvars.copy_context()
+    return lambda: ctx.run(fn, *args, **kwargs)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class TimingAggregator:
+    """Keeps the most recent durations per (handler, phase) and reports percentiles."""
+
+    def __init__(self, reservoir_size: int = DEFAULT_RESERVOIR_SIZE):
+        self.reservoir_size = reservoir_size
+        self._samples: Dict[str, Dict[str, deque]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, handler: str, phases: Dict[str, float]) -> None:
+        with self._lock:
+            by_phase = self._samples.setdefault(handler, {})
+            for phase, duration_ms in phases.items():
+                by_phase.setdefault(phase, deque(maxlen=self.reservoir_size)).append(duration_ms)
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        with self._lock:
+            snapshot = {
+                handler: {phase: sorted(samples) for phase, samples in by_phase.items()}
+                for handler, by_phase in self._samples.items()
+            }
+
+        return {
+            handler: {
+                phase: {
+                    'count': len(ordered),
+                    'p50': round(_percentile(ordered, 50), 3),
+                    'p95': round(_percentile(ordered, 95), 3),
+                    'p99': round(_percentile(ordered, 99), 3),
+                    'max': round(ordered[-1], 3)
+                }
+                for phase, ordered in by_phase.items()
+            }
+            for handler, by_phase in snapshot.items()
+        }
+
+    def record_emf_lines(self, lines: Iterable[str]) -> int:
+        """Feed EMF log lines written by timed_handler (e.g. from `serverless offline`). Returns lines used."""
+        used = 0
+        for line in lines:
+            line = line.strip()
+            if not line.startswith('{') or '"_aws"' not in line:
+                continue
+            try:
+                document = json.loads(line)
+                metrics = document['_aws']['CloudWatchMetrics'][0]['Metrics']
+            except (ValueError, KeyError, IndexError, TypeError):
+                continue
+            phases = {m['Name']: document[m['Name']] for m in metrics if m['Name'] in document}
+            self.record(document.get('Handler', 'unknown'), phases)
+            used += 1
+        return used
+
+
+_aggregator = TimingAggregator()
+
+
+def get_timing_stats() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """p50/p95/p99 per handler and phase for requests served by this process."""
+    return _aggregator.report()
+
+
+def _emf_document(handler: str, phases: Dict[str, float]) -> Dict[str, Any]:
+    return {
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': os.getenv('METRICS_NAMESPACE', DEFAULT_METRICS_NAMESPACE),
+                'Dimensions': [['Handler']],
+                'Metrics': [{'Name': phase, 'Unit': 'Milliseconds'} for phase in phases]
+            }]
+        },
+        'Handler': handler,
+        **{phase: round(duration, 3) for phase, duration in phases.items()}
+    }
+
+
+def timed_handler(name: str) -> Callable:
+    """
+    Decorator for Lambda entry points. Opens a RequestTimer for the
+    invocation, then adds a Server-Timing header to the response, logs one
+    EMF metrics line and feeds the in-process aggregator.
+    """
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            if (event or {}).get('httpMethod') == 'OPTIONS':
+                return handler(event, context)
+
+            timer = RequestTimer(name)
+            token = _current.set(timer)
+            try:
+                response = handler(event, context)
+            finally:
+                _current.reset(token)
+
+            total_ms = timer.total_ms()
+            phases = dict(timer.phases, total=total_ms)
+
+            if isinstance(response, dict) and os.getenv('SERVER_TIMING_ENABLED', 'true').lower() == 'true':
+                # Copy rather than mutate: replayed idempotent responses come straight from the store.
+                headers = dict(response.get('headers') or {}, **{'Server-Timing': timer.server_timing(total_ms)})
+                response = dict(response, headers=headers)
+
+            _aggregator.record(name, phases)
+            if os.getenv('TIMING_EMF_ENABLED', 'true').lower() == 'true':
+                logger.info(f"{name} timing", extra={'extra_fields': _emf_document(name, phases), 'never_sample': True})
+            return response
+        return wrapper
+    return decorator
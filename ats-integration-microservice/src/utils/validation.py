@@ -1,13 +1,35 @@
 import json
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import re
-from src.models.schemas import Candidate
+from pydantic import ValidationError as PydanticValidationError
+from src.models.schemas import Application, Candidate, Job
 from src.utils.exceptions import ValidationError
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_PATTERN = re.compile(r'^[\+]?[1-9][\d]{0,15}$')
+PHONE_SEPARATORS = str.maketrans('', '', ' -()')
+
+# Addresses of this strict ASCII shape are accepted by email-validator as-is
+# (apart from lower-casing the domain), so Candidate can skip EmailStr.
+SIMPLE_EMAIL_PATTERN = re.compile(
+    r'^(?P<local>[a-zA-Z0-9_%+-]+(?:\.[a-zA-Z0-9_%+-]+)*)'
+    r'@(?P<domain>(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,63})$'
+)
+SPECIAL_USE_DOMAINS = ('arpa', 'invalid', 'local', 'localhost', 'onion', 'test')
+
+CANDIDATE_FIELDS = ('name', 'email', 'phone', 'resume_url', 'job_id')
+REQUIRED_CANDIDATE_FIELDS = frozenset(('name', 'email', 'job_id'))
+VALID_JOB_STATUSES = ('OPEN', 'CLOSED', 'DRAFT')
+JOB_FIELDS = tuple(Job.model_fields)
+APPLICATION_FIELDS = tuple(Application.model_fields)
+RESPONSE_LAYOUTS = ('rows', 'columns')
+TRUE_VALUES = ('1', 'true', 'yes')
+FALSE_VALUES = ('0', 'false', 'no', '')
+
 def validate_api_key(event: Dict[str, Any]) -> bool:
     expected_api_key = os.getenv('API_KEY', 'demo-key-123')
     provided_key = event.get('headers', {}).get('X-API-Key') or event.get('headers', {}).get('x-api-key')
@@ -32,32 +54,106 @@ def validate_request_body(event: Dict[str, Any]) -> Dict[str, Any]:
     except json.JSONDecodeError as e:
         raise ValidationError(f"Invalid JSON in request body: {str(e)}")
 
-def validate_candidate_data(body: Dict[str, Any]) -> Candidate:
-    errors = []
+def validate_idempotency_key(event: Dict[str, Any]) -> Optional[str]:
+    headers = event.get('headers') or {}
+    key = headers.get('Idempotency-Key') or headers.get('idempotency-key')
     
-    required_fields = ['name', 'email', 'job_id']
-    for field in required_fields:
-        if field not in body or not body[field]:
-            errors.append(f"Field '{field}' is required")
+    if key is None:
+        return None
     
-    if 'email' in body and body['email']:
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, body['email']):
-            errors.append("Invalid email format")
+    key = key.strip()
+    if not key or len(key) > 255:
+        raise ValidationError("Idempotency-Key must be between 1 and 255 characters")
+    
+    return key
+
+def validate_bulk_request_body(event: Dict[str, Any], max_records: int) -> List[Any]:
+    if not event.get('body'):
+        raise ValidationError("Request body is required")
     
-    if 'phone' in body and body['phone']:
-        phone_pattern = r'^[\+]?[1-9][\d]{0,15}$'
-        if not re.match(phone_pattern, body['phone'].replace(' ', '').replace('-', '').replace('(', '').replace(')', '')):
-            errors.append("Invalid phone format")
+    headers = event.get('headers') or {}
+    content_type = (headers.get('Content-Type') or headers.get('content-type') or '').lower()
+    raw_body = event['body'].strip()
+    
+    if 'ndjson' in content_type or not raw_body.startswith('['):
+        records = []
+        for line_number, line in enumerate(raw_body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValidationError(f"Invalid JSON on line {line_number}: {str(e)}")
+    else:
+        try:
+            records = json.loads(raw_body)
+        except json.JSONDecodeError as e:
+            raise ValidationError(f"Invalid JSON in request body: {str(e)}")
+    
+    if not records:
+        raise ValidationError("Request body must contain at least one candidate")
+    
+    if len(records) > max_records:
+        raise ValidationError(f"A bulk request may contain at most {max_records} candidates")
+    
+    return records
+
+def _fast_email(email: str) -> Optional[str]:
+    """Return the normalised address if it can bypass EmailStr, else None."""
+    if len(email) > 254:
+        return None
+    match = SIMPLE_EMAIL_PATTERN.match(email)
+    if not match or len(match.group('local')) > 64:
+        return None
+    domain = match.group('domain').lower()
+    if domain.rsplit('.', 1)[-1] in SPECIAL_USE_DOMAINS:
+        return None
+    # IDNA reserves '--' at positions 3-4: EmailStr rejects such labels, or
+    # decodes them to Unicode when they are valid punycode ('xn--').
+    if any(label[2:4] == '--' for label in domain.split('.')):
+        return None
+    return f"{match.group('local')}@{domain}"
+
+def validate_candidate_data(body: Dict[str, Any]) -> Candidate:
+    if not isinstance(body, dict):
+        raise ValidationError("Request body must be a JSON object")
     
-    if 'resume_url' in body and body['resume_url']:
-        if not (body['resume_url'].startswith('http://') or body['resume_url'].startswith('https://')):
-            errors.append("Resume URL must be a valid HTTP/HTTPS URL")
+    errors = []
+    values = {}
+    
+    for field in CANDIDATE_FIELDS:
+        value = body.get(field)
+        if not value:
+            if field in REQUIRED_CANDIDATE_FIELDS:
+                errors.append(f"Field '{field}' is required")
+            continue
+        
+        if not isinstance(value, str):
+            errors.append(f"Field '{field}' must be a string")
+        elif field == 'email':
+            if not EMAIL_PATTERN.match(value):
+                errors.append("Invalid email format")
+        elif field == 'phone':
+            if not PHONE_PATTERN.match(value.translate(PHONE_SEPARATORS)):
+                errors.append("Invalid phone format")
+        elif field == 'resume_url':
+            if not value.startswith(('http://', 'https://')):
+                errors.append("Resume URL must be a valid HTTP/HTTPS URL")
+        values[field] = value
     
     if errors:
         raise ValidationError(f"Validation failed: {'; '.join(errors)}")
     
-    return Candidate(**body)
+    email = _fast_email(values['email'])
+    if email is not None:
+        values['email'] = email
+        return Candidate.model_construct(**values)
+    
+    try:
+        return Candidate.model_validate(values)
+    except PydanticValidationError as e:
+        details = '; '.join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+        raise ValidationError(f"Validation failed: {details}")
 
 def validate_query_parameters(event: Dict[str, Any]) -> Dict[str, Any]:
     params = event.get('queryStringParameters') or {}
@@ -97,9 +193,44 @@ def validate_job_status_parameter(event: Dict[str, Any]) -> Optional[str]:
     status = params.get('status')
     
     if status:
-        valid_statuses = ['OPEN', 'CLOSED', 'DRAFT']
-        if status.upper() not in valid_statuses:
-            raise ValidationError(f"status must be one of: {', '.join(valid_statuses)}")
-        return status.upper()
+        status = status.upper()
+        if status not in VALID_JOB_STATUSES:
+            raise ValidationError(f"status must be one of: {', '.join(VALID_JOB_STATUSES)}")
+        return status
     
     return None
+
+def validate_fields_parameter(event: Dict[str, Any], allowed: Tuple[str, ...]) -> Tuple[str, ...]:
+    params = event.get('queryStringParameters') or {}
+    raw = (params.get('fields') or '').strip()
+    
+    if not raw:
+        return allowed
+    
+    fields = tuple(dict.fromkeys(field.strip() for field in raw.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValidationError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    
+    return fields
+
+def validate_layout_parameter(event: Dict[str, Any]) -> str:
+    params = event.get('queryStringParameters') or {}
+    layout = (params.get('layout') or 'rows').lower()
+    
+    if layout not in RESPONSE_LAYOUTS:
+        raise ValidationError(f"layout must be one of: {', '.join(RESPONSE_LAYOUTS)}")
+    
+    return layout
+
+def validate_include_total_parameter(event: Dict[str, Any]) -> bool:
+    params = event.get('queryStringParameters') or {}
+    include_total = (params.get('include_total') or '').strip().lower()
+    
+    # total has always been filled in; include_total=0 opts out of the extra upstream call
+    if not include_total or include_total in TRUE_VALUES:
+        return True
+    if include_total in FALSE_VALUES:
+        return False
+    
+    raise ValidationError("include_total must be 1 or 0")
@@ -1,5 +1,11 @@
 import json
+import time
+import uuid
+import random
 import boto3
+import inventory
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
 from decimal import Decimal
 from datetime import datetime
 
@@ -8,6 +14,20 @@ dynamodb = boto3.resource('dynamodb')
 cart_table = dynamodb.Table('ecommerce-cart')
 products_table = dynamodb.Table('ecommerce-products')
 
+# BatchGetItem accepts at most 100 keys per request, BatchWriteItem 25 writes
+PRODUCT_BATCH_SIZE = 100
+WRITE_BATCH_SIZE = 25
+CLEAR_CART_CONCURRENCY = 4
+MAX_BATCH_RETRIES = 5
+# Holds must outlive checkout by this many seconds to be committed rather than replaced
+CHECKOUT_HOLD_MARGIN = 60
+# Cart item that marks a checkout in progress; product IDs are UUIDs, so it cannot clash with a line
+CHECKOUT_MARKER = '#checkout'
+# Longer than the Lambda timeout, so a crashed checkout does not lock the cart for long
+CHECKOUT_LEASE_SECONDS = 60
+BACKOFF_BASE = 0.05
+BACKOFF_CAP = 1.0
+
 def lambda_handler(event, context):
     """Main Lambda handler for cart API"""
     
@@ -21,8 +41,11 @@ def lambda_handler(event, context):
             return get_cart(user_id)
             
         elif http_method == 'POST':
-            # Add item to cart
             user_id = event['pathParameters']['user_id']
+            if path.endswith('/checkout'):
+                # Commit held stock and empty the cart
+                return checkout(user_id)
+            # Add item to cart
             return add_to_cart(user_id, json.loads(event['body']))
             
         elif http_method == 'PUT':
@@ -54,18 +77,17 @@ def get_cart(user_id):
             ExpressionAttributeValues={':user_id': user_id}
         )
         
-        cart_items = response['Items']
+        cart_items = [item for item in response['Items'] if item['product_id'] != CHECKOUT_MARKER]
         total_amount = Decimal('0')
         detailed_items = []
         
-        # Get product details for each cart item
+        # Get product details for all cart items in batched round trips
+        products = batch_get_products([item['product_id'] for item in cart_items])
+        
         for item in cart_items:
-            product_response = products_table.get_item(
-                Key={'product_id': item['product_id']}
-            )
+            product = products.get(item['product_id'])
             
-            if 'Item' in product_response:
-                product = product_response['Item']
+            if product:
                 item_total = product['price'] * item['quantity']
                 total_amount += item_total
                 
@@ -86,74 +108,58 @@ def get_cart(user_id):
                 'items': detailed_items,
                 'total_amount': float(total_amount),
                 'item_count': len(detailed_items)
-            })
+            }, default=decimal_default)
         }
     except Exception as e:
         return error_response(str(e))
 
+def batch_get_products(product_ids):
+    """Fetch the fields a cart line needs for each product, keyed by product_id"""
+    product_ids = list(dict.fromkeys(product_ids))
+    products = {}
+    
+    for start in range(0, len(product_ids), PRODUCT_BATCH_SIZE):
+        request = {
+            products_table.name: {
+                'Keys': [{'product_id': product_id} for product_id in product_ids[start:start + PRODUCT_BATCH_SIZE]],
+                # name is a DynamoDB reserved word
+                'ProjectionExpression': 'product_id, #name, price, image_url',
+                'ExpressionAttributeNames': {'#name': 'name'}
+            }
+        }
+        
+        attempt = 0
+        while request:
+            response = dynamodb.batch_get_item(RequestItems=request)
+            
+            for product in response['Responses'].get(products_table.name, []):
+                products[product['product_id']] = product
+            
+            request = response.get('UnprocessedKeys')
+            if request:
+                # Throttled keys come back unprocessed; retry them with jittered backoff
+                attempt += 1
+                if attempt > MAX_BATCH_RETRIES:
+                    raise RuntimeError('Product lookup throttled, please retry')
+                backoff(attempt)
+    
+    return products
+
+def backoff(attempt):
+    """Sleep a jittered, capped exponential delay before retrying unprocessed batch items"""
+    time.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+
 def add_to_cart(user_id, item_data):
     """Add item to cart or update quantity if exists"""
     try:
         product_id = item_data['product_id']
-        quantity = item_data.get('quantity', 1)
+        quantity = parse_quantity(item_data.get('quantity', 1))
+        if quantity is None:
+            return bad_request('quantity must be a positive integer')
         
-        # Check if product exists
-        product_response = products_table.get_item(
-            Key={'product_id': product_id}
-        )
-        
-        if 'Item' not in product_response:
-            return {
-                'statusCode': 404,
-                'headers': cors_headers(),
-                'body': json.dumps({'error': 'Product not found'})
-            }
-        
-        product = product_response['Item']
-        
-        # Check stock availability
-        if product['stock'] < quantity:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers(),
-                'body': json.dumps({'error': 'Insufficient stock'})
-            }
-        
-        # Check if item already in cart
-        cart_response = cart_table.get_item(
-            Key={'user_id': user_id, 'product_id': product_id}
-        )
-        
-        if 'Item' in cart_response:
-            # Update existing item
-            new_quantity = cart_response['Item']['quantity'] + quantity
-            
-            if product['stock'] < new_quantity:
-                return {
-                    'statusCode': 400,
-                    'headers': cors_headers(),
-                    'body': json.dumps({'error': 'Insufficient stock'})
-                }
-            
-            cart_table.update_item(
-                Key={'user_id': user_id, 'product_id': product_id},
-                UpdateExpression='SET quantity = :quantity, updated_at = :updated_at',
-                ExpressionAttributeValues={
-                    ':quantity': new_quantity,
-                    ':updated_at': datetime.utcnow().isoformat()
-                }
-            )
-        else:
-            # Add new item
-            cart_table.put_item(
-                Item={
-                    'user_id': user_id,
-                    'product_id': product_id,
-                    'quantity': quantity,
-                    'added_at': datetime.utcnow().isoformat(),
-                    'updated_at': datetime.utcnow().isoformat()
-                }
-            )
+        error = add_held_units(user_id, product_id, quantity)
+        if error:
+            return error
         
         return {
             'statusCode': 200,
@@ -166,40 +172,41 @@ def add_to_cart(user_id, item_data):
 def update_cart_item(user_id, product_id, update_data):
     """Update cart item quantity"""
     try:
-        new_quantity = update_data['quantity']
+        # Zero removes the line; anything else must be a positive integer
+        new_quantity = parse_quantity(update_data.get('quantity'), allow_zero=True)
+        if new_quantity is None:
+            return bad_request('quantity must be a non-negative integer')
         
-        if new_quantity <= 0:
+        if new_quantity == 0:
             return remove_from_cart(user_id, product_id)
         
-        # Check product stock
-        product_response = products_table.get_item(
-            Key={'product_id': product_id}
-        )
-        
-        if 'Item' not in product_response:
-            return {
-                'statusCode': 404,
-                'headers': cors_headers(),
-                'body': json.dumps({'error': 'Product not found'})
-            }
-        
-        product = product_response['Item']
-        
-        if product['stock'] < new_quantity:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers(),
-                'body': json.dumps({'error': 'Insufficient stock'})
-            }
-        
-        cart_table.update_item(
+        line = cart_table.get_item(
             Key={'user_id': user_id, 'product_id': product_id},
-            UpdateExpression='SET quantity = :quantity, updated_at = :updated_at',
-            ExpressionAttributeValues={
+            ConsistentRead=True
+        ).get('Item', {})
+        change = new_quantity - int(line.get('quantity', 0))
+        
+        if change > 0:
+            error = add_held_units(user_id, product_id, change)
+            if error:
+                return error
+        elif change < 0:
+            drained = release_line_units(line.get('reservations', set()), -change)
+            
+            update_expression = 'SET quantity = :quantity, updated_at = :updated_at'
+            expression_values = {
                 ':quantity': new_quantity,
                 ':updated_at': datetime.utcnow().isoformat()
             }
-        )
+            if drained:
+                update_expression += ' DELETE reservations :drained'
+                expression_values[':drained'] = drained
+            
+            cart_table.update_item(
+                Key={'user_id': user_id, 'product_id': product_id},
+                UpdateExpression=update_expression,
+                ExpressionAttributeValues=expression_values
+            )
         
         return {
             'statusCode': 200,
@@ -209,13 +216,74 @@ def update_cart_item(user_id, product_id, update_data):
     except Exception as e:
         return error_response(str(e))
 
+def parse_quantity(value, allow_zero=False):
+    """A cart quantity from a request body, or None if it is not a whole number in range"""
+    # JSON true/false decode to bool, which is an int subclass
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+    if value < 0 or (value == 0 and not allow_zero):
+        return None
+    return value
+
+def add_held_units(user_id, product_id, quantity):
+    """Reserve `quantity` units and add them to the cart line. Returns an error response, or None"""
+    reservation_id = str(uuid.uuid4())
+    now = datetime.utcnow().isoformat()
+    # The line keeps the IDs of the reservations holding its units. Written in the
+    # reservation's transaction, so stock is never held for a line that lacks it
+    line_update = cart_line_update(
+        user_id, product_id, reservation_id,
+        'ADD quantity :quantity, reservations :reservation '
+        'SET updated_at = :now, added_at = if_not_exists(added_at, :now)',
+        {':quantity': quantity, ':now': now}
+    )
+    
+    try:
+        inventory.reserve(product_id, quantity, owner=user_id,
+                          reservation_id=reservation_id, extra_items=[line_update])
+    except inventory.UnknownProduct:
+        return not_found_response()
+    except inventory.InsufficientStock:
+        return insufficient_stock_response()
+    except inventory.ReservationConflict:
+        return conflict_response()
+    
+    return None
+
+def cart_line_update(user_id, product_id, reservation_id, update_expression, expression_values=None):
+    """Transaction item applying an update that records `reservation_id` on a cart line"""
+    return {'Update': {
+        'TableName': cart_table.name,
+        'Key': {'user_id': user_id, 'product_id': product_id},
+        'UpdateExpression': update_expression,
+        'ExpressionAttributeValues': {':reservation': {reservation_id}, **(expression_values or {})}
+    }}
+
+def release_line_units(reservation_ids, units):
+    """Release `units` from a line's reservations. Returns the IDs no longer holding anything"""
+    drained = set()
+    
+    for reservation_id in reservation_ids:
+        if units <= 0:
+            break
+        released, remaining = inventory.release(reservation_id, units)
+        units -= released
+        if remaining == 0:
+            drained.add(reservation_id)
+    
+    return drained
+
 def remove_from_cart(user_id, product_id):
     """Remove item from cart"""
     try:
-        cart_table.delete_item(
-            Key={'user_id': user_id, 'product_id': product_id}
+        response = cart_table.delete_item(
+            Key={'user_id': user_id, 'product_id': product_id},
+            ReturnValues='ALL_OLD'
         )
         
+        for reservation_id in response.get('Attributes', {}).get('reservations', set()):
+            inventory.release(reservation_id)
+        
         return {
             'statusCode': 200,
             'headers': cors_headers(),
@@ -227,26 +295,202 @@ def remove_from_cart(user_id, product_id):
 def clear_cart(user_id):
     """Clear entire cart for user"""
     try:
-        # Get all cart items for user
-        response = cart_table.query(
-            KeyConditionExpression='user_id = :user_id',
-            ExpressionAttributeValues={':user_id': user_id}
-        )
-        
-        # Delete each item
-        for item in response['Items']:
-            cart_table.delete_item(
-                Key={'user_id': user_id, 'product_id': item['product_id']}
-            )
+        deleted = delete_cart_lines(user_id, iter_cart_lines(user_id), release_holds=True)
         
         return {
             'statusCode': 200,
             'headers': cors_headers(),
-            'body': json.dumps({'message': 'Cart cleared successfully'})
+            'body': json.dumps({'message': 'Cart cleared successfully', 'items_removed': deleted})
         }
     except Exception as e:
         return error_response(str(e))
 
+def checkout(user_id):
+    """Commit the stock held for every cart line, then empty the cart"""
+    try:
+        lease = claim_checkout(user_id)
+        if lease is None:
+            return conflict_response('Checkout is already in progress for this cart')
+        try:
+            return checkout_lines(user_id)
+        finally:
+            release_checkout(user_id, lease)
+    except Exception as e:
+        return error_response(str(e))
+
+def checkout_lines(user_id):
+    """Checkout under the cart's checkout marker"""
+    lines = list(iter_cart_lines(user_id))
+    if not lines:
+        return {
+            'statusCode': 400,
+            'headers': cors_headers(),
+            'body': json.dumps({'error': 'Cart is empty'})
+        }
+    
+    held, committed, expiring = inventory.reservation_quantities(
+        [reservation_id for line in lines for reservation_id in line.get('reservations', set())],
+        valid_for=CHECKOUT_HOLD_MARGIN
+    )
+    
+    # Make every line's holds match its quantity before anything is committed
+    commits = {}
+    sold = {}
+    topped_up = []
+    unavailable = []
+    for line in lines:
+        product_id = line['product_id']
+        line_reservations = line.get('reservations', set())
+        # Holds an interrupted earlier checkout already committed count towards the line,
+        # so retrying it never sells the same units twice
+        sold[product_id] = sum(committed.get(rid, 0) for rid in line_reservations)
+        # Holds too close to expiry are replaced below; hand their units back first so
+        # the replacement can take them and they are not stranded until reclaimed
+        for reservation_id in line_reservations:
+            if reservation_id in expiring:
+                inventory.release(reservation_id)
+        reservation_ids = [rid for rid in line_reservations if rid in held]
+        shortfall = int(line['quantity']) - sold[product_id] - sum(held[rid] for rid in reservation_ids)
+        
+        if shortfall > 0:
+            # Holds expired or were reclaimed since the item was added.
+            # Recorded on the line in the same transaction, so a retry counts it as sold
+            reservation_id = str(uuid.uuid4())
+            try:
+                inventory.reserve(
+                    product_id, shortfall, owner=user_id, reservation_id=reservation_id,
+                    extra_items=[cart_line_update(user_id, product_id, reservation_id, 'ADD reservations :reservation')]
+                )
+            except (inventory.UnknownProduct, inventory.InsufficientStock, inventory.ReservationConflict):
+                unavailable.append(product_id)
+                continue
+            reservation_ids.append(reservation_id)
+            topped_up.append(reservation_id)
+        elif shortfall < 0:
+            drained = release_line_units(reservation_ids, -shortfall)
+            reservation_ids = [rid for rid in reservation_ids if rid not in drained]
+        
+        commits[product_id] = reservation_ids
+    
+    if unavailable:
+        for reservation_id in topped_up:
+            inventory.release(reservation_id)
+        return {
+            'statusCode': 409,
+            'headers': cors_headers(),
+            'body': json.dumps({'error': 'Some items are no longer available', 'unavailable': unavailable})
+        }
+    
+    items = [
+        {'product_id': product_id, 'quantity': sold[product_id] + sum(inventory.commit(rid) for rid in reservation_ids)}
+        for product_id, reservation_ids in commits.items()
+    ]
+    delete_cart_lines(user_id, lines, release_holds=False)
+    
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({'message': 'Checkout complete', 'items': items})
+    }
+
+def claim_checkout(user_id):
+    """Put the cart's checkout marker. Returns its lease token, or None if another checkout holds it"""
+    now = int(time.time())
+    lease = str(uuid.uuid4())
+    try:
+        cart_table.put_item(
+            Item={'user_id': user_id, 'product_id': CHECKOUT_MARKER, 'lease': lease,
+                  'lease_expires_at': now + CHECKOUT_LEASE_SECONDS},
+            # A marker left by a checkout that crashed stops blocking once its lease runs out
+            ConditionExpression='attribute_not_exists(product_id) OR lease_expires_at < :now',
+            ExpressionAttributeValues={':now': now}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return None
+    return lease
+
+def release_checkout(user_id, lease):
+    """Delete the checkout marker, unless it expired and another checkout took it over"""
+    try:
+        cart_table.delete_item(
+            Key={'user_id': user_id, 'product_id': CHECKOUT_MARKER},
+            ConditionExpression='lease = :lease',
+            ExpressionAttributeValues={':lease': lease}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+def delete_cart_lines(user_id, lines, release_holds):
+    """Delete cart lines in parallel 25-item batches, optionally releasing their reservations"""
+    deleted = 0
+    
+    # Delete batches while later pages of keys are still being read
+    with ThreadPoolExecutor(max_workers=CLEAR_CART_CONCURRENCY) as executor:
+        futures = []
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) == WRITE_BATCH_SIZE:
+                futures.append(executor.submit(delete_cart_batch, user_id, batch, release_holds))
+                batch = []
+        if batch:
+            futures.append(executor.submit(delete_cart_batch, user_id, batch, release_holds))
+        
+        for future in futures:
+            deleted += future.result()
+    
+    return deleted
+
+def iter_cart_lines(user_id):
+    """Yield every line in the user's cart without its timestamps, following query pagination"""
+    request = {
+        'KeyConditionExpression': 'user_id = :user_id',
+        'ExpressionAttributeValues': {':user_id': user_id},
+        # Only what deleting, releasing and committing need; smaller pages mean fewer read units
+        'ProjectionExpression': 'product_id, quantity, reservations'
+    }
+    
+    while True:
+        response = cart_table.query(**request)
+        for item in response['Items']:
+            if item['product_id'] != CHECKOUT_MARKER:
+                yield item
+        
+        if 'LastEvaluatedKey' not in response:
+            return
+        request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def delete_cart_batch(user_id, lines, release_holds):
+    """Delete up to 25 cart lines with one BatchWriteItem, retrying unprocessed deletes"""
+    # The resource's client is thread-safe, unlike the resource objects, and still takes plain values
+    client = dynamodb.meta.client
+    request = {
+        cart_table.name: [
+            {'DeleteRequest': {'Key': {'user_id': user_id, 'product_id': line['product_id']}}}
+            for line in lines
+        ]
+    }
+    
+    attempt = 0
+    while request:
+        response = client.batch_write_item(RequestItems=request)
+        request = response.get('UnprocessedItems')
+        if request:
+            attempt += 1
+            if attempt > MAX_BATCH_RETRIES:
+                raise RuntimeError('Cart clear throttled, please retry')
+            backoff(attempt)
+    
+    if release_holds:
+        for line in lines:
+            for reservation_id in line.get('reservations', set()):
+                inventory.release(reservation_id)
+    
+    return len(lines)
+
 def cors_headers():
     """CORS headers for API responses"""
     return {
@@ -255,6 +499,44 @@ def cors_headers():
         'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
     }
 
+def not_found_response():
+    """Product not found response"""
+    return {
+        'statusCode': 404,
+        'headers': cors_headers(),
+        'body': json.dumps({'error': 'Product not found'})
+    }
+
+def bad_request(message):
+    """Client error response"""
+    return {
+        'statusCode': 400,
+        'headers': cors_headers(),
+        'body': json.dumps({'error': message})
+    }
+
+def insufficient_stock_response():
+    """Stock check failed response"""
+    return {
+        'statusCode': 400,
+        'headers': cors_headers(),
+        'body': json.dumps({'error': 'Insufficient stock'})
+    }
+
+def conflict_response(message='Cart was updated concurrently, please retry'):
+    """Cart kept changing under concurrent requests"""
+    return {
+        'statusCode': 409,
+        'headers': cors_headers(),
+        'body': json.dumps({'error': message})
+    }
+
+def decimal_default(value):
+    """json.dumps fallback for the Decimal numbers DynamoDB returns"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
 def error_response(message):
     """Standard error response"""
     return {
@@ -0,0 +1,498 @@
+"""
+Sharded stock counters with time-boxed reservations.
+
+A product's available units are spread over INVENTORY_SHARDS items keyed
+"<product_id>#<n>", so concurrent reservations for one hot product update
+different partition keys instead of all contending for a single item.
+
+After init_stock() creates them, stock changes reach the shards only as
+deltas (adjust_stock, set_available), so they never overwrite a concurrent
+reservation's decrement. reserve() moves units from one or more shards into a HELD
+reservation. commit() marks it sold and release() hands the units back. Holds that are
+not committed within RESERVATION_TTL_SECONDS are reclaimed by
+release_expired(), which reserve() runs when a product looks sold out.
+DynamoDB TTL deletes old reservation records afterwards.
+
+Packaged into both the products and the cart Lambda.
+"""
+
+import os
+import time
+import uuid
+import random
+from datetime import datetime
+import boto3
+from botocore.exceptions import ClientError
+
+# The resource's client takes and returns plain Python values and is thread-safe
+dynamodb = boto3.resource('dynamodb')
+client = dynamodb.meta.client
+
+INVENTORY_TABLE = 'ecommerce-inventory'
+RESERVATIONS_TABLE = 'ecommerce-reservations'
+PRODUCTS_TABLE = 'ecommerce-products'
+HOLDS_INDEX = 'ProductHoldsIndex'
+
+# At most 98, so seeding every shard fits in one transaction and so does a reservation
+# split over every shard, with its record and the cart line that records it
+SHARD_COUNT = int(os.environ.get('INVENTORY_SHARDS', '10'))
+RESERVATION_TTL = int(os.environ.get('RESERVATION_TTL_SECONDS', '900'))
+# Committed and released reservations are kept this long before TTL deletes them
+RESERVATION_RETENTION = 7 * 24 * 3600
+# Single-shard attempts before reading every shard and splitting the reservation
+SINGLE_SHARD_PROBES = 2
+MAX_RESERVE_ATTEMPTS = 4
+RECLAIM_BATCH = 25
+
+HELD = 'HELD'
+COMMITTED = 'COMMITTED'
+RELEASED = 'RELEASED'
+
+
+class UnknownProduct(Exception):
+    """The product does not exist."""
+
+
+class InsufficientStock(Exception):
+    """Fewer units are available than were asked for."""
+
+
+class ReservationConflict(Exception):
+    """Concurrent reservations kept taking the units this one wanted; retry."""
+
+
+def shard_key(product_id, shard):
+    return f'{product_id}#{shard}'
+
+
+def init_stock(product_id, quantity):
+    """
+    Create a new product's shards with `quantity` units split evenly over them.
+    Returns False, changing nothing, if the product already has shards: stock
+    changes after that go through adjust_stock() so they never overwrite the
+    decrements of reservations running at the same time.
+    """
+    base, extra = divmod(int(quantity), SHARD_COUNT)
+    try:
+        # Conditional, so two first reservations cannot both seed and double the stock,
+        # and a retried create cannot reset counters that reservations already drew on
+        client.transact_write_items(TransactItems=[
+            {'Put': {
+                'TableName': INVENTORY_TABLE,
+                'Item': {
+                    'shard_id': shard_key(product_id, shard),
+                    'product_id': product_id,
+                    'available': base + (1 if shard < extra else 0)
+                },
+                'ConditionExpression': 'attribute_not_exists(shard_id)'
+            }}
+            for shard in range(SHARD_COUNT)
+        ])
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'TransactionCanceledException':
+            raise
+        return False
+    return True
+
+
+def ensure_stock(product_id):
+    """Create the shards from the product's stock attribute unless they exist. False if the product does not exist."""
+    return bool(read_shards(product_id)) or _seed_from_product(product_id)
+
+
+def adjust_stock(product_id, delta):
+    """
+    Add `delta` units to those available to reserve, or take them away if it
+    is negative. Units held by reservations are not touched. Raises
+    InsufficientStock if fewer than -delta units are available, and
+    ReservationConflict if concurrent reservations kept taking them.
+    """
+    delta = int(delta)
+    if delta > 0:
+        # ADD never overwrites a concurrent reservation's decrement
+        base, extra = divmod(delta, SHARD_COUNT)
+        additions = {shard: base + (1 if shard < extra else 0) for shard in range(SHARD_COUNT)}
+        client.transact_write_items(TransactItems=[
+            {'Update': {
+                'TableName': INVENTORY_TABLE,
+                'Key': {'shard_id': shard_key(product_id, shard)},
+                'UpdateExpression': 'ADD available :units SET product_id = :product_id',
+                'ExpressionAttributeValues': {':units': units, ':product_id': product_id}
+            }}
+            for shard, units in additions.items() if units
+        ])
+    elif delta < 0:
+        _remove_units(product_id, -delta)
+
+
+def set_available(product_id, quantity):
+    """
+    Make `quantity` units available to reserve, on top of the units already
+    held. Applied as the difference from the level just read, so a
+    reservation running at the same time keeps its decrement, as if it came
+    right after this call. Raises ReservationConflict if reservations kept
+    taking the units being removed.
+    """
+    quantity = int(quantity)
+    for attempt in range(MAX_RESERVE_ATTEMPTS):
+        shards = read_shards(product_id)
+        if not shards:
+            if init_stock(product_id, quantity):
+                return
+            # Seeded concurrently; adjust the shards it created
+            continue
+        try:
+            adjust_stock(product_id, quantity - sum(shards.values()))
+        except (InsufficientStock, ReservationConflict):
+            # Units were reserved between the read and the removal; read again
+            time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+            continue
+        return
+
+    raise ReservationConflict(product_id)
+
+
+def withdraw_stock(product_id):
+    """Take away every unit available to reserve, leaving held units to be committed or released. Returns the units removed."""
+    return _remove_units(product_id, None)
+
+
+def get_stock(product_id):
+    """Units available to reserve, or None if the product has no inventory yet."""
+    return get_stocks([product_id])[product_id]
+
+
+def get_stocks(product_ids, consistent=True):
+    """Units available to reserve per product, None for products with no inventory yet."""
+    stocks = dict.fromkeys(product_ids)
+    for product_id, shards in _read_shards(stocks, consistent).items():
+        stocks[product_id] = sum(shards.values())
+    return stocks
+
+
+def read_shards(product_id):
+    """Available units per shard number, for the shards that exist."""
+    return _read_shards([product_id]).get(product_id, {})
+
+
+def _read_shards(product_ids, consistent=True):
+    """Available units per shard number per product, leaving out products without shards."""
+    keys = [{'shard_id': shard_key(product_id, shard)} for product_id in product_ids for shard in range(SHARD_COUNT)]
+    products = {}
+
+    # BatchGetItem takes at most 100 keys
+    for start in range(0, len(keys), 100):
+        request = {INVENTORY_TABLE: {
+            'Keys': keys[start:start + 100],
+            'ProjectionExpression': 'shard_id, available',
+            'ConsistentRead': consistent
+        }}
+        attempt = 0
+        while request:
+            response = client.batch_get_item(RequestItems=request)
+            for item in response['Responses'].get(INVENTORY_TABLE, []):
+                product_id, shard = item['shard_id'].rsplit('#', 1)
+                products.setdefault(product_id, {})[int(shard)] = int(item['available'])
+
+            request = response.get('UnprocessedKeys')
+            if request:
+                attempt += 1
+                if attempt > MAX_RESERVE_ATTEMPTS:
+                    raise ReservationConflict('Inventory lookup throttled')
+                time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+
+    return products
+
+
+def reserve(product_id, quantity, owner, ttl=None, reservation_id=None, extra_items=()):
+    """
+    Hold `quantity` units of a product for `owner` and return the reservation.
+
+    Tries a couple of random shards that might cover the whole quantity first,
+    which is one write for a hot product with plenty of stock. Otherwise reads
+    every shard and takes the units from several of them in one transaction.
+    `extra_items` are written in that same transaction, so a record of the
+    reservation made under a caller-chosen `reservation_id` exists exactly
+    when the reservation does.
+    Raises ValueError unless `quantity` is a positive int, and UnknownProduct,
+    InsufficientStock or ReservationConflict.
+    """
+    reservation_id = reservation_id or str(uuid.uuid4())
+
+    # `available >= :units` would let a negative quantity through and add stock
+    if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity <= 0:
+        raise ValueError(f'Reservation quantity must be a positive integer, got {quantity!r}')
+
+    for attempt in range(MAX_RESERVE_ATTEMPTS):
+        for shard in random.sample(range(SHARD_COUNT), min(SINGLE_SHARD_PROBES, SHARD_COUNT)):
+            reservation = _take(product_id, quantity, owner, {shard: quantity}, ttl, reservation_id, extra_items)
+            if reservation:
+                return reservation
+
+        shards = read_shards(product_id)
+        if not shards:
+            if not _seed_from_product(product_id):
+                raise UnknownProduct(product_id)
+            continue
+
+        if sum(shards.values()) < quantity:
+            # Expired holds may still be sitting on the units
+            if release_expired(product_id) == 0:
+                raise InsufficientStock(product_id)
+            continue
+
+        reservation = _take(product_id, quantity, owner, _allocate(shards, quantity), ttl, reservation_id, extra_items)
+        if reservation:
+            return reservation
+
+        time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+
+    raise ReservationConflict(product_id)
+
+
+def commit(reservation_id):
+    """Mark a held reservation as sold. Returns its quantity, or 0 if it expired or is no longer held."""
+    try:
+        response = client.update_item(
+            TableName=RESERVATIONS_TABLE,
+            Key={'reservation_id': reservation_id},
+            UpdateExpression='SET #status = :committed, committed_at = :now REMOVE hold_expires_at',
+            ConditionExpression='#status = :held AND hold_expires_at > :epoch',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={
+                ':committed': COMMITTED,
+                ':held': HELD,
+                ':now': datetime.utcnow().isoformat(),
+                ':epoch': int(time.time())
+            },
+            ReturnValues='ALL_NEW'
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return 0
+
+    return int(response['Attributes']['quantity'])
+
+
+def release(reservation_id, quantity=None):
+    """
+    Return a held reservation's units to their shards, or only `quantity` of
+    them. Returns (units released, units still held); (0, 0) if the
+    reservation was no longer held.
+    """
+    item = client.get_item(
+        TableName=RESERVATIONS_TABLE,
+        Key={'reservation_id': reservation_id},
+        ConsistentRead=True
+    ).get('Item')
+    if not item or item['status'] != HELD:
+        return 0, 0
+
+    held = int(item['quantity'])
+    allocations = {shard: int(units) for shard, units in item['allocations'].items()}
+    to_release = held if quantity is None else min(int(quantity), held)
+
+    returned = {}
+    for shard, units in allocations.items():
+        take = min(units, to_release - sum(returned.values()))
+        if take > 0:
+            returned[shard] = take
+            allocations[shard] = units - take
+
+    remaining = held - to_release
+    if remaining:
+        reservation_update = {
+            'UpdateExpression': 'SET quantity = :remaining, allocations = :allocations',
+            'ConditionExpression': '#status = :held AND quantity = :quantity',
+            'ExpressionAttributeValues': {
+                ':remaining': remaining,
+                ':allocations': {shard: units for shard, units in allocations.items() if units},
+                ':held': HELD,
+                ':quantity': held
+            }
+        }
+    else:
+        reservation_update = {
+            'UpdateExpression': 'SET #status = :released, released_at = :now REMOVE hold_expires_at',
+            'ConditionExpression': '#status = :held',
+            'ExpressionAttributeValues': {
+                ':released': RELEASED,
+                ':held': HELD,
+                ':now': datetime.utcnow().isoformat()
+            }
+        }
+    reservation_update.update({
+        'TableName': RESERVATIONS_TABLE,
+        'Key': {'reservation_id': reservation_id},
+        'ExpressionAttributeNames': {'#status': 'status'}
+    })
+
+    items = [{'Update': reservation_update}]
+    for shard, units in returned.items():
+        items.append({'Update': {
+            'TableName': INVENTORY_TABLE,
+            'Key': {'shard_id': shard_key(item['product_id'], shard)},
+            'UpdateExpression': 'ADD available :units',
+            'ExpressionAttributeValues': {':units': units}
+        }})
+
+    try:
+        client.transact_write_items(TransactItems=items)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'TransactionCanceledException':
+            raise
+        # Committed, released or resized by someone else in the meantime
+        return 0, 0
+
+    return to_release, remaining
+
+
+def reservation_quantities(reservation_ids, valid_for=0):
+    """
+    Quantity per reservation, as three dicts: those still held for at least
+    `valid_for` seconds, those already committed, and those held but expiring
+    sooner (or already expired and not yet reclaimed).
+    """
+    reservation_ids = list(dict.fromkeys(reservation_ids))
+    deadline = int(time.time()) + valid_for
+    held = {}
+    committed = {}
+    expiring = {}
+
+    for start in range(0, len(reservation_ids), 100):
+        request = {RESERVATIONS_TABLE: {
+            'Keys': [{'reservation_id': rid} for rid in reservation_ids[start:start + 100]],
+            'ConsistentRead': True
+        }}
+        attempt = 0
+        while request:
+            response = client.batch_get_item(RequestItems=request)
+            for item in response['Responses'].get(RESERVATIONS_TABLE, []):
+                if item['status'] == HELD and item['hold_expires_at'] > deadline:
+                    held[item['reservation_id']] = int(item['quantity'])
+                elif item['status'] == HELD:
+                    expiring[item['reservation_id']] = int(item['quantity'])
+                elif item['status'] == COMMITTED:
+                    committed[item['reservation_id']] = int(item['quantity'])
+
+            request = response.get('UnprocessedKeys')
+            if request:
+                attempt += 1
+                if attempt > MAX_RESERVE_ATTEMPTS:
+                    raise ReservationConflict('Reservation lookup throttled')
+                time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+
+    return held, committed, expiring
+
+
+def release_expired(product_id, limit=RECLAIM_BATCH):
+    """Release up to `limit` of a product's expired holds. Returns the units reclaimed."""
+    response = client.query(
+        TableName=RESERVATIONS_TABLE,
+        IndexName=HOLDS_INDEX,
+        KeyConditionExpression='product_id = :product_id AND hold_expires_at < :now',
+        ExpressionAttributeValues={':product_id': product_id, ':now': int(time.time())},
+        Limit=limit
+    )
+
+    return sum(release(item['reservation_id'])[0] for item in response['Items'])
+
+
+def _allocate(shards, quantity):
+    # Random order spreads concurrent split reservations over different shards
+    order = list(shards)
+    random.shuffle(order)
+
+    allocations = {}
+    for shard in order:
+        take = min(shards[shard], quantity - sum(allocations.values()))
+        if take > 0:
+            allocations[shard] = take
+    return allocations
+
+
+def _take(product_id, quantity, owner, allocations, ttl, reservation_id, extra_items):
+    """Move units from the given shards into a new reservation, or None if a shard ran short."""
+    now = int(time.time())
+    reservation = {
+        'reservation_id': reservation_id,
+        'product_id': product_id,
+        'owner': owner,
+        'quantity': quantity,
+        'allocations': {str(shard): units for shard, units in allocations.items()},
+        'status': HELD,
+        # Only held reservations have hold_expires_at, so only they are in HOLDS_INDEX
+        'hold_expires_at': now + (ttl or RESERVATION_TTL),
+        'purge_at': now + (ttl or RESERVATION_TTL) + RESERVATION_RETENTION,
+        'created_at': datetime.utcnow().isoformat()
+    }
+
+    items = _shard_decrements(product_id, allocations)
+    items.append({'Put': {'TableName': RESERVATIONS_TABLE, 'Item': reservation}})
+    items.extend(extra_items)
+
+    try:
+        client.transact_write_items(TransactItems=items)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'TransactionCanceledException':
+            raise
+        return None
+
+    return reservation
+
+
+def _shard_decrements(product_id, allocations):
+    """Transaction items taking units from shards, each cancelling the transaction if its shard ran short."""
+    return [
+        {'Update': {
+            'TableName': INVENTORY_TABLE,
+            'Key': {'shard_id': shard_key(product_id, shard)},
+            'UpdateExpression': 'SET available = available - :units',
+            'ConditionExpression': 'available >= :units',
+            'ExpressionAttributeValues': {':units': units}
+        }}
+        for shard, units in allocations.items()
+    ]
+
+
+def _remove_units(product_id, quantity):
+    """Take `quantity` available units off the shards, or all of them if None. Returns the units removed."""
+    for attempt in range(MAX_RESERVE_ATTEMPTS):
+        shards = {shard: units for shard, units in read_shards(product_id).items() if units > 0}
+        total = sum(shards.values())
+        if quantity is None:
+            allocations = shards
+        elif total < quantity:
+            raise InsufficientStock(product_id)
+        else:
+            allocations = _allocate(shards, quantity)
+
+        if not allocations:
+            return 0
+        try:
+            client.transact_write_items(TransactItems=_shard_decrements(product_id, allocations))
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TransactionCanceledException':
+                raise
+            # A reservation took units from one of the shards in the meantime
+            time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+            continue
+        return sum(allocations.values())
+
+    raise ReservationConflict(product_id)
+
+
+def _seed_from_product(product_id):
+    """Create the shards from the product's stock attribute. False if the product does not exist."""
+    product = client.get_item(
+        TableName=PRODUCTS_TABLE,
+        Key={'product_id': product_id},
+        ProjectionExpression='stock',
+        ConsistentRead=True
+    ).get('Item')
+    if product is None:
+        return False
+
+    init_stock(product_id, product.get('stock', 0))
+    return True
@@ -1,6 +1,9 @@
 import json
+import base64
 import boto3
 import uuid
+import inventory
+from botocore.exceptions import ClientError
 from decimal import Decimal
 from datetime import datetime
 
@@ -8,6 +11,10 @@ from datetime import datetime
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table('ecommerce-products')
 
+CATEGORY_INDEX = 'CategoryIndex'
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
 def lambda_handler(event, context):
     """Main Lambda handler for products API"""
     
@@ -21,8 +28,8 @@ def lambda_handler(event, context):
                 product_id = path.split('/')[-1]
                 return get_product(product_id)
             else:
-                # Get all products
-                return get_all_products()
+                # List products, one page at a time
+                return get_all_products(event.get('queryStringParameters') or {})
                 
         elif http_method == 'POST':
             return create_product(json.loads(event['body']))
@@ -42,28 +49,93 @@ def lambda_handler(event, context):
             'body': json.dumps({'error': str(e)})
         }
 
-def get_all_products():
-    """Get all products with pagination"""
+def get_all_products(query_params=None):
+    """Get one page of products, optionally filtered by category"""
     try:
-        response = table.scan()
+        query_params = query_params or {}
+        category = query_params.get('category')
+        
+        try:
+            limit = int(query_params.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return bad_request('limit must be an integer')
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return bad_request(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+        
+        request = {'Limit': limit}
+        if query_params.get('next_token'):
+            start_key = decode_page_token(query_params['next_token'], category)
+            if start_key is None:
+                return bad_request('Invalid next_token')
+            request['ExclusiveStartKey'] = start_key
+        
+        if category:
+            # Served from the category index, so only that category's items are read
+            response = table.query(
+                IndexName=CATEGORY_INDEX,
+                KeyConditionExpression='category = :category',
+                ExpressionAttributeValues={':category': category},
+                **request
+            )
+        else:
+            response = table.scan(**request)
+        
         products = response['Items']
         
+        # Stock comes from the inventory shards; one eventually consistent batch read for the page
+        stocks = inventory.get_stocks([product['product_id'] for product in products], consistent=False)
+        
         # Convert Decimal to float for JSON serialization
         for product in products:
             if 'price' in product:
                 product['price'] = float(product['price'])
+            with_available_stock(product, stocks[product['product_id']])
         
         return {
             'statusCode': 200,
             'headers': cors_headers(),
             'body': json.dumps({
                 'products': products,
-                'count': len(products)
-            })
+                'count': len(products),
+                'next_token': encode_page_token(response.get('LastEvaluatedKey'))
+            }, default=decimal_default)
         }
     except Exception as e:
         return error_response(str(e))
 
+def encode_page_token(last_evaluated_key):
+    """Opaque continuation token for a LastEvaluatedKey, None on the last page"""
+    if not last_evaluated_key:
+        return None
+    
+    raw = json.dumps(last_evaluated_key, default=decimal_default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_page_token(token, category=None):
+    """ExclusiveStartKey for a token, or None if it is malformed or from another listing"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        return None
+    
+    # A scan key holds only product_id; a category index key also holds the category
+    expected = {'product_id', 'category'} if category else {'product_id'}
+    if not isinstance(key, dict) or set(key) != expected:
+        return None
+    if category and key['category'] != category:
+        return None
+    if not all(isinstance(value, str) for value in key.values()):
+        return None
+    
+    return key
+
+def decimal_default(value):
+    """json.dumps fallback for the Decimal numbers DynamoDB returns"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
 def get_product(product_id):
     """Get single product by ID"""
     try:
@@ -79,11 +151,12 @@ def get_product(product_id):
         product = response['Item']
         if 'price' in product:
             product['price'] = float(product['price'])
+        with_available_stock(product, inventory.get_stock(product_id))
             
         return {
             'statusCode': 200,
             'headers': cors_headers(),
-            'body': json.dumps(product)
+            'body': json.dumps(product, default=decimal_default)
         }
     except Exception as e:
         return error_response(str(e))
@@ -91,6 +164,11 @@ def get_product(product_id):
 def create_product(product_data):
     """Create new product"""
     try:
+        # Checked before anything is written, so a bad value cannot leave a product without shards
+        stock = product_data.get('stock', 0)
+        if not is_stock_level(stock):
+            return bad_request('stock must be a non-negative integer')
+        
         product_id = str(uuid.uuid4())
         
         product = {
@@ -99,12 +177,15 @@ def create_product(product_data):
             'description': product_data.get('description', ''),
             'price': Decimal(str(product_data['price'])),
             'category': product_data.get('category', 'general'),
-            'stock': product_data.get('stock', 0),
+            'stock': stock,
             'image_url': product_data.get('image_url', ''),
             'created_at': datetime.utcnow().isoformat(),
             'updated_at': datetime.utcnow().isoformat()
         }
         
+        # Reservations draw on the sharded counters, not on the stock attribute.
+        # Shards first: if the product write fails, they belong to an ID nobody knows
+        inventory.init_stock(product_id, stock)
         table.put_item(Item=product)
         
         # Convert Decimal for response
@@ -113,7 +194,7 @@ def create_product(product_data):
         return {
             'statusCode': 201,
             'headers': cors_headers(),
-            'body': json.dumps(product)
+            'body': json.dumps(product, default=decimal_default)
         }
     except Exception as e:
         return error_response(str(e))
@@ -130,6 +211,14 @@ def update_product(product_id, update_data):
                 'body': json.dumps({'error': 'Product not found'})
             }
         
+        previous_stock = response['Item'].get('stock', 0)
+        new_stock = update_data.get('stock')
+        if 'stock' in update_data:
+            if not is_stock_level(new_stock):
+                return bad_request('stock must be a non-negative integer')
+            # Products from before the inventory table get their shards from the old stock level
+            inventory.ensure_stock(product_id)
+        
         # Update product
         update_expression = "SET updated_at = :updated_at"
         expression_values = {':updated_at': datetime.utcnow().isoformat()}
@@ -142,21 +231,50 @@ def update_product(product_id, update_data):
                 update_expression += f", {key} = :{key}"
                 expression_values[f':{key}'] = Decimal(str(value))
         
-        table.update_item(
-            Key={'product_id': product_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_values
-        )
+        update = {
+            'Key': {'product_id': product_id},
+            'UpdateExpression': update_expression,
+            'ExpressionAttributeValues': expression_values
+        }
+        if 'stock' in update_data:
+            # Two stock updates at once would each apply their difference to the shards
+            update['ConditionExpression'] = 'attribute_not_exists(stock) OR stock = :previous_stock'
+            expression_values[':previous_stock'] = previous_stock
+        
+        try:
+            table.update_item(**update)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return conflict_response('Stock was updated concurrently, please retry')
+        
+        if 'stock' in update_data:
+            try:
+                inventory.set_available(product_id, new_stock)
+            except inventory.ReservationConflict:
+                # Put the old level back unless another update has replaced ours
+                try:
+                    table.update_item(
+                        Key={'product_id': product_id},
+                        UpdateExpression='SET stock = :previous_stock',
+                        ConditionExpression='stock = :new_stock',
+                        ExpressionAttributeValues={':previous_stock': previous_stock, ':new_stock': new_stock}
+                    )
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+                return conflict_response('Stock is being reserved too quickly to update, please retry')
         
         # Get updated product
         updated_response = table.get_item(Key={'product_id': product_id})
         product = updated_response['Item']
         product['price'] = float(product['price'])
+        with_available_stock(product, inventory.get_stock(product_id))
         
         return {
             'statusCode': 200,
             'headers': cors_headers(),
-            'body': json.dumps(product)
+            'body': json.dumps(product, default=decimal_default)
         }
     except Exception as e:
         return error_response(str(e))
@@ -165,6 +283,8 @@ def delete_product(product_id):
     """Delete product"""
     try:
         table.delete_item(Key={'product_id': product_id})
+        # Nothing left to reserve; holds already taken still commit or release normally
+        inventory.withdraw_stock(product_id)
         
         return {
             'statusCode': 200,
@@ -174,6 +294,17 @@ def delete_product(product_id):
     except Exception as e:
         return error_response(str(e))
 
+def with_available_stock(product, available):
+    """Report the units left to reserve as the product's stock, once it has inventory shards"""
+    if available is not None:
+        product['stock'] = available
+    return product
+
+def is_stock_level(value):
+    """Whether a request body's stock is a whole number of units"""
+    # JSON true/false decode to bool, which is an int subclass
+    return not isinstance(value, bool) and isinstance(value, int) and value >= 0
+
 def cors_headers():
     """CORS headers for API responses"""
     return {
@@ -182,6 +313,22 @@ def cors_headers():
         'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
     }
 
+def conflict_response(message):
+    """Conflicting update response"""
+    return {
+        'statusCode': 409,
+        'headers': cors_headers(),
+        'body': json.dumps({'error': message})
+    }
+
+def bad_request(message):
+    """Client error response"""
+    return {
+        'statusCode': 400,
+        'headers': cors_headers(),
+        'body': json.dumps({'error': message})
+    }
+
 def error_response(message):
     """Standard error response"""
     return {
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Reservation throughput on a single hot SKU, for several shard counts.
+
+Worker threads call inventory.reserve() for one unit of the same product
+and then commit() it, or release() it for --release-ratio of them, for
+--duration seconds per shard count. The report shows reservations per
+second, reserve latency, and a consistency check: the available units plus
+the units committed must add up to the starting stock.
+
+Neither moto nor DynamoDB Local enforce DynamoDB's per-partition write
+limit, which is what makes an unsharded counter a hotspot. The harness
+models it: each partition key gets --key-wcu write units per second, with
+transactional writes costing two. Writes over the limit wait for capacity,
+as the SDK's throttling retries would. The default is scaled down from
+DynamoDB's 1,000 because moto manages only a few dozen transactions a second
+in-process; scale it back up against DynamoDB Local.
+
+    python benchmarks/inventory_load.py --shards 1,4,16 --workers 32 --duration 5
+    python benchmarks/inventory_load.py --endpoint http://localhost:8000 --key-wcu 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, os.path.join(project_root, 'backend', 'inventory'))
+
+
+class PartitionThrottle:
+    """
+    Proxy for the DynamoDB client that gives every partition key its own write
+    capacity, and runs one backend call at a time (moto is not thread-safe).
+    """
+
+    def __init__(self, client, key_wcu):
+        self._client = client
+        self._key_wcu = key_wcu
+        self._next_free = {}
+        self._schedule_lock = threading.Lock()
+        self._backend_lock = threading.Lock()
+
+    def _wait_for_capacity(self, writes):
+        now = time.monotonic()
+        ready = now
+        with self._schedule_lock:
+            for key, units in writes:
+                slot = max(now, self._next_free.get(key, now))
+                self._next_free[key] = slot + units / self._key_wcu
+                ready = max(ready, slot)
+        if ready > now:
+            time.sleep(ready - now)
+
+    def _call(self, name, writes, kwargs):
+        if writes:
+            self._wait_for_capacity(writes)
+        with self._backend_lock:
+            return getattr(self._client, name)(**kwargs)
+
+    @staticmethod
+    def _key(table, key):
+        return (table,) + tuple(sorted(key.items()))
+
+    def transact_write_items(self, **kwargs):
+        writes = []
+        for item in kwargs['TransactItems']:
+            (action, request), = item.items()
+            if action == 'Put':
+                key = {name: request['Item'][name] for name in ('shard_id', 'reservation_id') if name in request['Item']}
+            else:
+                key = request['Key']
+            writes.append((self._key(request['TableName'], key), 2))
+        return self._call('transact_write_items', writes, kwargs)
+
+    def update_item(self, **kwargs):
+        return self._call('update_item', [(self._key(kwargs['TableName'], kwargs['Key']), 1)], kwargs)
+
+    def __getattr__(self, name):
+        return lambda **kwargs: self._call(name, None, kwargs)
+
+
+def create_tables(dynamodb):
+    # Same key schemas as infrastructure/main.tf
+    for name, keys, attributes, indexes in [
+        ('ecommerce-products', [('product_id', 'HASH')], [('product_id', 'S')], None),
+        ('ecommerce-inventory', [('shard_id', 'HASH')], [('shard_id', 'S')], None),
+        ('ecommerce-reservations', [('reservation_id', 'HASH')],
+         [('reservation_id', 'S'), ('product_id', 'S'), ('hold_expires_at', 'N')],
+         [{
+             'IndexName': 'ProductHoldsIndex',
+             'KeySchema': [
+                 {'AttributeName': 'product_id', 'KeyType': 'HASH'},
+                 {'AttributeName': 'hold_expires_at', 'KeyType': 'RANGE'}
+             ],
+             'Projection': {'ProjectionType': 'KEYS_ONLY'}
+         }])
+    ]:
+        try:
+            dynamodb.Table(name).delete()
+            dynamodb.meta.client.get_waiter('table_not_exists').wait(TableName=name)
+        except dynamodb.meta.client.exceptions.ResourceNotFoundException:
+            pass
+
+        request = {
+            'TableName': name,
+            'BillingMode': 'PAY_PER_REQUEST',
+            'KeySchema': [{'AttributeName': attribute, 'KeyType': kind} for attribute, kind in keys],
+            'AttributeDefinitions': [{'AttributeName': attribute, 'AttributeType': kind} for attribute, kind in attributes]
+        }
+        if indexes:
+            request['GlobalSecondaryIndexes'] = indexes
+        dynamodb.create_table(**request).wait_until_exists()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_shards(dynamodb, inventory, shards, args):
+    # Fresh tables per run: moto gets slower as the reservations table grows
+    create_tables(dynamodb)
+    inventory.SHARD_COUNT = shards
+    product_id = f'hot-sku-{shards}'
+    inventory.init_stock(product_id, args.stock)
+
+    deadline = time.monotonic() + args.duration
+    lock = threading.Lock()
+    latencies = []
+    totals = {'reserved': 0, 'committed': 0, 'released': 0, 'sold_out': 0, 'conflicts': 0}
+
+    def worker(seed):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                reservation = inventory.reserve(product_id, 1, owner=f'user-{seed}')
+            except inventory.InsufficientStock:
+                with lock:
+                    totals['sold_out'] += 1
+                continue
+            except inventory.ReservationConflict:
+                with lock:
+                    totals['conflicts'] += 1
+                continue
+            elapsed = time.perf_counter() - start
+
+            if rng.random() < args.release_ratio:
+                outcome, units = 'released', inventory.release(reservation['reservation_id'])[0]
+            else:
+                outcome, units = 'committed', inventory.commit(reservation['reservation_id'])
+
+            with lock:
+                latencies.append(elapsed)
+                totals['reserved'] += 1
+                totals[outcome] += units
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(worker, range(args.workers)))
+    wall = time.monotonic() - start
+
+    available = inventory.get_stock(product_id)
+    consistent = available + totals['committed'] == args.stock
+    print(f"{shards:>6} {totals['reserved'] / wall:>10.1f} {percentile(latencies, 0.5) * 1000:>8.1f} "
+          f"{percentile(latencies, 0.95) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+          f"{totals['committed']:>9} {totals['released']:>9} {totals['conflicts']:>9} "
+          f"{'yes' if consistent else 'NO':>10}")
+    return consistent
+
+
+def run(args, dynamodb):
+    import inventory
+    inventory.client = PartitionThrottle(dynamodb.meta.client, args.key_wcu)
+
+    print(f"{args.workers} workers, {args.duration}s per shard count, {args.key_wcu} WCU/s per partition key\n")
+    print(f"{'shards':>6} {'reserve/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'committed':>9} {'released':>9} {'conflicts':>9} {'consistent':>10}")
+
+    results = [run_shards(dynamodb, inventory, shards, args) for shards in args.shards]
+    if not all(results):
+        sys.exit('inventory counts do not add up')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shards', type=lambda value: [int(n) for n in value.split(',')], default=[1, 4, 16],
+                        help='comma-separated shard counts to compare')
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--stock', type=int, default=1000000)
+    parser.add_argument('--release-ratio', type=float, default=0.2,
+                        help='fraction of reservations released instead of committed')
+    parser.add_argument('--key-wcu', type=float, default=10.0,
+                        help='write units per second per partition key')
+    parser.add_argument('--endpoint', help='DynamoDB Local URL; moto is used when omitted')
+    args = parser.parse_args()
+
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+
+    import boto3
+
+    if args.endpoint:
+        # The inventory module builds its client at import, so point the SDK at DynamoDB Local first
+        os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = args.endpoint
+        run(args, boto3.resource('dynamodb', endpoint_url=args.endpoint))
+        return
+
+    try:
+        from moto import mock_aws
+    except ImportError:
+        sys.exit('moto is not installed: pip install moto, or pass --endpoint for DynamoDB Local')
+
+    with mock_aws():
+        run(args, boto3.resource('dynamodb'))
+
+
+if __name__ == '__main__':
+    main()
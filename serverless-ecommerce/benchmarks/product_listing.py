@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+GET /products against a local DynamoDB stand-in: the previous single
+unpaginated scan versus cursor pages and the category index.
+
+By default the table lives in moto's in-process DynamoDB (pip install moto
+boto3). Pass --endpoint to use DynamoDB Local instead, e.g.
+
+    docker run -p 8000:8000 amazon/dynamodb-local
+    python benchmarks/product_listing.py --endpoint http://localhost:8000
+
+moto is much slower per call than DynamoDB and its cost grows with table size,
+so treat its wall-clock numbers as relative. Items read, read units and bytes
+are what the table would bill and send either way.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import math
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+# The handlers import the shared inventory module, packaged next to them in each Lambda zip
+sys.path.insert(0, os.path.join(project_root, 'backend', 'inventory'))
+
+TABLE_NAME = 'ecommerce-products'
+
+
+class CountingTable:
+    """Wraps a boto3 Table and totals what each scan and query read."""
+
+    def __init__(self, table):
+        self._table = table
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.items_read = 0
+        self.bytes_read = 0
+
+    def _count(self, response):
+        self.calls += 1
+        self.items_read += response.get('ScannedCount', response.get('Count', 0))
+        self.bytes_read += sum(item_size(item) for item in response['Items'])
+        return response
+
+    def scan(self, **kwargs):
+        return self._count(self._table.scan(**kwargs))
+
+    def query(self, **kwargs):
+        return self._count(self._table.query(**kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+    def read_units(self):
+        # Eventually consistent reads: half a unit per 4 KB, rounded up per call
+        return math.ceil(self.bytes_read / 4096) * 0.5 if self.bytes_read else 0.0
+
+
+def item_size(item):
+    return len(json.dumps(item, default=str))
+
+
+def create_table(dynamodb):
+    # Same key schema and index as infrastructure/main.tf
+    with contextlib.suppress(dynamodb.meta.client.exceptions.ResourceNotFoundException):
+        dynamodb.Table(TABLE_NAME).delete()
+        dynamodb.meta.client.get_waiter('table_not_exists').wait(TableName=TABLE_NAME)
+
+    table = dynamodb.create_table(
+        TableName=TABLE_NAME,
+        BillingMode='PAY_PER_REQUEST',
+        KeySchema=[{'AttributeName': 'product_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'product_id', 'AttributeType': 'S'},
+            {'AttributeName': 'category', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'CategoryIndex',
+            'KeySchema': [
+                {'AttributeName': 'category', 'KeyType': 'HASH'},
+                {'AttributeName': 'product_id', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }]
+    )
+    table.wait_until_exists()
+    return table
+
+
+def seed(table, count, categories, rng):
+    with table.batch_writer() as batch:
+        for i in range(count):
+            batch.put_item(Item={
+                'product_id': f'prod-{i:06d}',
+                'name': f'Product {i}',
+                'description': 'Sample product description used to give items a realistic size. ' * 2,
+                'price': Decimal(f'{rng.uniform(1, 500):.2f}'),
+                'category': f'category-{rng.randrange(categories):02d}',
+                'stock': rng.randrange(0, 200),
+                'image_url': f'https://example.com/images/{i}.jpg',
+                'created_at': '2024-01-01T00:00:00',
+                'updated_at': '2024-01-01T00:00:00'
+            })
+
+
+def load_handler(table):
+    spec = importlib.util.spec_from_file_location(
+        'products_handler', os.path.join(project_root, 'backend', 'products', 'handler.py')
+    )
+    handler = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(handler)
+    handler.table = table
+    return handler
+
+
+def list_products(handler, **params):
+    event = {'httpMethod': 'GET', 'path': '/products', 'queryStringParameters': params or None}
+    response = handler.lambda_handler(event, None)
+    assert response['statusCode'] == 200, response['body']
+    return response
+
+
+def report(name, table, elapsed, items_returned, body_bytes=None, calls=None):
+    body = f'{body_bytes:>10}' if body_bytes is not None else f"{'-':>10}"
+    print(f"{name:<36} {calls or table.calls:>6} {table.items_read:>10} {items_returned:>9} "
+          f"{table.read_units():>9.1f} {body} {elapsed * 1000:>10.1f}")
+
+
+def run(args, dynamodb):
+    rng = random.Random(args.seed)
+    raw_table = create_table(dynamodb)
+
+    start = time.perf_counter()
+    seed(raw_table, args.products, args.categories, rng)
+    print(f"seeded {args.products} products in {args.categories} categories in {time.perf_counter() - start:.1f}s\n")
+
+    table = CountingTable(raw_table)
+    handler = load_handler(table)
+
+    print(f"{'request':<36} {'calls':>6} {'items read':>10} {'returned':>9} {'read units':>9} "
+          f"{'body bytes':>10} {'ms':>10}")
+
+    # Previous handler: one scan() call, which stops at 1 MB and drops the rest
+    table.reset()
+    start = time.perf_counter()
+    response = table.scan()
+    elapsed = time.perf_counter() - start
+    truncated = ' (truncated)' if 'LastEvaluatedKey' in response else ''
+    report(f'previous: scan(){truncated}', table, elapsed, len(response['Items']))
+
+    # What returning the whole catalog would have cost without truncation
+    table.reset()
+    start = time.perf_counter()
+    returned = 0
+    request = {}
+    while True:
+        response = table.scan(**request)
+        returned += len(response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            break
+        request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    report('previous: scan() every 1 MB page', table, time.perf_counter() - start, returned)
+
+    table.reset()
+    start = time.perf_counter()
+    response = list_products(handler, limit=str(args.limit))
+    report(f'GET /products?limit={args.limit}', table, time.perf_counter() - start,
+           json.loads(response['body'])['count'], len(response['body']))
+
+    table.reset()
+    start = time.perf_counter()
+    token, returned = None, 0
+    for _ in range(args.pages):
+        params = {'limit': str(args.limit)}
+        if token:
+            params['next_token'] = token
+        body = json.loads(list_products(handler, **params)['body'])
+        returned += body['count']
+        token = body['next_token']
+        if not token:
+            break
+    elapsed = (time.perf_counter() - start) / max(table.calls, 1)
+    report(f'  next_token, mean of {table.calls} pages', table, elapsed, returned)
+
+    table.reset()
+    start = time.perf_counter()
+    response = list_products(handler, category='category-00', limit=str(args.limit))
+    report(f'GET /products?category=..&limit={args.limit}', table, time.perf_counter() - start,
+           json.loads(response['body'])['count'], len(response['body']))
+
+    # The previous way to get one category: read everything, filter in the client
+    table.reset()
+    start = time.perf_counter()
+    returned = 0
+    request = {}
+    while True:
+        response = table.scan(**request)
+        returned += sum(1 for item in response['Items'] if item['category'] == 'category-00')
+        if 'LastEvaluatedKey' not in response:
+            break
+        request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    report('previous: category via full scan', table, time.perf_counter() - start, returned)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=100000)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--pages', type=int, default=5, help='pages to walk with next_token')
+    parser.add_argument('--endpoint', help='DynamoDB Local URL; moto is used when omitted')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+
+    import boto3
+
+    if args.endpoint:
+        os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = args.endpoint
+        run(args, boto3.resource('dynamodb', endpoint_url=args.endpoint))
+        return
+
+    try:
+        from moto import mock_aws
+    except ImportError:
+        sys.exit('moto is not installed: pip install moto, or pass --endpoint for DynamoDB Local')
+
+    with mock_aws():
+        run(args, boto3.resource('dynamodb'))
+
+
+if __name__ == '__main__':
+    main()
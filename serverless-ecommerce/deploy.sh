@@ -39,9 +39,11 @@ package_lambdas() {
     
     cd backend/products
     zip -r ../../infrastructure/products.zip . -x "*.pyc" "__pycache__/*"
+    zip -j ../../infrastructure/products.zip ../inventory/inventory.py
     
     cd ../cart
     zip -r ../../infrastructure/cart.zip . -x "*.pyc" "__pycache__/*"
+    zip -j ../../infrastructure/cart.zip ../inventory/inventory.py
     
     cd ../../
     echo -e "${GREEN}✅ Lambda functions packaged${NC}"
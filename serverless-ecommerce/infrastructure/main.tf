@@ -23,6 +23,19 @@ resource "aws_dynamodb_table" "products" {
     type = "S"
   }
 
+  attribute {
+    name = "category"
+    type = "S"
+  }
+
+  # Category listings query this index instead of scanning the table
+  global_secondary_index {
+    name            = "CategoryIndex"
+    hash_key        = "category"
+    range_key       = "product_id"
+    projection_type = "ALL"
+  }
+
   tags = {
     Name        = "ECommerce Products"
     Environment = var.environment
@@ -51,6 +64,62 @@ resource "aws_dynamodb_table" "cart" {
   }
 }
 
+# Sharded stock counters: "<product_id>#<n>" spreads a hot product over n partition keys
+resource "aws_dynamodb_table" "inventory" {
+  name           = "ecommerce-inventory"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "shard_id"
+
+  attribute {
+    name = "shard_id"
+    type = "S"
+  }
+
+  tags = {
+    Name        = "ECommerce Inventory"
+    Environment = var.environment
+  }
+}
+
+resource "aws_dynamodb_table" "reservations" {
+  name           = "ecommerce-reservations"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "reservation_id"
+
+  attribute {
+    name = "reservation_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "product_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "hold_expires_at"
+    type = "N"
+  }
+
+  # Sparse: only held reservations have hold_expires_at, so expired holds can be found per product
+  global_secondary_index {
+    name            = "ProductHoldsIndex"
+    hash_key        = "product_id"
+    range_key       = "hold_expires_at"
+    projection_type = "KEYS_ONLY"
+  }
+
+  ttl {
+    attribute_name = "purge_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "ECommerce Reservations"
+    Environment = var.environment
+  }
+}
+
 resource "aws_dynamodb_table" "orders" {
   name           = "ecommerce-orders"
   billing_mode   = "PAY_PER_REQUEST"
@@ -151,15 +220,22 @@ resource "aws_iam_role_policy" "lambda_policy" {
         Effect = "Allow"
         Action = [
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
+          "dynamodb:ConditionCheckItem",
           "dynamodb:DeleteItem",
+          "dynamodb:BatchWriteItem",
           "dynamodb:Query",
           "dynamodb:Scan"
         ]
         Resource = [
           aws_dynamodb_table.products.arn,
+          "${aws_dynamodb_table.products.arn}/index/*",
           aws_dynamodb_table.cart.arn,
+          aws_dynamodb_table.inventory.arn,
+          aws_dynamodb_table.reservations.arn,
+          "${aws_dynamodb_table.reservations.arn}/index/*",
           aws_dynamodb_table.orders.arn,
           "${aws_dynamodb_table.orders.arn}/index/*"
         ]
@@ -31,8 +31,10 @@ output "cognito_client_id" {
 output "dynamodb_tables" {
   description = "DynamoDB table names"
   value = {
-    products = aws_dynamodb_table.products.name
-    cart     = aws_dynamodb_table.cart.name
-    orders   = aws_dynamodb_table.orders.name
+    products     = aws_dynamodb_table.products.name
+    cart         = aws_dynamodb_table.cart.name
+    orders       = aws_dynamodb_table.orders.name
+    inventory    = aws_dynamodb_table.inventory.name
+    reservations = aws_dynamodb_table.reservations.name
   }
 }
\ No newline at end of file
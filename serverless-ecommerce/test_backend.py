@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+Behavioural tests for the products and cart Lambdas.
+
+Every test runs the handlers against DynamoDB tables mocked by moto, created
+with the key schemas and indexes in infrastructure/main.tf.
+
+    pip install boto3 moto pytest
+    python -m pytest -q test_backend.py
+"""
+import base64
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from moto import mock_aws
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'backend', 'inventory'))
+
+import inventory
+
+TABLES = [
+    {
+        'TableName': 'ecommerce-products',
+        'KeySchema': [{'AttributeName': 'product_id', 'KeyType': 'HASH'}],
+        'AttributeDefinitions': [
+            {'AttributeName': 'product_id', 'AttributeType': 'S'},
+            {'AttributeName': 'category', 'AttributeType': 'S'}
+        ],
+        'GlobalSecondaryIndexes': [{
+            'IndexName': 'CategoryIndex',
+            'KeySchema': [
+                {'AttributeName': 'category', 'KeyType': 'HASH'},
+                {'AttributeName': 'product_id', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }]
+    },
+    {
+        'TableName': 'ecommerce-cart',
+        'KeySchema': [
+            {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'product_id', 'KeyType': 'RANGE'}
+        ],
+        'AttributeDefinitions': [
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'product_id', 'AttributeType': 'S'}
+        ]
+    },
+    {
+        'TableName': 'ecommerce-inventory',
+        'KeySchema': [{'AttributeName': 'shard_id', 'KeyType': 'HASH'}],
+        'AttributeDefinitions': [{'AttributeName': 'shard_id', 'AttributeType': 'S'}]
+    },
+    {
+        'TableName': 'ecommerce-reservations',
+        'KeySchema': [{'AttributeName': 'reservation_id', 'KeyType': 'HASH'}],
+        'AttributeDefinitions': [
+            {'AttributeName': 'reservation_id', 'AttributeType': 'S'},
+            {'AttributeName': 'product_id', 'AttributeType': 'S'},
+            {'AttributeName': 'hold_expires_at', 'AttributeType': 'N'}
+        ],
+        'GlobalSecondaryIndexes': [{
+            'IndexName': 'ProductHoldsIndex',
+            'KeySchema': [
+                {'AttributeName': 'product_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'hold_expires_at', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'KEYS_ONLY'}
+        }]
+    }
+]
+
+
+def load_handler(name):
+    """Import backend/<name>/handler.py under its own module name"""
+    spec = importlib.util.spec_from_file_location(f'{name}_handler', os.path.join(ROOT, 'backend', name, 'handler.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextmanager
+def backend():
+    """Fresh mocked tables, and the products and cart handlers bound to them"""
+    with mock_aws():
+        dynamodb = boto3.resource('dynamodb')
+        for table in TABLES:
+            dynamodb.create_table(BillingMode='PAY_PER_REQUEST', **table)
+
+        # The inventory module keeps the client it was imported with
+        with mock.patch.object(inventory, 'client', dynamodb.meta.client), \
+                mock.patch.object(inventory, 'SHARD_COUNT', 4):
+            yield load_handler('products'), load_handler('cart')
+
+
+def call(handler, method, path, path_parameters=None, body=None, query=None):
+    """Invoke a handler like API Gateway does and return (status, decoded body)"""
+    response = handler.lambda_handler({
+        'httpMethod': method,
+        'path': path,
+        'pathParameters': path_parameters,
+        'queryStringParameters': query,
+        'body': json.dumps(body) if body is not None else None
+    }, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def create_product(products, name='Widget', price=10, category='general', stock=10):
+    status, body = call(products, 'POST', '/products', body={
+        'name': name, 'price': price, 'category': category, 'stock': stock
+    })
+    assert status == 201, body
+    return body['product_id']
+
+
+def list_all(products, **query):
+    """Follow next_token through every page. Returns (product IDs in order, pages read)"""
+    product_ids = []
+    pages = 0
+    while True:
+        status, body = call(products, 'GET', '/products', query=query)
+        assert status == 200, body
+        pages += 1
+        product_ids.extend(product['product_id'] for product in body['products'])
+        if not body['next_token']:
+            return product_ids, pages
+        query = dict(query, next_token=body['next_token'])
+
+
+def test_product_pages_round_trip():
+    with backend() as (products, cart):
+        created = {create_product(products, name=f'Product {i}') for i in range(7)}
+
+        listed, pages = list_all(products, limit='3')
+
+        assert len(listed) == len(set(listed)), 'a product was returned on two pages'
+        assert set(listed) == created
+        assert pages >= 3
+        print("✅ next_token pages through every product exactly once")
+
+
+def test_tampered_next_token_rejected():
+    with backend() as (products, cart):
+        for i in range(3):
+            create_product(products, name=f'Product {i}')
+        status, body = call(products, 'GET', '/products', query={'limit': '1'})
+        token = body['next_token']
+        key = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+
+        forged = dict(key, price=0)
+        forged_token = base64.urlsafe_b64encode(json.dumps(forged).encode()).decode().rstrip('=')
+        for bad_token in ['not-a-token!', token[:-2], forged_token]:
+            status, body = call(products, 'GET', '/products', query={'next_token': bad_token})
+            assert status == 400, (bad_token, body)
+            assert body['error'] == 'Invalid next_token'
+
+        # A scan token cannot continue a category listing
+        status, body = call(products, 'GET', '/products', query={'category': 'general', 'next_token': token})
+        assert status == 400
+        print("✅ Malformed, forged and cross-listing next_tokens are rejected")
+
+
+def test_category_listing_queries_index():
+    with backend() as (products, cart):
+        books = {create_product(products, name=f'Book {i}', category='books') for i in range(5)}
+        for i in range(4):
+            create_product(products, name=f'Toy {i}', category='toys')
+
+        with mock.patch.object(products.table, 'scan', side_effect=AssertionError('category listing scanned the table')), \
+                mock.patch.object(products.table, 'query', wraps=products.table.query) as query:
+            listed, pages = list_all(products, category='books', limit='2')
+
+        assert set(listed) == books
+        assert pages == query.call_count
+        assert all(c.kwargs['IndexName'] == 'CategoryIndex' for c in query.call_args_list)
+        print("✅ Category listings page through CategoryIndex without scanning")
+
+
+def seed_cart(cart, user_id, count, price=2):
+    """Write `count` products and a one-unit cart line for each, without holding stock"""
+    product_ids = [f'product-{i:04d}' for i in range(count)]
+    with cart.products_table.batch_writer() as batch:
+        for product_id in product_ids:
+            batch.put_item(Item={'product_id': product_id, 'name': product_id, 'price': price, 'category': 'general'})
+    with cart.cart_table.batch_writer() as batch:
+        for product_id in product_ids:
+            batch.put_item(Item={'user_id': user_id, 'product_id': product_id, 'quantity': 1})
+    return product_ids
+
+
+def test_get_cart_batches_product_lookups():
+    with backend() as (products, cart):
+        seed_cart(cart, 'shopper', 150)
+
+        with mock.patch.object(cart.dynamodb, 'batch_get_item', wraps=cart.dynamodb.batch_get_item) as batch_get, \
+                mock.patch.object(cart.products_table, 'get_item', side_effect=AssertionError('per-line product lookup')):
+            status, body = call(cart, 'GET', '/cart/shopper', {'user_id': 'shopper'})
+
+        assert status == 200, body
+        assert body['item_count'] == 150
+        assert body['total_amount'] == 300
+        key_counts = [len(c.kwargs['RequestItems']['ecommerce-products']['Keys']) for c in batch_get.call_args_list]
+        assert key_counts == [100, 50]
+        print("✅ get_cart looks products up 100 keys per BatchGetItem")
+
+
+def test_get_cart_retries_unprocessed_keys():
+    with backend() as (products, cart):
+        seed_cart(cart, 'shopper', 30)
+        real_batch_get = cart.dynamodb.batch_get_item
+        requests = []
+
+        def throttled_batch_get(RequestItems):
+            # The first call only serves half the keys and hands the rest back
+            requests.append(RequestItems)
+            if len(requests) > 1:
+                return real_batch_get(RequestItems=RequestItems)
+            request = RequestItems['ecommerce-products']
+            keys = request['Keys']
+            response = real_batch_get(RequestItems={'ecommerce-products': dict(request, Keys=keys[:15])})
+            response['UnprocessedKeys'] = {'ecommerce-products': dict(request, Keys=keys[15:])}
+            return response
+
+        with mock.patch.object(cart.dynamodb, 'batch_get_item', side_effect=throttled_batch_get), \
+                mock.patch.object(cart, 'backoff') as backoff:
+            status, body = call(cart, 'GET', '/cart/shopper', {'user_id': 'shopper'})
+
+        assert status == 200, body
+        assert body['item_count'] == 30
+        assert len(requests) == 2 and len(requests[1]['ecommerce-products']['Keys']) == 15
+        backoff.assert_called_once_with(1)
+
+        # Keys that stay unprocessed give up after MAX_BATCH_RETRIES instead of looping
+        with mock.patch.object(cart.dynamodb, 'batch_get_item',
+                               side_effect=lambda RequestItems: {'Responses': {}, 'UnprocessedKeys': RequestItems}), \
+                mock.patch.object(cart, 'backoff') as backoff:
+            status, body = call(cart, 'GET', '/cart/shopper', {'user_id': 'shopper'})
+
+        assert status == 500
+        assert body['error'] == 'Product lookup throttled, please retry'
+        assert backoff.call_count == cart.MAX_BATCH_RETRIES
+        print("✅ Unprocessed product keys are retried with backoff, then give up")
+
+
+def serialized(method, calls=None):
+    """Wrap a client method so worker threads call moto, which is not thread-safe, one at a time"""
+    lock = threading.Lock()
+
+    def call_once(**kwargs):
+        with lock:
+            if calls is not None:
+                calls.append(kwargs)
+            return method(**kwargs)
+    return call_once
+
+
+def test_clear_cart_pages_keys_and_batches_deletes():
+    with backend() as (products, cart):
+        seed_cart(cart, 'shopper', 60)
+        seed_cart(cart, 'someone-else', 3)
+        client = cart.dynamodb.meta.client
+        writes = []
+        real_query = cart.cart_table.query
+
+        # Small pages, so deleting has to follow LastEvaluatedKey
+        with mock.patch.object(cart.cart_table, 'query', side_effect=lambda **kwargs: real_query(Limit=7, **kwargs)) as query, \
+                mock.patch.object(client, 'batch_write_item', serialized(client.batch_write_item, writes)):
+            status, body = call(cart, 'DELETE', '/cart/shopper', {'user_id': 'shopper'})
+
+        assert status == 200, body
+        assert body['items_removed'] == 60
+        assert query.call_count == 9
+        assert all(c.kwargs['ProjectionExpression'] == 'product_id, quantity, reservations' for c in query.call_args_list)
+        assert sorted(len(w['RequestItems']['ecommerce-cart']) for w in writes) == [10, 25, 25]
+        assert cart.cart_table.query(KeyConditionExpression=Key('user_id').eq('shopper'))['Count'] == 0
+        assert cart.cart_table.query(KeyConditionExpression=Key('user_id').eq('someone-else'))['Count'] == 3
+        print("✅ clear_cart pages through the cart and deletes 25 lines per BatchWriteItem")
+
+
+def test_clear_cart_retries_unprocessed_items():
+    with backend() as (products, cart):
+        seed_cart(cart, 'shopper', 20)
+        client = cart.dynamodb.meta.client
+        real_batch_write = client.batch_write_item
+        writes = []
+
+        def throttled_batch_write(RequestItems):
+            # The first call only deletes five lines and hands the rest back
+            writes.append(RequestItems)
+            if len(writes) > 1:
+                return real_batch_write(RequestItems=RequestItems)
+            deletes = RequestItems['ecommerce-cart']
+            response = real_batch_write(RequestItems={'ecommerce-cart': deletes[:5]})
+            response['UnprocessedItems'] = {'ecommerce-cart': deletes[5:]}
+            return response
+
+        with mock.patch.object(client, 'batch_write_item', side_effect=throttled_batch_write), \
+                mock.patch.object(cart, 'backoff') as backoff:
+            status, body = call(cart, 'DELETE', '/cart/shopper', {'user_id': 'shopper'})
+
+        assert status == 200, body
+        assert [len(w['ecommerce-cart']) for w in writes] == [20, 15]
+        backoff.assert_called_once_with(1)
+        assert cart.cart_table.query(KeyConditionExpression=Key('user_id').eq('shopper'))['Count'] == 0
+
+        seed_cart(cart, 'shopper', 3)
+        with mock.patch.object(client, 'batch_write_item',
+                               side_effect=lambda RequestItems: {'UnprocessedItems': RequestItems}), \
+                mock.patch.object(cart, 'backoff') as backoff:
+            status, body = call(cart, 'DELETE', '/cart/shopper', {'user_id': 'shopper'})
+
+        assert status == 500
+        assert body['error'] == 'Cart clear throttled, please retry'
+        assert backoff.call_count == cart.MAX_BATCH_RETRIES
+        print("✅ Unprocessed cart deletes are retried with backoff, then give up")
+
+
+def cart_line(cart, user_id, product_id):
+    return cart.cart_table.get_item(Key={'user_id': user_id, 'product_id': product_id}, ConsistentRead=True).get('Item')
+
+
+def reservation(reservation_id):
+    return inventory.client.get_item(
+        TableName=inventory.RESERVATIONS_TABLE, Key={'reservation_id': reservation_id}, ConsistentRead=True
+    )['Item']
+
+
+def test_add_to_cart_holds_stock_with_the_line():
+    # The stock check from the original request now rides on the reservation transaction
+    with backend() as (products, cart):
+        product_id = create_product(products, stock=5)
+        path = {'user_id': 'shopper'}
+
+        assert call(cart, 'POST', '/cart/shopper', path, {'product_id': product_id, 'quantity': 3})[0] == 200
+        assert call(cart, 'POST', '/cart/shopper', path, {'product_id': product_id, 'quantity': 1})[0] == 200
+        line = cart_line(cart, 'shopper', product_id)
+        assert line['quantity'] == 4
+        assert sum(reservation(rid)['quantity'] for rid in line['reservations']) == 4
+        assert inventory.get_stock(product_id) == 1
+
+        status, body = call(cart, 'POST', '/cart/shopper', path, {'product_id': product_id, 'quantity': 2})
+        assert (status, body['error']) == (400, 'Insufficient stock')
+        assert cart_line(cart, 'shopper', product_id)['quantity'] == 4
+        assert inventory.get_stock(product_id) == 1
+
+        status, body = call(cart, 'POST', '/cart/shopper', path, {'product_id': 'no-such-product', 'quantity': 1})
+        assert status == 404
+        assert cart_line(cart, 'shopper', 'no-such-product') is None
+        print("✅ Adding to the cart holds stock and records the line together, or does neither")
+
+
+def test_add_to_cart_line_failure_holds_nothing():
+    with backend() as (products, cart):
+        product_id = create_product(products, stock=5)
+        real_line_update = cart.cart_line_update
+
+        def failing_line_update(*args, **kwargs):
+            # A line write that always fails must cancel the reservation written with it
+            item = real_line_update(*args, **kwargs)
+            item['Update']['ConditionExpression'] = 'attribute_exists(never_set)'
+            return item
+
+        with mock.patch.object(cart, 'cart_line_update', side_effect=failing_line_update), \
+                mock.patch.object(inventory.time, 'sleep'):
+            status, body = call(cart, 'POST', '/cart/shopper', {'user_id': 'shopper'}, {'product_id': product_id, 'quantity': 2})
+
+        assert status == 409, body
+        assert cart_line(cart, 'shopper', product_id) is None
+        assert inventory.get_stock(product_id) == 5
+        assert inventory.client.scan(TableName=inventory.RESERVATIONS_TABLE)['Count'] == 0
+        print("✅ A cart line that cannot be written leaves no stock held")
+
+
+def expire_hold(reservation_id, seconds_left=-1):
+    """Move a hold's expiry to `seconds_left` from now"""
+    inventory.client.update_item(
+        TableName=inventory.RESERVATIONS_TABLE,
+        Key={'reservation_id': reservation_id},
+        UpdateExpression='SET hold_expires_at = :expires',
+        ExpressionAttributeValues={':expires': int(time.time()) + seconds_left}
+    )
+
+
+def test_reserve_commit_release():
+    with backend() as (products, cart):
+        product_id = create_product(products, stock=10)
+
+        held = inventory.reserve(product_id, 3, owner='shopper')
+        assert held['status'] == inventory.HELD
+        assert inventory.get_stock(product_id) == 7
+
+        assert inventory.release(held['reservation_id'], 1) == (1, 2)
+        assert inventory.get_stock(product_id) == 8
+        assert inventory.commit(held['reservation_id']) == 2
+        assert reservation(held['reservation_id'])['status'] == inventory.COMMITTED
+        # Committed units are sold: neither released nor committed again
+        assert inventory.release(held['reservation_id']) == (0, 0)
+        assert inventory.commit(held['reservation_id']) == 0
+        assert inventory.get_stock(product_id) == 8
+
+        released = inventory.reserve(product_id, 8, owner='shopper')
+        assert inventory.release(released['reservation_id']) == (8, 0)
+        assert reservation(released['reservation_id'])['status'] == inventory.RELEASED
+        assert inventory.get_stock(product_id) == 8
+        print("✅ Reservations hold, commit and release units on the shards")
+
+
+def test_expired_holds_are_reclaimed():
+    with backend() as (products, cart):
+        product_id = create_product(products, stock=4)
+        stale = inventory.reserve(product_id, 4, owner='gone')
+
+        try:
+            inventory.reserve(product_id, 1, owner='shopper')
+            assert False, 'reserved units that are all held'
+        except inventory.InsufficientStock:
+            pass
+
+        expire_hold(stale['reservation_id'])
+        fresh = inventory.reserve(product_id, 3, owner='shopper')
+
+        assert fresh['quantity'] == 3
+        assert reservation(stale['reservation_id'])['status'] == inventory.RELEASED
+        assert inventory.get_stock(product_id) == 1
+        # An expired hold can no longer be committed
+        assert inventory.commit(stale['reservation_id']) == 0
+        print("✅ A sold-out product reclaims expired holds")
+
+
+def test_checkout_commits_holds_and_empties_cart():
+    with backend() as (products, cart):
+        path = {'user_id': 'shopper'}
+        kept = create_product(products, stock=5)
+        expiring = create_product(products, stock=5)
+        call(cart, 'POST', '/cart/shopper', path, {'product_id': kept, 'quantity': 2})
+        call(cart, 'POST', '/cart/shopper', path, {'product_id': expiring, 'quantity': 3})
+        old_hold, = cart_line(cart, 'shopper', expiring)['reservations']
+        expire_hold(old_hold, seconds_left=cart.CHECKOUT_HOLD_MARGIN // 2)
+
+        status, body = call(cart, 'POST', '/cart/shopper/checkout', path)
+
+        assert status == 200, body
+        assert {item['product_id']: item['quantity'] for item in body['items']} == {kept: 2, expiring: 3}
+        # The near-expiry hold went back to the shards before it was replaced
+        assert reservation(old_hold)['status'] == inventory.RELEASED
+        assert inventory.get_stock(kept) == 3
+        assert inventory.get_stock(expiring) == 2
+        assert cart.cart_table.query(KeyConditionExpression=Key('user_id').eq('shopper'))['Count'] == 0
+
+        status, body = call(cart, 'POST', '/cart/shopper/checkout', path)
+        assert (status, body['error']) == (400, 'Cart is empty')
+        print("✅ Checkout commits every line, replacing holds about to expire")
+
+
+def test_checkout_conflicts():
+    with backend() as (products, cart):
+        path = {'user_id': 'shopper'}
+        product_id = create_product(products, stock=3)
+        other_id = create_product(products, stock=3)
+        call(cart, 'POST', '/cart/shopper', path, {'product_id': product_id, 'quantity': 2})
+        call(cart, 'POST', '/cart/shopper', path, {'product_id': other_id, 'quantity': 1})
+
+        # A second checkout of the same cart waits for the first
+        lease = cart.claim_checkout('shopper')
+        status, body = call(cart, 'POST', '/cart/shopper/checkout', path)
+        assert (status, body['error']) == (409, 'Checkout is already in progress for this cart')
+        cart.release_checkout('shopper', lease)
+
+        # The hold expired and another shopper took the units
+        hold, = cart_line(cart, 'shopper', product_id)['reservations']
+        expire_hold(hold)
+        inventory.reserve(product_id, 3, owner='someone-else')
+
+        status, body = call(cart, 'POST', '/cart/shopper/checkout', path)
+
+        assert status == 409, body
+        assert body['unavailable'] == [product_id]
+        # Nothing was committed, and both lines are still in the cart
+        other_hold, = cart_line(cart, 'shopper', other_id)['reservations']
+        assert reservation(other_hold)['status'] == inventory.HELD
+        assert inventory.get_stock(other_id) == 2
+        assert cart_line(cart, 'shopper', product_id)['quantity'] == 2
+        # The marker is gone, and it never shows up as a line
+        assert cart_line(cart, 'shopper', cart.CHECKOUT_MARKER) is None
+        assert call(cart, 'GET', '/cart/shopper', path)[1]['item_count'] == 2
+        print("✅ Checkout returns 409 for a concurrent checkout or stock that is gone")
+
+
+def test_product_stock_reports_and_sets_available_units():
+    with backend() as (products, cart):
+        product_id = create_product(products, stock=5)
+        sold = inventory.reserve(product_id, 4, owner='shopper')
+        inventory.commit(sold['reservation_id'])
+        call(cart, 'POST', '/cart/shopper', {'user_id': 'shopper'}, {'product_id': product_id, 'quantity': 1})
+
+        assert call(products, 'GET', f'/products/{product_id}')[1]['stock'] == 0
+        assert call(products, 'GET', '/products')[1]['products'][0]['stock'] == 0
+
+        # PUT sets the units available to reserve, whatever was sold or held before
+        status, body = call(products, 'PUT', f'/products/{product_id}', body={'stock': 10})
+        assert (status, body['stock']) == (200, 10)
+        status, body = call(products, 'PUT', f'/products/{product_id}', body={'stock': 2})
+        assert (status, body['stock']) == (200, 2)
+
+        # Clearing the cart hands its held unit back
+        call(cart, 'DELETE', '/cart/shopper', {'user_id': 'shopper'})
+        assert inventory.get_stock(product_id) == 3
+
+        status, body = call(products, 'PUT', f'/products/{product_id}', body={'stock': -1})
+        assert status == 400
+        print("✅ Product stock is the available level, on reads and on PUT")
+
+
+def main():
+    tests = [
+        test_product_pages_round_trip,
+        test_tampered_next_token_rejected,
+        test_category_listing_queries_index,
+        test_get_cart_batches_product_lookups,
+        test_get_cart_retries_unprocessed_keys,
+        test_clear_cart_pages_keys_and_batches_deletes,
+        test_clear_cart_retries_unprocessed_items,
+        test_add_to_cart_holds_stock_with_the_line,
+        test_add_to_cart_line_failure_holds_nothing,
+        test_reserve_commit_release,
+        test_expired_holds_are_reclaimed,
+        test_checkout_commits_holds_and_empties_cart,
+        test_checkout_conflicts,
+        test_product_stock_reports_and_sets_available_units,
+    ]
+
+    print("🧪 Running serverless e-commerce backend tests\n")
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n📊 {len(tests) - failed}/{len(tests)} tests passed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)